@@ -1,13 +1,18 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QFormLayout, QLineEdit, QTextEdit
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+from broadsea_core.store import ConfigStore
+from broadsea_core.validation import validate_section
 
 class BaseConfigSection(QWidget):
     """Base class for configuration sections"""
     
     def __init__(self):
         super().__init__()
-        self.section_name = ""
+        # Subclasses set their name before calling this
+        self.section_name = getattr(self, "section_name", "")
         self.fields = {}
+        self.store = None
         self.setup_ui()
 
     def setup_ui(self):
@@ -31,6 +36,46 @@ class BaseConfigSection(QWidget):
         self.fields[name] = field
         form_layout.addRow(name, field)
 
+    def bind(self, store: ConfigStore):
+        """Bind the fields to a value store, seeding it with the current values"""
+        self.store = store
+        for name, field in self.fields.items():
+            store.set(self.section_name, name, self.field_value(field))
+            if isinstance(field, QLineEdit):
+                field.textChanged.connect(
+                    lambda text, name=name: self.store.set(self.section_name, name, text)
+                )
+            elif isinstance(field, QTextEdit):
+                field.textChanged.connect(
+                    lambda name=name, field=field: self.store.set(
+                        self.section_name, name, field.toPlainText()
+                    )
+                )
+        store.subscribe(self.on_store_changed)
+
+    def on_store_changed(self, section: str, key: str, value: str):
+        """Push a value changed elsewhere in the store into its widget"""
+        if section != self.section_name or key not in self.fields:
+            return
+        field = self.fields[key]
+        if self.field_value(field) != value:
+            self.set_field_value(field, value)
+
+    @staticmethod
+    def field_value(field) -> str:
+        if isinstance(field, QLineEdit):
+            return field.text()
+        elif isinstance(field, QTextEdit):
+            return field.toPlainText()
+        return ""
+
+    @staticmethod
+    def set_field_value(field, value: str):
+        if isinstance(field, QLineEdit):
+            field.setText(value)
+        elif isinstance(field, QTextEdit):
+            field.setPlainText(value)
+
     def reset_to_defaults(self):
         """Reset fields to default values"""
         for field in self.fields.values():
@@ -41,23 +86,32 @@ class BaseConfigSection(QWidget):
 
     def load_config(self, config: Dict[str, str]):
         """Load configuration into fields"""
+        if self.store is not None:
+            self.store.load({self.section_name: {
+                name: value for name, value in config.items() if name in self.fields
+            }})
+            return
         for name, field in self.fields.items():
             if name in config:
-                if isinstance(field, QLineEdit):
-                    field.setText(config[name])
-                elif isinstance(field, QTextEdit):
-                    field.setPlainText(config[name])
+                self.set_field_value(field, config[name])
 
     def get_config(self) -> Dict[str, str]:
         """Get current configuration"""
-        config = {}
+        if self.store is not None:
+            return self.store.section(self.section_name)
+        return {name: self.field_value(field) for name, field in self.fields.items()}
+
+    def show_issues(self, issues: List[Tuple[str, str]]):
+        """Mark the field of each (key, message) issue and list the rest on the section"""
+        by_key: Dict[str, List[str]] = {}
+        for key, message in issues:
+            by_key.setdefault(key, []).append(message)
         for name, field in self.fields.items():
-            if isinstance(field, QLineEdit):
-                config[name] = field.text()
-            elif isinstance(field, QTextEdit):
-                config[name] = field.toPlainText()
-        return config
+            field_issues = by_key.pop(name, [])
+            field.setStyleSheet("border: 1px solid #d9534f;" if field_issues else "")
+            field.setToolTip("\n".join(field_issues))
+        self.setToolTip("\n".join(message for messages in by_key.values() for message in messages))
 
-    def validate(self) -> List[str]:
-        """Validate configuration - to be implemented by subclasses"""
-        return []
+    def validate(self) -> List[Tuple[str, str]]:
+        """Validate configuration with the core section validator"""
+        return validate_section(self.section_name, self.get_config())
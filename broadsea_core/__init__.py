@@ -0,0 +1,15 @@
+"""Qt-free Broadsea configuration core shared by the GUI and command-line tools"""
+
+from broadsea_core.schema import (
+    ConfigField, ConfigSection, SchemaRegistry, create_sections, get_registry
+)
+from broadsea_core.store import ConfigStore
+from broadsea_core.dependencies import DependencyGraph
+from broadsea_core.envfile import load_config, save_config
+from broadsea_core.validation import validate_config, validate_field, validate_section
+
+__all__ = [
+    "ConfigField", "ConfigSection", "SchemaRegistry", "create_sections", "get_registry",
+    "ConfigStore", "DependencyGraph", "load_config", "save_config",
+    "validate_config", "validate_field", "validate_section",
+]
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from broadsea_core.compose import FRAGMENTS, SECRET_KEYS, ComposeGenerator, yaml_dumper
+from broadsea_core.interpolate import resolve_values
+from broadsea_core.journal import write_atomic
+from broadsea_core.schema import get_registry
+
+# Records what every artifact was last built from, relative to the build directory
+MANIFEST_NAME = ".broadsea-build.json"
+
+Outputs = Dict[str, bytes]
+
+# Secrets issued by someone else (a UMLS API key, the LDAP account list);
+# a generated value would be invalid, so the user has to supply the file
+USER_SUPPLIED_SECRETS = ("UMLS_API_KEY_FILE", "OPENLDAP_ACCOUNT_PASSWORDS_FILE")
+
+@dataclass(frozen=True)
+class Artifact:
+    """A generated deployment file set and the configuration keys it is built from"""
+    name: str
+    keys: Tuple[str, ...]
+    # Bump when the template changes so existing outputs are rebuilt
+    version: int
+    # Returns output paths, relative to the build directory, and their content
+    render: Callable[[Mapping[str, str], str], Outputs]
+    after: Tuple[str, ...] = ()
+    # Re-run on every build because the result depends on files, not only keys
+    volatile: bool = False
+
+@dataclass(frozen=True)
+class ArtifactResult:
+    name: str
+    # built, unchanged, cached, failed or skipped
+    status: str
+    outputs: Tuple[str, ...] = ()
+    message: str = ""
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def render_compose(values, directory) -> Outputs:
+    return {"docker-compose.yml": ComposeGenerator().render(values).encode()}
+
+def secret_artifact(key: str) -> Artifact:
+    """Secret file named by a *_FILE key, generated once and never overwritten
+
+    User-supplied secrets are never generated; the build fails until they exist.
+    """
+    def render(values, directory) -> Outputs:
+        path = values.get(key, "")
+        if not path:
+            return {}
+        full_path = os.path.join(directory, path)
+        if os.path.exists(full_path):
+            with open(full_path, 'rb') as f:
+                return {path: f.read()}
+        if key in USER_SUPPLIED_SECRETS:
+            raise Exception(f"{key}: {path} must be provided, it cannot be generated")
+        return {path: secrets.token_urlsafe(24).encode()}
+    return Artifact(f"secret:{key}", (key,), 1, render)
+
+CERT_FILES = ("certs/broadsea.crt", "certs/broadsea.key")
+
+def check_certs(values, directory) -> Outputs:
+    if values.get("HTTP_TYPE") == "https":
+        missing = [path for path in CERT_FILES if not os.path.isfile(os.path.join(directory, path))]
+        if missing:
+            raise Exception(f"HTTPS needs {', '.join(missing)}")
+    return {}
+
+def js_bool(value: str) -> str:
+    return "true" if value.lower() == "true" else "false"
+
+def render_config_local(values, directory) -> Outputs:
+    api_url = f"{values['HTTP_TYPE']}://{values['BROADSEA_HOST']}/WebAPI/"
+    provider = values["ATLAS_SECURITY_PROVIDER_TYPE"]
+    lines = [
+        "define([], function () {",
+        "  var configLocal = {};",
+        f"  configLocal.api = {{ name: 'Broadsea', url: {json.dumps(api_url)} }};",
+        f"  configLocal.userAuthenticationEnabled = {js_bool(values['ATLAS_USER_AUTH_ENABLED'])};",
+        f"  configLocal.cohortComparisonResultsEnabled = {js_bool(values['ATLAS_COHORT_COMPARISON_RESULTS_ENABLED'])};",
+        f"  configLocal.plpResultsEnabled = {js_bool(values['ATLAS_PLP_RESULTS_ENABLED'])};",
+    ]
+    if provider != "none":
+        provider_config = {
+            "name": values["ATLAS_SECURITY_PROVIDER_NAME"],
+            "url": f"user/login/{provider}",
+            "ajax": provider in ("db", "ldap", "ad"),
+            "icon": "fa fa-openid",
+        }
+        lines.append(f"  configLocal.authProviders = [{json.dumps(provider_config)}];")
+    lines += ["  return configLocal;", "});", ""]
+    return {"atlas/config-local.js": "\n".join(lines).encode()}
+
+def render_traefik(values, directory) -> Outputs:
+    yaml, dumper = yaml_dumper()
+    dynamic = {}
+    if values["HTTP_TYPE"] == "https":
+        dynamic = {
+            "http": {
+                "routers": {
+                    "http-redirect": {
+                        "entryPoints": ["web"],
+                        "rule": f"Host(`{values['BROADSEA_HOST']}`)",
+                        "middlewares": ["https-redirect"],
+                        "service": "noop@internal",
+                    },
+                },
+                "middlewares": {
+                    "https-redirect": {"redirectScheme": {"scheme": "https", "permanent": True}},
+                },
+            },
+            "tls": {
+                "certificates": [{
+                    "certFile": "/etc/traefik/certs/broadsea.crt",
+                    "keyFile": "/etc/traefik/certs/broadsea.key",
+                }],
+            },
+        }
+    text = yaml.dump(dynamic, Dumper=dumper, default_flow_style=False, sort_keys=False)
+    return {"traefik/dynamic.yml": text.encode()}
+
+def compose_keys() -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(key for fragment in FRAGMENTS for key in fragment.keys))
+
+ARTIFACTS: Tuple[Artifact, ...] = (
+    Artifact("compose", compose_keys(), 1, render_compose),
+    *(secret_artifact(key) for key in SECRET_KEYS),
+    Artifact("certs", ("HTTP_TYPE",), 1, check_certs, volatile=True),
+    Artifact("atlas-config-local", (
+        "HTTP_TYPE", "BROADSEA_HOST", "ATLAS_USER_AUTH_ENABLED",
+        "ATLAS_COHORT_COMPARISON_RESULTS_ENABLED", "ATLAS_PLP_RESULTS_ENABLED",
+        "ATLAS_SECURITY_PROVIDER_TYPE", "ATLAS_SECURITY_PROVIDER_NAME",
+    ), 1, render_config_local),
+    Artifact("traefik", ("HTTP_TYPE", "BROADSEA_HOST"), 1, render_traefik, after=("certs",)),
+)
+
+class BuildGraph:
+    """Make-like graph that rebuilds only artifacts whose inputs or outputs changed"""
+
+    def __init__(self, artifacts: Sequence[Artifact] = ARTIFACTS, workers: int = 4):
+        self.artifacts = {artifact.name: artifact for artifact in artifacts}
+        self.workers = workers
+        self.layers = self._layers()
+        registry = get_registry()
+        self.defaults = {key: registry.field(key).default_value for key in registry.keys()}
+
+    def _layers(self) -> List[List[Artifact]]:
+        """Artifacts grouped so each group only depends on earlier groups"""
+        remaining = dict(self.artifacts)
+        done = set()
+        layers = []
+        while remaining:
+            layer = [a for a in remaining.values() if all(dep in done for dep in a.after)]
+            if not layer:
+                raise ValueError(f"Circular or unknown artifact dependencies: {', '.join(sorted(remaining))}")
+            for artifact in layer:
+                del remaining[artifact.name]
+            done.update(artifact.name for artifact in layer)
+            layers.append(layer)
+        return layers
+
+    @staticmethod
+    def input_hash(artifact: Artifact, values: Mapping[str, str], dep_hashes: Iterable[str]) -> str:
+        payload = [artifact.version, [[key, values.get(key, "")] for key in artifact.keys], list(dep_hashes)]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+    @staticmethod
+    def _outputs_intact(directory: str, entry: dict) -> bool:
+        for path, recorded in entry.get("outputs", {}).items():
+            try:
+                stat = os.stat(os.path.join(directory, path))
+            except FileNotFoundError:
+                return False
+            if (stat.st_size, stat.st_mtime_ns) != (recorded["size"], recorded["mtime_ns"]):
+                return False
+        return True
+
+    def _build_one(self, artifact: Artifact, values: Mapping[str, str], directory: str,
+                   entry: Optional[dict], input_hash: str, force: bool) -> Tuple[ArtifactResult, Optional[dict]]:
+        if not force and not artifact.volatile and entry and entry.get("inputs") == input_hash \
+                and self._outputs_intact(directory, entry):
+            return ArtifactResult(artifact.name, "cached", tuple(entry.get("outputs", {}))), entry
+        try:
+            outputs = artifact.render(values, directory)
+            recorded = {}
+            written = False
+            for path, data in outputs.items():
+                full_path = os.path.join(directory, path)
+                digest = hashlib.sha256(data).hexdigest()
+                if not (os.path.exists(full_path) and os.path.getsize(full_path) == len(data)
+                        and file_digest(full_path) == digest):
+                    os.makedirs(os.path.dirname(full_path) or ".", exist_ok=True)
+                    mode = 0o600 if artifact.name.startswith("secret:") else None
+                    write_atomic(full_path, data, mode=mode)
+                    written = True
+                stat = os.stat(full_path)
+                recorded[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                # The manifest is not private, so secrets are not hashed into it
+                if not artifact.name.startswith("secret:"):
+                    recorded[path]["sha256"] = digest
+        except Exception as e:
+            return ArtifactResult(artifact.name, "failed", message=str(e)), None
+        status = "built" if written else "unchanged"
+        return ArtifactResult(artifact.name, status, tuple(recorded)), {"inputs": input_hash, "outputs": recorded}
+
+    def build(self, values: Mapping[str, str], directory: str = ".", force: bool = False) -> List[ArtifactResult]:
+        """Bring every artifact in directory up to date with values
+
+        Keys missing from values take their schema defaults.
+        """
+        values, _ = resolve_values({**self.defaults, **values})
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            manifest = {}
+
+        results: Dict[str, ArtifactResult] = {}
+        new_manifest: Dict[str, dict] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for layer in self.layers:
+                futures = {}
+                for artifact in layer:
+                    failed = [dep for dep in artifact.after if results[dep].status in ("failed", "skipped")]
+                    if failed:
+                        results[artifact.name] = ArtifactResult(
+                            artifact.name, "skipped", message=f"needs {', '.join(failed)}"
+                        )
+                        continue
+                    # Output hashes of dependencies are part of the inputs
+                    dep_hashes = [
+                        digest["sha256"]
+                        for dep in artifact.after
+                        for digest in new_manifest.get(dep, {}).get("outputs", {}).values()
+                    ]
+                    input_hash = self.input_hash(artifact, values, dep_hashes)
+                    futures[artifact.name] = pool.submit(
+                        self._build_one, artifact, values, directory,
+                        manifest.get(artifact.name), input_hash, force
+                    )
+                for name, future in futures.items():
+                    result, entry = future.result()
+                    results[name] = result
+                    if entry is not None:
+                        new_manifest[name] = entry
+
+        if new_manifest != manifest:
+            try:
+                write_atomic(manifest_path, json.dumps(new_manifest, indent=2).encode())
+            except Exception as e:
+                raise Exception(f"Failed to write build manifest: {str(e)}")
+        return [results[name] for name in self.artifacts]
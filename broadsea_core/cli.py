@@ -0,0 +1,450 @@
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+def cmd_generate(args) -> int:
+    """Write an .env from schema defaults, an answers file and the environment"""
+    from broadsea_core.schema import create_sections
+    from broadsea_core.generate import generate, load_answers, unknown_keys
+    from broadsea_core.envfile import format_env, write_env
+
+    sections = create_sections()
+    answers = {}
+    overrides = {}
+    try:
+        if args.answers:
+            answers = load_answers(args.answers)
+        for assignment in args.set or []:
+            key, sep, value = assignment.partition('=')
+            if not sep:
+                raise Exception(f"--set expects KEY=VALUE, got '{assignment}'")
+            overrides[key.strip()] = value
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    for key in unknown_keys(sections, {**answers, **overrides}):
+        print(f"warning: unknown key {key} ignored", file=sys.stderr)
+
+    environ = os.environ if args.env else None
+    config, issues = generate(sections, answers, environ, args.env_prefix, overrides)
+    if args.resolve:
+        from broadsea_core.interpolate import resolve_config
+        config = resolve_config(config)
+
+    if issues and not args.skip_validation:
+        print("Validation issues:", file=sys.stderr)
+        for issue in issues:
+            print(f"  {issue}", file=sys.stderr)
+        return 1
+
+    try:
+        if args.output == '-':
+            sys.stdout.write(format_env(config))
+        else:
+            write_env(config, args.output)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+def cmd_export(args) -> int:
+    """Export an .env to several formats, skipping files that would not change"""
+    from broadsea_core.envfile import load_config
+    from broadsea_core.export import TARGETS, export
+
+    targets = args.targets.split(',') if args.targets else list(TARGETS)
+    try:
+        results = export(load_config(args.input), args.directory, targets)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    for result in results:
+        status = "wrote" if result.written else "unchanged"
+        print(f"{status:9} {result.path}")
+    return 0
+
+def cmd_build(args) -> int:
+    """Bring generated deployment files up to date with an .env"""
+    from broadsea_core.envfile import load_config
+    from broadsea_core.artifacts import BuildGraph
+
+    try:
+        config = load_config(args.input)
+        values = {key: value for section in config.values() for key, value in section.items()}
+        directory = args.directory or os.path.dirname(os.path.abspath(args.input))
+        results = BuildGraph(workers=args.jobs).build(values, directory, force=args.force)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    for result in results:
+        detail = f" ({result.message})" if result.message else ""
+        print(f"{result.status:9} {result.name}{detail}")
+    return 1 if any(result.status in ("failed", "skipped") for result in results) else 0
+
+def cmd_db(args) -> int:
+    """Import, query and export a SQLite store of many sites' configurations"""
+    from broadsea_core.fleetdb import FleetStore
+
+    try:
+        with FleetStore(args.db) as store:
+            if args.db_command == "import":
+                imported, skipped, removed = store.import_directory(args.directory)
+                print(f"imported {imported} file(s), {skipped} unchanged, {removed} site(s) removed")
+            elif args.db_command == "export":
+                print(f"exported {store.export_directory(args.directory)} site(s)")
+            elif args.db_command == "find":
+                for site, value in store.find(args.key, args.equals, args.prefix, args.contains):
+                    print(f"{site}\t{value}")
+            elif args.db_command == "values":
+                for value, count in store.distribution(args.key):
+                    print(f"{count}\t{value}")
+            elif args.db_command == "sites":
+                for site in store.sites():
+                    print(site)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+def cmd_fleet(args) -> int:
+    """Render every site of an inventory from a shared base configuration"""
+    from broadsea_core.fleet import load_inventory, render_fleet, write_report
+    from broadsea_core.layers import Layer, OverlayResolver
+
+    resolver = OverlayResolver()
+    try:
+        base = [Layer.from_file(path) for path in args.base or []]
+        inventory = load_inventory(args.inventory)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    def progress(done, total, result):
+        detail = f" ({result.issues[0]})" if result.status != "ok" and result.issues else ""
+        print(f"[{done}/{total}] {result.status:7} {result.site}{detail}", flush=True)
+
+    started = time.perf_counter()
+    try:
+        results = render_fleet(base, inventory, args.directory, args.jobs, args.compose,
+                               args.skip_validation, None if args.quiet else progress, resolver)
+        if args.report:
+            write_report(results, args.report)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    bad = sum(1 for result in results if result.status != "ok")
+    print(f"rendered {len(results) - bad} of {len(results)} site(s) in {time.perf_counter() - started:.1f}s, "
+          f"{resolver.merges} layer merge(s)", file=sys.stderr)
+    return 1 if bad else 0
+
+def cmd_lint(args) -> int:
+    """Validate existing .env files without the GUI"""
+    from broadsea_core.lint import REPORTS, expand_paths, lint_files
+
+    paths = list(expand_paths(args.paths))
+    if not paths:
+        print("error: no .env files found", file=sys.stderr)
+        return 2
+    results = lint_files(paths, args.jobs)
+    try:
+        if args.format != "text":
+            report = REPORTS[args.format](results, args.strict)
+            if args.output in (None, "-"):
+                sys.stdout.write(report)
+            else:
+                with open(args.output, 'w') as f:
+                    f.write(report)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.format == "text" or args.output not in (None, "-"):
+        for result in results:
+            if result.error:
+                print(f"{result.path}: error: {result.error}")
+            for issue in result.issues:
+                print(f"{result.path}: {issue.severity}: {issue.key}: {issue.message}")
+    failed = sum(1 for result in results if result.failed(args.strict))
+    print(f"{len(results) - failed} of {len(results)} file(s) passed", file=sys.stderr)
+    return 1 if failed else 0
+
+def cmd_diff(args) -> int:
+    """Compare one .env with others and list added, removed and changed keys"""
+    from broadsea_core.diff import ConfigTree, compare_many, format_change
+    from broadsea_core.lint import expand_paths
+
+    try:
+        base = ConfigTree.from_file(args.base)
+        others = [ConfigTree.from_file(path) for path in expand_paths(args.others)]
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if not others:
+        print("error: no .env files to compare with", file=sys.stderr)
+        return 2
+
+    results = compare_many(base, others, mask_secrets=not args.show_secrets)
+    if args.json:
+        import json
+        from dataclasses import asdict
+        json.dump({name: [asdict(change) for change in changes] for name, changes in results.items()},
+                  sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for name, changes in results.items():
+            if not changes:
+                continue
+            if len(results) > 1:
+                print(f"{name}:")
+            for change in changes:
+                print(("  " if len(results) > 1 else "") + format_change(change))
+    differing = sum(1 for changes in results.values() if changes)
+    if len(results) > 1:
+        print(f"{differing} of {len(results)} file(s) differ", file=sys.stderr)
+    return 1 if differing else 0
+
+def cmd_drift(args) -> int:
+    """Report deployed .env and secret files that no longer match the desired ones"""
+    from broadsea_core.diff import format_change
+    from broadsea_core.drift import DriftScanner
+
+    started = time.perf_counter()
+    try:
+        scanner = DriftScanner(args.desired, args.deployed, args.cache)
+        results = scanner.scan(accept=args.accept)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        import json
+        from dataclasses import asdict
+        json.dump([asdict(result) for result in results if result.status != "clean"], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for result in results:
+            if result.status == "clean":
+                continue
+            print(f"{result.site}: {result.status}")
+            for change in result.changes:
+                print(f"  {format_change(change)}")
+            for issue in result.secrets:
+                print(f"  ! {issue.key}: {issue.path} {issue.problem}")
+    drifted = sum(1 for result in results if result.status != "clean")
+    print(f"{drifted} of {len(results)} site(s) drifted, {scanner.reads} file(s) read "
+          f"in {(time.perf_counter() - started) * 1000:.0f}ms", file=sys.stderr)
+    return 1 if drifted else 0
+
+def cmd_import(args) -> int:
+    """Write a sectioned .env from upstream Broadsea .env and docker-compose files"""
+    from broadsea_core.envfile import format_env, write_env
+    from broadsea_core.importer import EXTRA_SECTION, import_files
+
+    if not args.env and not args.compose:
+        print("error: give at least one .env or --compose file", file=sys.stderr)
+        return 2
+    try:
+        result = import_files(args.env, args.compose or [], args.defaults)
+        config = result.to_config()
+        if args.output == '-':
+            sys.stdout.write(format_env(config))
+        else:
+            write_env(config, args.output)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    imported = sum(1 for source in result.sources.values() if source)
+    print(f"{imported} value(s) imported, {len(result.extras)} unknown key(s) kept in {EXTRA_SECTION}",
+          file=sys.stderr)
+    for key in result.extras:
+        print(f"  {key}", file=sys.stderr)
+    return 0
+
+def cmd_layers(args) -> int:
+    """Write an .env merged from ordered layers and show where values came from"""
+    from broadsea_core.envfile import format_env, write_env
+    from broadsea_core.layers import DEFAULTS_LAYER, OverlayResolver
+    from broadsea_core.schema import get_registry
+    from broadsea_core.validation import validate_config
+
+    try:
+        resolved = OverlayResolver().resolve_files(args.layers)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.explain is not None:
+        keys = args.explain or [key for key in resolved.values if resolved.sources[key] != DEFAULTS_LAYER]
+        for key in keys:
+            value, source = resolved.explain(key)
+            print(f"{key}={value}\t# {source or 'not set'}")
+        return 0
+
+    issues = validate_config(get_registry().sections, resolved.values)
+    if issues and not args.skip_validation:
+        print("Validation issues:", file=sys.stderr)
+        for issue in issues:
+            print(f"  {issue}", file=sys.stderr)
+        return 1
+    config = resolved.to_config()
+    if args.resolve:
+        from broadsea_core.interpolate import resolve_config
+        config = resolve_config(config)
+    try:
+        if args.output == '-':
+            sys.stdout.write(format_env(config))
+        else:
+            write_env(config, args.output)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+def cmd_migrate(args) -> int:
+    """Rewrite .env files written for an older schema version"""
+    from broadsea_core.lint import expand_paths
+    from broadsea_core.migrate import LATEST, migrate_files, version_index
+
+    source, target = getattr(args, "from"), args.to or LATEST
+    try:
+        # Checked here rather than with argparse choices so other commands never import migrate
+        for version in filter(None, (source, target)):
+            version_index(version)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    paths = list(expand_paths(args.paths))
+    if not paths:
+        print("error: no .env files found", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    migrated = failed = 0
+    for result in migrate_files(paths, target, source, args.dry_run, args.jobs, not args.no_backup):
+        if result.error:
+            failed += 1
+        elif result.changed:
+            migrated += 1
+        elif args.quiet:
+            continue
+        print(result.summary())
+    print(f"{migrated} of {len(paths)} file(s) {'would be ' if args.dry_run else ''}migrated, {failed} failed "
+          f"in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="broadsea_core",
+        description="Headless Broadsea configuration tools"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gen = subparsers.add_parser("generate", help="Generate a Broadsea .env without the GUI")
+    gen.add_argument("-a", "--answers", help="JSON or YAML answers file (flat or per section)")
+    gen.add_argument("-o", "--output", default=".env", help="Output file, '-' for stdout (default: .env)")
+    gen.add_argument("--set", action="append", metavar="KEY=VALUE", help="Override a single key")
+    gen.add_argument("--env", action="store_true", help="Take values from environment variables")
+    gen.add_argument("--env-prefix", default="", help="Prefix for environment variable names")
+    gen.add_argument("--skip-validation", action="store_true", help="Write even if validation fails")
+    gen.add_argument("--resolve", action="store_true", help="Write ${KEY} references as their values")
+    gen.set_defaults(func=cmd_generate)
+
+    exp = subparsers.add_parser("export", help="Export an .env as .env, JSON, YAML and Compose files")
+    exp.add_argument("-i", "--input", default=".env", help="Input .env file (default: .env)")
+    exp.add_argument("-d", "--directory", required=True, help="Directory to write the exports to")
+    exp.add_argument("-t", "--targets", help="Comma-separated subset of: env, json, yaml, compose")
+    exp.set_defaults(func=cmd_export)
+
+    bld = subparsers.add_parser("build", help="Generate compose, secrets and service config files")
+    bld.add_argument("-i", "--input", default=".env", help="Input .env file (default: .env)")
+    bld.add_argument("-d", "--directory", help="Deployment directory (default: the .env's directory)")
+    bld.add_argument("-j", "--jobs", type=int, default=4, help="Artifacts rendered in parallel")
+    bld.add_argument("--force", action="store_true", help="Rebuild even if inputs are unchanged")
+    bld.set_defaults(func=cmd_build)
+
+    flt = subparsers.add_parser("fleet", help="Render an .env per site from a base config and an inventory")
+    flt.add_argument("inventory", help="CSV or JSON file of per-site overrides with a 'site' column/key")
+    flt.add_argument("-b", "--base", action="append",
+                     help="Shared .env or JSON/YAML answers file; repeat to layer them, e.g. org then environment")
+    flt.add_argument("-d", "--directory", default="sites", help="Output directory, one folder per site (default: sites)")
+    flt.add_argument("-j", "--jobs", type=int, help="Worker processes (default: CPU count)")
+    flt.add_argument("--compose", action="store_true", help="Also write each site's docker-compose.yml")
+    flt.add_argument("--report", help="Write a JSON report of every site with issues")
+    flt.add_argument("--skip-validation", action="store_true", help="Write sites even if validation fails")
+    flt.add_argument("-q", "--quiet", action="store_true", help="Do not print per-site progress")
+    flt.set_defaults(func=cmd_fleet)
+
+    lay = subparsers.add_parser("layers", help="Merge defaults, base, environment and site layers into an .env")
+    lay.add_argument("layers", nargs="+", help=".env or JSON/YAML files, lowest precedence first")
+    lay.add_argument("-o", "--output", default=".env", help="Output file, '-' for stdout (default: .env)")
+    lay.add_argument("--explain", nargs="*", metavar="KEY",
+                     help="Print the given keys, or every key not left at its default, with the layer that set it")
+    lay.add_argument("--skip-validation", action="store_true", help="Write even if validation fails")
+    lay.add_argument("--resolve", action="store_true", help="Write ${KEY} references as their values")
+    lay.set_defaults(func=cmd_layers)
+
+    imp = subparsers.add_parser("import", help="Import upstream Broadsea .env and docker-compose files")
+    imp.add_argument("env", nargs="*", help=".env files, later ones overriding earlier ones")
+    imp.add_argument("-c", "--compose", action="append",
+                     help="docker-compose file to take values missing from the .env files from (repeatable)")
+    imp.add_argument("-o", "--output", default=".env", help="Output file, '-' for stdout (default: .env)")
+    imp.add_argument("--defaults", action="store_true", help="Fill keys missing from the sources with schema defaults")
+    imp.set_defaults(func=cmd_import)
+
+    lnt = subparsers.add_parser("lint", help="Validate existing .env files")
+    lnt.add_argument("paths", nargs="+", help=".env files, or directories to search for them")
+    lnt.add_argument("-j", "--jobs", type=int, help="Worker processes (default: CPU count)")
+    lnt.add_argument("-f", "--format", choices=["text", "json", "junit"], default="text",
+                     help="Report format (default: text)")
+    lnt.add_argument("-o", "--output", help="Write the report to a file instead of stdout")
+    lnt.add_argument("--strict", action="store_true", help="Fail on warnings such as unknown keys")
+    lnt.set_defaults(func=cmd_lint)
+
+    dif = subparsers.add_parser("diff", help="Show added, removed and changed keys between .env files")
+    dif.add_argument("base", help="The .env to compare against")
+    dif.add_argument("others", nargs="+", help=".env files, or directories to search for them")
+    dif.add_argument("--show-secrets", action="store_true", help="Print passwords and keys instead of masking them")
+    dif.add_argument("--json", action="store_true", help="Print the changes as JSON")
+    dif.set_defaults(func=cmd_diff)
+
+    drf = subparsers.add_parser("drift", help="Compare deployed .env and secret files with desired ones")
+    drf.add_argument("desired", help="Directory of desired configs, one <site>/.env per site")
+    drf.add_argument("deployed", help="Directory of deployed sites in the same layout")
+    drf.add_argument("--cache", help="Stat cache file (default: .broadsea-drift.json in the deployed directory)")
+    drf.add_argument("--accept", action="store_true", help="Accept the current content of secret files")
+    drf.add_argument("--json", action="store_true", help="Print drifted sites as JSON")
+    drf.set_defaults(func=cmd_drift)
+
+    db = subparsers.add_parser("db", help="Query many sites' configurations in a SQLite store")
+    db.add_argument("--db", default="fleet.sqlite", help="SQLite database file (default: fleet.sqlite)")
+    db_commands = db.add_subparsers(dest="db_command", required=True)
+    db_import = db_commands.add_parser("import", help="Import every .env below a directory")
+    db_import.add_argument("directory")
+    db_export = db_commands.add_parser("export", help="Write every site back as an .env")
+    db_export.add_argument("directory")
+    db_find = db_commands.add_parser("find", help="Sites and their value for a key")
+    db_find.add_argument("key")
+    match = db_find.add_mutually_exclusive_group()
+    match.add_argument("--equals", help="Only sites with exactly this value")
+    match.add_argument("--prefix", help="Only sites whose value starts with this")
+    match.add_argument("--contains", help="Only sites whose value contains this")
+    db_values = db_commands.add_parser("values", help="Distinct values of a key with site counts")
+    db_values.add_argument("key")
+    db_commands.add_parser("sites", help="List imported sites")
+    db.set_defaults(func=cmd_db)
+
+    mig = subparsers.add_parser("migrate", help="Upgrade .env files to the current schema version")
+    mig.add_argument("paths", nargs="+", help=".env files, or directories to search for them")
+    mig.add_argument("--from", help="Schema version of the files (default: read from each file)")
+    mig.add_argument("--to", help="Schema version to migrate to (default: the latest)")
+    mig.add_argument("-j", "--jobs", type=int, help="Worker processes (default: CPU count)")
+    mig.add_argument("--dry-run", action="store_true", help="Report the changes without writing the files")
+    mig.add_argument("--no-backup", action="store_true", help="Do not keep the original of each file as .env.bak")
+    mig.add_argument("-q", "--quiet", action="store_true", help="Only list files that were changed or failed")
+    mig.set_defaults(func=cmd_migrate)
+
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,522 @@
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from broadsea_core.interpolate import resolve_values
+from broadsea_core.schema import get_registry
+
+# Compose files written by the generator start with this line
+HEADER = "# Generated by the Broadsea configurator from .env; edit the configuration instead\n"
+
+ENCODING = "utf-8"
+
+def yaml_dumper():
+    """The libyaml-backed dumper when PyYAML was built with it"""
+    try:
+        import yaml
+    except ImportError:
+        raise Exception("PyYAML is required for YAML export")
+    return yaml, getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+@dataclass(frozen=True)
+class Fragment:
+    """One block of the compose file, built only from the keys it declares"""
+    name: str
+    # Top-level compose key the block belongs to: services, secrets or volumes
+    parent: str
+    keys: Tuple[str, ...]
+    build: Callable[[Mapping[str, str]], dict]
+
+def secret_name(key: str) -> str:
+    """Compose secret name for a *_FILE key"""
+    return key[:-len("_FILE")]
+
+def secret_env(key: str) -> str:
+    return f"/run/secrets/{secret_name(key)}"
+
+def traefik_labels(router: str, path: str, port: int, v: Mapping[str, str]) -> List[str]:
+    """Labels routing {HTTP_TYPE}://{BROADSEA_HOST}{path} to the service"""
+    entrypoint = "websecure" if v["HTTP_TYPE"] == "https" else "web"
+    labels = [
+        "traefik.enable=true",
+        f"traefik.http.routers.{router}.entrypoints={entrypoint}",
+        f"traefik.http.routers.{router}.rule=Host(`{v['BROADSEA_HOST']}`) && PathPrefix(`{path}`)",
+        f"traefik.http.services.{router}.loadbalancer.server.port={port}",
+    ]
+    if entrypoint == "websecure":
+        labels.append(f"traefik.http.routers.{router}.tls=true")
+    return labels
+
+ROUTING_KEYS = ("BROADSEA_HOST", "HTTP_TYPE")
+
+def build_traefik(v):
+    return {
+        "image": "traefik:v2.10.7",
+        "profiles": ["default", "traefik"],
+        "command": [
+            "--providers.docker=true",
+            "--providers.docker.exposedbydefault=false",
+            "--entrypoints.web.address=:80",
+            "--entrypoints.websecure.address=:443",
+        ],
+        "ports": ["443:443"] if v["HTTP_TYPE"] == "https" else ["80:80"],
+        "volumes": [
+            "/var/run/docker.sock:/var/run/docker.sock:ro",
+            "./certs:/etc/traefik/certs:ro",
+        ],
+    }
+
+def build_atlasdb(v):
+    return {
+        "image": "ohdsi/broadsea-atlasdb:2.0.0",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["default", "atlasdb"],
+        "environment": {
+            "POSTGRES_PASSWORD_FILE": secret_env("WEBAPI_DATASOURCE_PASSWORD_FILE"),
+        },
+        "secrets": [secret_name("WEBAPI_DATASOURCE_PASSWORD_FILE")],
+        "ports": ["5432:5432"],
+        "volumes": ["atlasdb-postgres-data:/var/lib/postgresql/data"],
+        "healthcheck": {
+            "test": ["CMD-SHELL", "pg_isready -U postgres"],
+            "interval": "10s",
+            "retries": 10,
+        },
+    }
+
+def webapi_environment(v) -> Dict[str, str]:
+    environment = {
+        "DATASOURCE_DRIVERCLASSNAME": "org.postgresql.Driver",
+        "DATASOURCE_URL": v["WEBAPI_DATASOURCE_URL"],
+        "DATASOURCE_USERNAME": v["WEBAPI_DATASOURCE_USERNAME"],
+        "DATASOURCE_PASSWORD_FILE": secret_env("WEBAPI_DATASOURCE_PASSWORD_FILE"),
+        "DATASOURCE_OHDSI_SCHEMA": "webapi",
+        "FLYWAY_BASELINE_ON_MIGRATE": v["FLYWAY_BASELINE_ON_MIGRATE"],
+        "LOGGING_LEVEL_ROOT": v["WEBAPI_LOGGING_LEVEL_ROOT"],
+        "LOGGING_LEVEL_ORG_OHDSI": v["WEBAPI_LOGGING_LEVEL_ORG_OHDSI"],
+        "SECURITY_PROVIDER": v["ATLAS_SECURITY_PROVIDER_TYPE"],
+        "SECURITY_AUTH_JDBC_ENABLED": v["SECURITY_AUTH_JDBC_ENABLED"],
+        "SECURITY_AUTH_LDAP_ENABLED": v["SECURITY_AUTH_LDAP_ENABLED"],
+    }
+    if v["SECURITY_AUTH_JDBC_ENABLED"] == "true":
+        environment["SECURITY_DB_DATASOURCE_SCHEMA"] = v["SECURITY_DB_DATASOURCE_SCHEMA"]
+    if v["SECURITY_AUTH_LDAP_ENABLED"] == "true":
+        environment["SECURITY_LDAP_URL"] = v["SECURITY_LDAP_URL"]
+    if v["SOLR_VOCAB_ENDPOINT"]:
+        environment["SOLR_ENDPOINT"] = v["SOLR_VOCAB_ENDPOINT"]
+    return environment
+
+WEBAPI_KEYS = (
+    "DOCKER_ARCH", *ROUTING_KEYS, "ATLAS_VERSION",
+    "FLYWAY_BASELINE_ON_MIGRATE", "WEBAPI_LOGGING_LEVEL_ROOT", "WEBAPI_LOGGING_LEVEL_ORG_OHDSI",
+    "WEBAPI_DATASOURCE_URL", "WEBAPI_DATASOURCE_USERNAME",
+    "ATLAS_SECURITY_PROVIDER_TYPE", "SECURITY_AUTH_JDBC_ENABLED", "SECURITY_DB_DATASOURCE_SCHEMA",
+    "SECURITY_AUTH_LDAP_ENABLED", "SECURITY_LDAP_URL", "SOLR_VOCAB_ENDPOINT",
+)
+
+def build_webapi(v):
+    return {
+        "image": f"ohdsi/webapi:{v['ATLAS_VERSION']}",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["default", "webapi-from-image"],
+        "environment": webapi_environment(v),
+        "secrets": [secret_name("WEBAPI_DATASOURCE_PASSWORD_FILE")],
+        "labels": traefik_labels("ohdsi-webapi", "/WebAPI", 8080, v),
+        "depends_on": {"broadsea-atlasdb": {"condition": "service_healthy"}},
+    }
+
+def build_webapi_from_git(v):
+    return {
+        "build": {
+            "context": v["WEBAPI_GITHUB_URL"],
+            "args": {"MAVEN_PROFILE": v["WEBAPI_MAVEN_PROFILE"]},
+        },
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["webapi-from-git"],
+        "environment": webapi_environment(v),
+        "secrets": [secret_name("WEBAPI_DATASOURCE_PASSWORD_FILE")],
+        "labels": traefik_labels("ohdsi-webapi", "/WebAPI", 8080, v),
+        "depends_on": {"broadsea-atlasdb": {"condition": "service_healthy"}},
+    }
+
+def atlas_environment(v) -> Dict[str, str]:
+    return {
+        "WEBAPI_URL": f"{v['HTTP_TYPE']}://{v['BROADSEA_HOST']}/WebAPI/",
+        "ATLAS_USER_AUTH_ENABLED": v["ATLAS_USER_AUTH_ENABLED"],
+        "ATLAS_COHORT_COMPARISON_RESULTS_ENABLED": v["ATLAS_COHORT_COMPARISON_RESULTS_ENABLED"],
+        "ATLAS_PLP_RESULTS_ENABLED": v["ATLAS_PLP_RESULTS_ENABLED"],
+        "ATLAS_SECURITY_PROVIDER_TYPE": v["ATLAS_SECURITY_PROVIDER_TYPE"],
+        "ATLAS_SECURITY_PROVIDER_NAME": v["ATLAS_SECURITY_PROVIDER_NAME"],
+    }
+
+ATLAS_KEYS = (
+    "DOCKER_ARCH", *ROUTING_KEYS, "ATLAS_PORT",
+    "ATLAS_USER_AUTH_ENABLED", "ATLAS_COHORT_COMPARISON_RESULTS_ENABLED", "ATLAS_PLP_RESULTS_ENABLED",
+    "ATLAS_SECURITY_PROVIDER_TYPE", "ATLAS_SECURITY_PROVIDER_NAME",
+)
+
+def build_atlas(v):
+    return {
+        "image": f"ohdsi/atlas:{v['ATLAS_VERSION']}",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["default", "atlas-from-image"],
+        "environment": atlas_environment(v),
+        "ports": [f"{v['ATLAS_PORT']}:8080"],
+        "labels": traefik_labels("ohdsi-atlas", "/atlas", 8080, v),
+        "depends_on": ["ohdsi-webapi"],
+    }
+
+def build_atlas_from_git(v):
+    return {
+        "build": {"context": v["ATLAS_GITHUB_URL"]},
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["atlas-from-git"],
+        "environment": atlas_environment(v),
+        "ports": [f"{v['ATLAS_PORT']}:8080"],
+        "labels": traefik_labels("ohdsi-atlas", "/atlas", 8080, v),
+    }
+
+CONTENT_KEYS = (
+    "CONTENT_TITLE", "CONTENT_ARES_DISPLAY", "CONTENT_ATLAS_DISPLAY", "CONTENT_HADES_DISPLAY",
+    "CONTENT_OPENSHINYSERVER_DISPLAY", "CONTENT_PGADMIN4_DISPLAY",
+    "CONTENT_POSITCONNECT_DISPLAY", "CONTENT_PERSEUS_DISPLAY",
+)
+
+def build_content(v):
+    return {
+        "image": "ohdsi/broadsea-content:2.0.0",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["default", "content"],
+        "environment": {
+            "CONTENT_HOST": v["BROADSEA_HOST"],
+            "CONTENT_HTTP_TYPE": v["HTTP_TYPE"],
+            **{key: v[key] for key in CONTENT_KEYS},
+        },
+        "labels": traefik_labels("broadsea-content", "/", 8080, v),
+    }
+
+def build_hades(v):
+    return {
+        "image": "ohdsi/broadsea-hades:4.2.1",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["default", "hades"],
+        "environment": {
+            "USER": v["HADES_USER"],
+            "PASSWORD_FILE": secret_env("HADES_PASSWORD_FILE"),
+        },
+        "secrets": [secret_name("HADES_PASSWORD_FILE")],
+        "ports": ["8787:8787"],
+        "volumes": ["rstudio-home-data:/home"],
+        "labels": traefik_labels("broadsea-hades", "/hades", 8787, v),
+    }
+
+def build_solr(v):
+    return {
+        "image": "solr:9.3.0",
+        "profiles": ["solr-vocab"],
+        "environment": {
+            "SOLR_VOCAB_VERSION": v["SOLR_VOCAB_VERSION"],
+            "SOLR_VOCAB_DATABASE_SCHEMA": v["SOLR_VOCAB_DATABASE_SCHEMA"],
+            "SOLR_VOCAB_ENDPOINT": v["SOLR_VOCAB_ENDPOINT"],
+        },
+        "ports": ["8983:8983"],
+        "volumes": ["solr-data:/var/solr"],
+    }
+
+def build_vocab_load(v):
+    return {
+        "image": "ohdsi/broadsea-omop-vocab-pg-load:1.0.0",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["omop-vocab-pg-load"],
+        "environment": {
+            "VOCAB_PG_HOST": v["VOCAB_PG_HOST"],
+            "VOCAB_PG_DATABASE": v["VOCAB_PG_DATABASE"],
+            "VOCAB_PG_SCHEMA": v["VOCAB_PG_SCHEMA"],
+            "VOCAB_PG_USER": v["VOCAB_PG_USER"],
+            "VOCAB_PG_PASSWORD_FILE": secret_env("VOCAB_PG_PASSWORD_FILE"),
+            "UMLS_API_KEY_FILE": secret_env("UMLS_API_KEY_FILE"),
+        },
+        "secrets": [secret_name("VOCAB_PG_PASSWORD_FILE"), secret_name("UMLS_API_KEY_FILE")],
+        "volumes": [f"{v['VOCAB_PG_FILES_PATH']}:/tmp/omop_vocab_files:rw"],
+    }
+
+def build_phoebe_load(v):
+    return {
+        "image": "ohdsi/broadsea-phoebe-pg-load:1.0.0",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["phoebe-pg-load"],
+        "environment": {
+            "PHOEBE_PG_HOST": v["PHOEBE_PG_HOST"],
+            "PHOEBE_PG_DATABASE": v["PHOEBE_PG_DATABASE"],
+            "PHOEBE_PG_SCHEMA": v["PHOEBE_PG_SCHEMA"],
+            "PHOEBE_PG_USER": v["PHOEBE_PG_USER"],
+            "PHOEBE_PG_PASSWORD_FILE": secret_env("PHOEBE_PG_PASSWORD_FILE"),
+        },
+        "secrets": [secret_name("PHOEBE_PG_PASSWORD_FILE")],
+    }
+
+def build_ares(v):
+    return {
+        "image": "ohdsi/broadsea-ares:1.0.0",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["default", "ares"],
+        "volumes": [f"./{v['ARES_DATA_FOLDER']}:/usr/share/nginx/html/ares/data:ro"],
+        "labels": traefik_labels("broadsea-ares", "/ares", 80, v),
+    }
+
+def build_openldap(v):
+    return {
+        "image": "bitnami/openldap:2.6",
+        "profiles": ["openldap"],
+        "environment": {
+            "LDAP_ADMIN_USERNAME": "admin",
+            "LDAP_ADMIN_PASSWORD_FILE": secret_env("OPENLDAP_ADMIN_PASSWORD_FILE"),
+            "LDAP_USERS": v["OPENLDAP_USERS"],
+            "LDAP_PASSWORDS_FILE": secret_env("OPENLDAP_ACCOUNT_PASSWORDS_FILE"),
+        },
+        "secrets": [
+            secret_name("OPENLDAP_ADMIN_PASSWORD_FILE"),
+            secret_name("OPENLDAP_ACCOUNT_PASSWORDS_FILE"),
+        ],
+        "ports": ["1389:1389"],
+    }
+
+def build_shiny(v):
+    return {
+        "image": "ohdsi/broadsea-open-shiny-server:1.0.0",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["open-shiny-server"],
+        "volumes": [f"{v['OPEN_SHINY_SERVER_APP_ROOT']}:/srv/shiny-server/:rw"],
+        "labels": traefik_labels("broadsea-open-shiny-server", "/shiny", 3838, v),
+    }
+
+def build_posit(v):
+    return {
+        "image": f"rstudio/rstudio-connect:ubuntu2204-r{v['POSIT_CONNECT_R_VERSION']}",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["posit-connect"],
+        "privileged": True,
+        "environment": {
+            "RSC_LICENSE_SERVER": v["POSIT_CONNECT_LICENSE_SERVER"],
+            "R_VERSION": v["POSIT_CONNECT_R_VERSION"],
+        },
+        "volumes": [
+            f"{v['POSIT_CONNECT_LICENSE_FILE']}:/etc/rstudio-connect/license.lic:ro",
+            f"{v['POSIT_CONNECT_GCFG_FILE']}:/etc/rstudio-connect/rstudio-connect.gcfg:ro",
+        ],
+        "labels": traefik_labels("broadsea-posit-connect", "/connect", 3939, v),
+    }
+
+def build_perseus(v):
+    environment = {
+        "TOKEN_SECRET_KEY": v["PERSEUS_TOKEN_SECRET_KEY"],
+        "EMAIL_SECRET_KEY": v["PERSEUS_EMAIL_SECRET_KEY"],
+    }
+    if v["PERSEUS_SMTP_SERVER"]:
+        environment["SMTP_SERVER"] = v["PERSEUS_SMTP_SERVER"]
+        environment["SMTP_PORT"] = v["PERSEUS_SMTP_PORT"]
+    return {
+        "image": "perseushub/backend:latest",
+        "profiles": ["perseus"],
+        "environment": environment,
+        "volumes": [f"{v['PERSEUS_VOCAB_FILES_PATH']}:/data/vocabulary:ro"],
+        "labels": traefik_labels("broadsea-perseus", "/perseus", 5004, v),
+    }
+
+def build_postprocessing(v):
+    return {
+        "image": "ohdsi/broadsea-achilles:1.0.0",
+        "platform": v["DOCKER_ARCH"],
+        "profiles": ["cdm-postprocessing"],
+        "environment": {
+            "CDM_CONNECTIONDETAILS_DBMS": v["CDM_CONNECTIONDETAILS_DBMS"],
+            "CDM_CONNECTIONDETAILS_SERVER": v["CDM_CONNECTIONDETAILS_SERVER"],
+            "CDM_CONNECTIONDETAILS_USER": v["CDM_CONNECTIONDETAILS_USER"],
+            "CDM_CONNECTIONDETAILS_PASSWORD_FILE": secret_env("CDM_CONNECTIONDETAILS_PASSWORD_FILE"),
+            "CDM_VOCAB_DATABASE_SCHEMA": v["VOCAB_DATABASE_SCHEMA"],
+            "ACHILLES_CREATE_TABLE": v["ACHILLES_CREATE_TABLE"],
+            "ACHILLES_SMALL_CELL_COUNT": v["ACHILLES_SMALL_CELL_COUNT"],
+            "DQD_NUM_THREADS": v["DQD_NUM_THREADS"],
+            "DQD_WRITE_TO_TABLE": v["DQD_WRITE_TO_TABLE"],
+            "ARES_RUN_NETWORK": v["ARES_RUN_NETWORK"],
+        },
+        "secrets": [secret_name("CDM_CONNECTIONDETAILS_PASSWORD_FILE")],
+        "volumes": [f"./{v['ARES_DATA_FOLDER']}:/opt/achilles/ares:rw"],
+    }
+
+def build_pgadmin(v):
+    return {
+        "image": "dpage/pgadmin4:8.2",
+        "profiles": ["default", "pgadmin4"],
+        "environment": {
+            "PGADMIN_DEFAULT_EMAIL": v["PGADMIN_ADMIN_USER"],
+            "PGADMIN_DEFAULT_PASSWORD_FILE": secret_env("PGADMIN_DEFAULT_PASSWORD_FILE"),
+            "SCRIPT_NAME": "/pgadmin4",
+        },
+        "secrets": [secret_name("PGADMIN_DEFAULT_PASSWORD_FILE")],
+        "volumes": ["pgadmin4-data:/var/lib/pgadmin"],
+        "labels": traefik_labels("broadsea-pgadmin4", "/pgadmin4", 80, v),
+    }
+
+SECRET_KEYS = (
+    "WEBAPI_DATASOURCE_PASSWORD_FILE", "CDM_CONNECTIONDETAILS_PASSWORD_FILE", "HADES_PASSWORD_FILE",
+    "VOCAB_PG_PASSWORD_FILE", "UMLS_API_KEY_FILE", "PHOEBE_PG_PASSWORD_FILE",
+    "OPENLDAP_ADMIN_PASSWORD_FILE", "OPENLDAP_ACCOUNT_PASSWORDS_FILE", "PGADMIN_DEFAULT_PASSWORD_FILE",
+)
+
+def build_secrets(v):
+    return {secret_name(key): {"file": v[key]} for key in SECRET_KEYS}
+
+def build_volumes(v):
+    names = ("atlasdb-postgres-data", "rstudio-home-data", "solr-data", "pgadmin4-data")
+    return {name: None for name in names}
+
+FRAGMENTS: Tuple[Fragment, ...] = (
+    Fragment("traefik", "services", ("HTTP_TYPE",), build_traefik),
+    Fragment("broadsea-atlasdb", "services", ("DOCKER_ARCH",), build_atlasdb),
+    Fragment("ohdsi-webapi", "services", WEBAPI_KEYS, build_webapi),
+    Fragment("ohdsi-webapi-from-git", "services",
+             (*WEBAPI_KEYS, "WEBAPI_GITHUB_URL", "WEBAPI_MAVEN_PROFILE"), build_webapi_from_git),
+    Fragment("ohdsi-atlas", "services", (*ATLAS_KEYS, "ATLAS_VERSION"), build_atlas),
+    Fragment("ohdsi-atlas-from-git", "services", (*ATLAS_KEYS, "ATLAS_GITHUB_URL"), build_atlas_from_git),
+    Fragment("broadsea-content", "services", ("DOCKER_ARCH", *ROUTING_KEYS, *CONTENT_KEYS), build_content),
+    Fragment("broadsea-hades", "services", ("DOCKER_ARCH", *ROUTING_KEYS, "HADES_USER"), build_hades),
+    Fragment("broadsea-solr-vocab", "services",
+             ("SOLR_VOCAB_ENDPOINT", "SOLR_VOCAB_VERSION", "SOLR_VOCAB_DATABASE_SCHEMA"), build_solr),
+    Fragment("omop-vocab-pg-load", "services",
+             ("DOCKER_ARCH", "VOCAB_PG_HOST", "VOCAB_PG_DATABASE", "VOCAB_PG_SCHEMA",
+              "VOCAB_PG_USER", "VOCAB_PG_FILES_PATH"), build_vocab_load),
+    Fragment("phoebe-pg-load", "services",
+             ("DOCKER_ARCH", "PHOEBE_PG_HOST", "PHOEBE_PG_DATABASE", "PHOEBE_PG_SCHEMA",
+              "PHOEBE_PG_USER"), build_phoebe_load),
+    Fragment("broadsea-ares", "services", ("DOCKER_ARCH", *ROUTING_KEYS, "ARES_DATA_FOLDER"), build_ares),
+    Fragment("broadsea-openldap", "services", ("OPENLDAP_USERS",), build_openldap),
+    Fragment("broadsea-open-shiny-server", "services",
+             ("DOCKER_ARCH", *ROUTING_KEYS, "OPEN_SHINY_SERVER_APP_ROOT"), build_shiny),
+    Fragment("broadsea-posit-connect", "services",
+             ("DOCKER_ARCH", *ROUTING_KEYS, "POSIT_CONNECT_LICENSE_SERVER", "POSIT_CONNECT_LICENSE_FILE",
+              "POSIT_CONNECT_GCFG_FILE", "POSIT_CONNECT_R_VERSION"), build_posit),
+    Fragment("broadsea-perseus", "services",
+             (*ROUTING_KEYS, "PERSEUS_SMTP_SERVER", "PERSEUS_SMTP_PORT", "PERSEUS_TOKEN_SECRET_KEY",
+              "PERSEUS_EMAIL_SECRET_KEY", "PERSEUS_VOCAB_FILES_PATH"), build_perseus),
+    Fragment("broadsea-cdm-postprocessing", "services",
+             ("DOCKER_ARCH", "CDM_CONNECTIONDETAILS_DBMS", "CDM_CONNECTIONDETAILS_SERVER",
+              "CDM_CONNECTIONDETAILS_USER", "VOCAB_DATABASE_SCHEMA", "ACHILLES_CREATE_TABLE",
+              "ACHILLES_SMALL_CELL_COUNT", "DQD_NUM_THREADS", "DQD_WRITE_TO_TABLE",
+              "ARES_RUN_NETWORK", "ARES_DATA_FOLDER"), build_postprocessing),
+    Fragment("broadsea-pgadmin4", "services", (*ROUTING_KEYS, "PGADMIN_ADMIN_USER"), build_pgadmin),
+    Fragment("secrets", "secrets", SECRET_KEYS, build_secrets),
+    Fragment("volumes", "volumes", (), build_volumes),
+)
+
+def _indent(text: str) -> str:
+    return "".join(f"  {line}" if line.strip() else line for line in text.splitlines(keepends=True))
+
+class ComposeGenerator:
+    """Docker Compose renderer that rebuilds only the fragments whose inputs changed"""
+
+    def __init__(self, fragments: Sequence[Fragment] = FRAGMENTS,
+                 defaults: Optional[Mapping[str, str]] = None):
+        self.fragments = tuple(fragments)
+        if defaults is None:
+            registry = get_registry()
+            defaults = {key: registry.field(key).default_value for key in registry.keys()}
+        self.defaults = defaults
+        # Rendered text of each fragment and the input values it was built from
+        self._cache: Dict[str, Tuple[Tuple[str, ...], str]] = {}
+        # Fragments rebuilt by the last render
+        self.regenerated: List[str] = []
+        # State of the file last written, used to patch it
+        self._path: Optional[str] = None
+        self._chunks: List[str] = []
+        self._offsets: List[int] = []
+        self._disk_state: Optional[Tuple[int, int]] = None
+
+    def _inputs(self, fragment: Fragment, values: Mapping[str, str]) -> Dict[str, str]:
+        return {key: values.get(key, self.defaults.get(key, "")) for key in fragment.keys}
+
+    def fragment_text(self, fragment: Fragment, values: Mapping[str, str]) -> str:
+        inputs = self._inputs(fragment, values)
+        signature = tuple(inputs.values())
+        cached = self._cache.get(fragment.name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        yaml, dumper = yaml_dumper()
+        body = fragment.build(inputs)
+        if fragment.parent == "services":
+            body = {fragment.name: body}
+        text = _indent(yaml.dump(body, Dumper=dumper, default_flow_style=False, sort_keys=False))
+        self._cache[fragment.name] = (signature, text)
+        self.regenerated.append(fragment.name)
+        return text
+
+    def chunks(self, values: Mapping[str, str]) -> List[str]:
+        """The compose file as a list of text chunks, one per fragment plus headings"""
+        values, _ = resolve_values(values)
+        self.regenerated = []
+        chunks = [HEADER]
+        parent = None
+        for fragment in self.fragments:
+            if fragment.parent != parent:
+                parent = fragment.parent
+                chunks.append(f"{parent}:\n")
+            chunks.append(self.fragment_text(fragment, values))
+        return chunks
+
+    def render(self, values: Mapping[str, str]) -> str:
+        return "".join(self.chunks(values))
+
+    def write(self, values: Mapping[str, str], path: str) -> int:
+        """Write the compose file, patching only the chunks that changed
+
+        Returns the number of bytes written.
+        """
+        chunks = self.chunks(values)
+        try:
+            if self._can_patch(path, chunks):
+                written = self._patch(path, chunks)
+            else:
+                data = "".join(chunks).encode(ENCODING)
+                with open(path, 'wb') as f:
+                    written = f.write(data)
+            self._path = path
+            self._chunks = chunks
+            self._offsets = [0]
+            for chunk in chunks:
+                self._offsets.append(self._offsets[-1] + len(chunk.encode(ENCODING)))
+            stat = os.stat(path)
+            self._disk_state = (stat.st_size, stat.st_mtime_ns)
+        except Exception as e:
+            raise Exception(f"Failed to write Docker Compose file: {str(e)}")
+        return written
+
+    def _can_patch(self, path: str, chunks: List[str]) -> bool:
+        if path != self._path or len(chunks) != len(self._chunks):
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == self._disk_state
+
+    def _patch(self, path: str, chunks: List[str]) -> int:
+        # Unchanged fragments come from the cache, so an identity check is enough for most
+        changed = [
+            index for index, (old, new) in enumerate(zip(self._chunks, chunks))
+            if old is not new and old != new
+        ]
+        if not changed:
+            return 0
+        written = 0
+        with open(path, 'r+b') as f:
+            sizes = {index: len(chunks[index].encode(ENCODING)) for index in changed}
+            if all(sizes[index] == self._offsets[index + 1] - self._offsets[index] for index in changed):
+                for index in changed:
+                    f.seek(self._offsets[index])
+                    written += f.write(chunks[index].encode(ENCODING))
+            else:
+                start = changed[0]
+                f.seek(self._offsets[start])
+                written = f.write("".join(chunks[start:]).encode(ENCODING))
+                f.truncate()
+        return written
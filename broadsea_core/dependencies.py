@@ -0,0 +1,125 @@
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+from broadsea_core.predicates import Predicate, as_predicate
+from broadsea_core.schema import ConfigField, ConfigSection
+
+class DependencyGraph:
+    """Schema-wide graph of depends_on conditions between fields"""
+
+    # A field is active when every condition on it holds and every field it
+    # depends on is itself active. Nodes are kept in topological order so an
+    # edit only re-evaluates the fields downstream of the edited key.
+
+    def __init__(self, sections: Iterable[ConfigSection]):
+        self.fields: Dict[str, ConfigField] = {}
+        self.conditions: Dict[str, List[Tuple[str, Predicate]]] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        for section in sections:
+            for field in section.fields:
+                self.fields[field.name] = field
+                for dep_field, condition in (field.depends_on or {}).items():
+                    self.conditions.setdefault(field.name, []).append(
+                        (dep_field, as_predicate(condition))
+                    )
+                    self.dependents.setdefault(dep_field, []).append(field.name)
+        self.order = self._topological_order()
+        self.position = {name: index for index, name in enumerate(self.order)}
+        self._ancestors: Dict[str, List[str]] = {}
+
+    def _topological_order(self) -> List[str]:
+        # Keys named in depends_on but not defined by any section are roots
+        nodes = list(dict.fromkeys([*self.fields, *self.dependents]))
+
+        indegree = {name: len(self.conditions.get(name, [])) for name in nodes}
+        ready = deque(name for name in nodes if indegree[name] == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in self.dependents.get(name, []):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(nodes):
+            cycle = sorted(name for name in nodes if indegree[name] > 0)
+            raise ValueError(f"Circular depends_on between: {', '.join(cycle)}")
+        return order
+
+    def downstream(self, key: str) -> List[str]:
+        """Fields whose state may change when key changes, in topological order"""
+        seen: Set[str] = set()
+        stack = list(self.dependents.get(key, []))
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.add(name)
+                stack.extend(self.dependents.get(name, []))
+        return sorted(seen, key=self.position.__getitem__)
+
+    def ancestors(self, name: str) -> List[str]:
+        """Fields whose values decide whether name is active"""
+        if name in self._ancestors:
+            return self._ancestors[name]
+        seen: Set[str] = set()
+        stack = [dep_field for dep_field, _ in self.conditions.get(name, [])]
+        while stack:
+            dep_field = stack.pop()
+            if dep_field not in seen:
+                seen.add(dep_field)
+                stack.extend(other for other, _ in self.conditions.get(dep_field, []))
+        self._ancestors[name] = sorted(seen, key=self.position.__getitem__)
+        return self._ancestors[name]
+
+    def _holds(self, name: str, values: Mapping[str, str], active: Mapping[str, bool]) -> bool:
+        for dep_field, predicate in self.conditions.get(name, []):
+            if not active.get(dep_field, True) or not predicate(values.get(dep_field, "")):
+                return False
+        return True
+
+    def evaluate(self, values: Mapping[str, str]) -> Dict[str, bool]:
+        """Active state of every field"""
+        active: Dict[str, bool] = {}
+        for name in self.order:
+            active[name] = self._holds(name, values, active)
+        return active
+
+    def propagate(self, key: str, values: Mapping[str, str], active: Dict[str, bool]) -> List[str]:
+        """Re-evaluate only the fields below key, updating active in place
+
+        Returns the fields whose active state flipped.
+        """
+        changed = []
+        for name in self.downstream(key):
+            state = self._holds(name, values, active)
+            if active.get(name) != state:
+                active[name] = state
+                changed.append(name)
+        return changed
+
+    def is_active(self, name: str, values: Mapping[str, str]) -> bool:
+        """Active state of one field, evaluating only its ancestors"""
+        if name not in self.conditions:
+            return True
+        return all(
+            self.is_active(dep_field, values) and predicate(values.get(dep_field, ""))
+            for dep_field, predicate in self.conditions[name]
+        )
+
+    def is_required(self, name: str, active: Mapping[str, bool]) -> bool:
+        field = self.fields.get(name)
+        return field is not None and field.required and active.get(name, True)
+
+class DependencyState:
+    """Active state of every field kept current as values change"""
+
+    def __init__(self, graph: DependencyGraph, values: Mapping[str, str]):
+        self.graph = graph
+        self.active = graph.evaluate(values)
+
+    def is_active(self, name: str) -> bool:
+        return self.active.get(name, True)
+
+    def update(self, key: str, values: Mapping[str, str]) -> List[str]:
+        """Apply an edit of key and return the fields whose active state changed"""
+        return self.graph.propagate(key, values, self.active)
@@ -0,0 +1,137 @@
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from broadsea_core.envfile import ENCODING, ERRORS
+from broadsea_core.schema import get_registry
+
+Config = Mapping[str, Mapping[str, str]]
+
+MASK = "********"
+
+# Names of keys holding secrets themselves rather than a path to a secret file
+SECRET_NAME = re.compile(r"PASSWORD|SECRET|TOKEN|PRIVATE_KEY|API_KEY")
+
+def is_secret(key: str) -> bool:
+    field = get_registry().field(key)
+    if field is not None and field.field_type == "password":
+        return True
+    return not key.endswith("_FILE") and bool(SECRET_NAME.search(key))
+
+def _digest(*parts: bytes) -> bytes:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+class ConfigTree:
+    """Merkle tree over a configuration: key leaves, section nodes and a root
+
+    Digests ignore key and section order, so two trees with the same root
+    hold the same values and sections with the same digest can be skipped.
+    """
+
+    __slots__ = ("name", "values", "leaves", "sections", "root")
+
+    def __init__(self, config: Config, name: str = ""):
+        self.name = name
+        # Section of each key, and the key/value pairs of each section
+        self.values: Dict[str, Dict[str, str]] = {section: dict(values) for section, values in config.items()}
+        self.leaves: Dict[str, Dict[str, bytes]] = {
+            section: {key: _digest(key.encode(ENCODING, ERRORS), b"\0", value.encode(ENCODING, ERRORS)) for key, value in values.items()}
+            for section, values in self.values.items()
+        }
+        self.sections: Dict[str, bytes] = {
+            section: _digest(section.encode(ENCODING, ERRORS), b"\0", *(leaves[key] for key in sorted(leaves)))
+            for section, leaves in self.leaves.items()
+            if leaves
+        }
+        self.root = _digest(*(self.sections[section] for section in sorted(self.sections)))
+
+    @classmethod
+    def from_file(cls, path: str, name: Optional[str] = None) -> "ConfigTree":
+        from broadsea_core.envfile import load_config
+        return cls(load_config(path), path if name is None else name)
+
+    @property
+    def hexdigest(self) -> str:
+        return self.root.hex()
+
+@dataclass(frozen=True)
+class KeyChange:
+    key: str
+    # Section in the new config, or the old one for removed keys
+    section: str
+    # added, removed or changed
+    kind: str
+    old: str = ""
+    new: str = ""
+
+    def masked(self) -> "KeyChange":
+        if not is_secret(self.key):
+            return self
+        return KeyChange(self.key, self.section, self.kind,
+                         MASK if self.kind != "added" else "", MASK if self.kind != "removed" else "")
+
+def diff_trees(old: ConfigTree, new: ConfigTree, mask_secrets: bool = True) -> List[KeyChange]:
+    """Added, removed and changed keys between two trees
+
+    Only sections whose digests differ are compared key by key. A key that
+    moved to another section with the same value is not a change.
+    """
+    if old.root == new.root:
+        return []
+    removed: Dict[str, Tuple[str, str]] = {}
+    added: Dict[str, Tuple[str, str]] = {}
+    changes: List[KeyChange] = []
+    for section in dict.fromkeys([*new.values, *old.values]):
+        if old.sections.get(section) == new.sections.get(section):
+            continue
+        old_leaves = old.leaves.get(section, {})
+        new_leaves = new.leaves.get(section, {})
+        for key, leaf in new_leaves.items():
+            if key not in old_leaves:
+                added[key] = (section, new.values[section][key])
+            elif old_leaves[key] != leaf:
+                changes.append(KeyChange(key, section, "changed", old.values[section][key], new.values[section][key]))
+        for key in old_leaves:
+            if key not in new_leaves:
+                removed[key] = (section, old.values[section][key])
+
+    for key, (section, value) in added.items():
+        if key in removed:
+            old_value = removed.pop(key)[1]
+            if old_value != value:
+                changes.append(KeyChange(key, section, "changed", old_value, value))
+        else:
+            changes.append(KeyChange(key, section, "added", new=value))
+    changes += [KeyChange(key, section, "removed", old=value) for key, (section, value) in removed.items()]
+    if mask_secrets:
+        changes = [change.masked() for change in changes]
+    return changes
+
+def diff_configs(old: Config, new: Config, mask_secrets: bool = True) -> List[KeyChange]:
+    return diff_trees(ConfigTree(old), ConfigTree(new), mask_secrets)
+
+def compare_many(base: ConfigTree, others: Iterable[ConfigTree],
+                 mask_secrets: bool = True) -> Dict[str, List[KeyChange]]:
+    """Changes from base to each of others, keyed by tree name
+
+    Trees with the same root as base, or as an earlier tree, are not walked
+    again.
+    """
+    seen: Dict[bytes, List[KeyChange]] = {base.root: []}
+    results = {}
+    for tree in others:
+        if tree.root not in seen:
+            seen[tree.root] = diff_trees(base, tree, mask_secrets)
+        results[tree.name] = seen[tree.root]
+    return results
+
+def format_change(change: KeyChange) -> str:
+    if change.kind == "added":
+        return f"+ {change.key}={change.new}"
+    if change.kind == "removed":
+        return f"- {change.key}={change.old}"
+    return f"~ {change.key}: {change.old} -> {change.new}"
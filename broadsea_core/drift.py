@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from broadsea_core.compose import SECRET_KEYS
+from broadsea_core.diff import ConfigTree, KeyChange, diff_trees
+from broadsea_core.journal import write_atomic
+
+# Stat cache kept in the deployed tree; records what every file last hashed to
+CACHE_NAME = ".broadsea-drift.json"
+
+Config = Dict[str, Dict[str, str]]
+
+@dataclass(frozen=True)
+class SecretIssue:
+    key: str
+    path: str
+    # missing, empty, differs (from the desired file) or changed (since accepted)
+    problem: str
+
+@dataclass(frozen=True)
+class SiteDrift:
+    site: str
+    # clean, drifted, missing (not deployed) or unmanaged (no desired config)
+    status: str
+    changes: Tuple[KeyChange, ...] = ()
+    secrets: Tuple[SecretIssue, ...] = ()
+
+def find_sites(root: str) -> Dict[str, str]:
+    """Site name and .env path of every directory below root holding an .env
+
+    Site directories are not descended into, so data and secret folders
+    inside a deployment are never listed.
+    """
+    sites: Dict[str, str] = {}
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        env = next((entry for entry in entries if entry.name == ".env" and entry.is_file()), None)
+        if env is not None:
+            sites[os.path.relpath(directory, root).replace(os.sep, "/")] = env.path
+            continue
+        pending.extend(
+            entry.path for entry in entries
+            if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')
+        )
+    return sites
+
+class DriftScanner:
+    """Compares deployed Broadsea directories with desired ones, re-reading only files whose stat changed"""
+
+    def __init__(self, desired: str, deployed: str, cache_path: Optional[str] = None):
+        # Absolute, so cache keys only need normalizing
+        self.desired = os.path.abspath(desired)
+        self.deployed = os.path.abspath(deployed)
+        self.cache_path = cache_path or os.path.join(deployed, CACHE_NAME)
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cache = {}
+        # Per absolute path: stat signature, content digest and parsed config
+        self.files: Dict[str, dict] = cache.get("files", {})
+        # Digests of deployed secret files as last accepted
+        self.accepted: Dict[str, str] = cache.get("accepted", {})
+        self._changed = False
+        self._seen = set()
+        # Files read by the last scan, to show how much a rescan had to do
+        self.reads = 0
+
+    def _entry(self, path: str, parse: bool) -> Optional[dict]:
+        """Cached digest (and config) of path, refreshed if its stat changed"""
+        key = os.path.normpath(path)
+        self._seen.add(key)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if self.files.pop(key, None) is not None:
+                self._changed = True
+            return None
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        entry = self.files.get(key)
+        if entry is not None and entry["stat"] == signature and (not parse or "config" in entry):
+            return entry
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.reads += 1
+        entry = {"stat": signature, "sha256": hashlib.sha256(data).hexdigest()}
+        if parse:
+            from broadsea_core.envfile import ENCODING, ERRORS, EnvDocument
+            from broadsea_core.schema import get_registry
+            document = EnvDocument(data.decode(ENCODING, ERRORS))
+            entry["config"] = document.to_config(get_registry().section_of)
+        self.files[key] = entry
+        self._changed = True
+        return entry
+
+    def _secrets(self, site: str, config: Config, accept: bool) -> List[SecretIssue]:
+        values = {key: value for section in config.values() for key, value in section.items()}
+        issues = []
+        for key in SECRET_KEYS:
+            path = values.get(key, "")
+            if not path:
+                continue
+            deployed_path = os.path.join(self.deployed, site, path)
+            entry = self._entry(deployed_path, parse=False)
+            if entry is None:
+                issues.append(SecretIssue(key, path, "missing"))
+                continue
+            if entry["stat"][0] == 0:
+                issues.append(SecretIssue(key, path, "empty"))
+                continue
+            desired = self._entry(os.path.join(self.desired, site, path), parse=False)
+            if desired is not None:
+                if desired["sha256"] != entry["sha256"]:
+                    issues.append(SecretIssue(key, path, "differs"))
+                continue
+            accepted_key = os.path.normpath(deployed_path)
+            if accept or accepted_key not in self.accepted:
+                if self.accepted.get(accepted_key) != entry["sha256"]:
+                    self.accepted[accepted_key] = entry["sha256"]
+                    self._changed = True
+            elif self.accepted[accepted_key] != entry["sha256"]:
+                issues.append(SecretIssue(key, path, "changed"))
+        return issues
+
+    def scan(self, accept: bool = False) -> List[SiteDrift]:
+        """Drift of every desired and deployed site, in site order
+
+        Secret files without a desired copy are compared with their digest
+        when first seen, or when last scanned with accept=True.
+        """
+        self.reads = 0
+        self._seen = set()
+        desired_sites = find_sites(self.desired)
+        deployed_sites = find_sites(self.deployed)
+        results = []
+        try:
+            for site in sorted(set(desired_sites) | set(deployed_sites)):
+                if site not in deployed_sites:
+                    results.append(SiteDrift(site, "missing"))
+                    continue
+                deployed = self._entry(deployed_sites[site], parse=True)
+                if deployed is None:
+                    results.append(SiteDrift(site, "missing"))
+                    continue
+                if site not in desired_sites:
+                    results.append(SiteDrift(site, "unmanaged"))
+                    continue
+                desired = self._entry(desired_sites[site], parse=True)
+                if desired is None:
+                    results.append(SiteDrift(site, "unmanaged"))
+                    continue
+                changes: List[KeyChange] = []
+                if deployed["sha256"] != desired["sha256"]:
+                    changes = diff_trees(ConfigTree(desired["config"]), ConfigTree(deployed["config"]))
+                secrets = self._secrets(site, deployed["config"], accept)
+                status = "drifted" if changes or secrets else "clean"
+                results.append(SiteDrift(site, status, tuple(changes), tuple(secrets)))
+            # Forget files of sites that no longer exist
+            for key in [key for key in self.files if key not in self._seen]:
+                del self.files[key]
+                self._changed = True
+            self.save()
+        except Exception as e:
+            raise Exception(f"Failed to scan for drift: {str(e)}")
+        return results
+
+    def save(self):
+        if not self._changed:
+            return
+        data = json.dumps({"files": self.files, "accepted": self.accepted}).encode()
+        # Holds the parsed configs, which may include secret values
+        write_atomic(self.cache_path, data, mode=0o600)
+        self._changed = False
@@ -0,0 +1,291 @@
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from broadsea_core.schema import get_registry
+
+SECTION_RULE = "#" * 92
+
+# Section name for keys found before any '# Section:' header that the schema
+# does not know either
+UNSECTIONED = ""
+
+ENCODING = "utf-8"
+# Undecodable bytes survive a load/save round trip unchanged
+ERRORS = "surrogateescape"
+
+def format_env(config: Dict[str, Dict[str, str]]) -> str:
+    """Render a sectioned configuration as .env text"""
+    lines = []
+    for section_name, section_config in config.items():
+        lines.append(SECTION_RULE)
+        lines.append(f"# Section: {section_name}")
+        lines.append(SECTION_RULE)
+        lines.append("")
+        for key, value in section_config.items():
+            lines.append(f"{key}={value}")
+        lines.append("")
+    return "".join(f"{line}\n" for line in lines)
+
+def split_lines(text: str) -> List[str]:
+    """Split on newlines only, keeping each line's ending"""
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+def _encoded_length(line: str) -> int:
+    return len(line.encode(ENCODING, ERRORS))
+
+class EnvDocument:
+    """Lossless .env document that keeps every line and patches values in place"""
+
+    # Comments, blank lines, unknown keys and ordering are kept as they are.
+    # Setting a value rewrites only the value part of its line, and saving
+    # writes only the changed lines when their length is unchanged, or the
+    # file from the first changed line onwards otherwise.
+
+    def __init__(self, text: str = "", path: Optional[str] = None):
+        self.path = path
+        self._load(text)
+
+    @classmethod
+    def read(cls, filepath: str) -> "EnvDocument":
+        with open(filepath, 'rb') as f:
+            document = cls(f.read().decode(ENCODING, ERRORS), filepath)
+            document._disk_state = cls._stat(os.fstat(f.fileno()))
+        return document
+
+    def _load(self, text: str):
+        self.lines: List[str] = split_lines(text)
+        self._index()
+        # Byte offset of every line in the file as last read or written
+        self._offsets = [0]
+        for line in self.lines:
+            self._offsets.append(self._offsets[-1] + _encoded_length(line))
+        self._disk_state: Optional[Tuple[int, int]] = None
+        self._dirty = set()
+        self._first_insert: Optional[int] = None
+        self._edits: Dict[str, Tuple[str, str]] = {}
+
+    def _index(self):
+        self.entries: Dict[str, int] = {}
+        self.key_sections: Dict[str, Optional[str]] = {}
+        # Every section of keys set under more than one section, in file order
+        self.repeated: Dict[str, List[Optional[str]]] = {}
+        self.headers: Dict[str, int] = {}
+        current = None
+        for number, line in enumerate(self.lines):
+            stripped = line.strip()
+            if stripped.startswith('#'):
+                if 'Section' in stripped:
+                    current = stripped.split(':')[-1].strip()
+                    self.headers.setdefault(current, number)
+            elif '=' in stripped:
+                key = stripped.split('=', 1)[0].strip()
+                # A repeated key is read and patched at its last occurrence
+                if key in self.entries and self.key_sections[key] != current:
+                    self.repeated.setdefault(key, [self.key_sections[key]]).append(current)
+                self.entries[key] = number
+                self.key_sections[key] = current
+
+    @staticmethod
+    def _value_span(line: str) -> Tuple[int, int]:
+        start = line.index('=') + 1
+        end = len(line.rstrip())
+        while start < end and line[start] in " \t":
+            start += 1
+        return start, end
+
+    def get(self, key: str, default: str = "") -> str:
+        number = self.entries.get(key)
+        if number is None:
+            return default
+        line = self.lines[number]
+        start, end = self._value_span(line)
+        return line[start:end]
+
+    def to_config(self, section_of: Optional[Callable[[str], Optional[str]]] = None) -> Dict[str, Dict[str, str]]:
+        """Values grouped by section
+
+        Keys before the first header are placed in the section section_of
+        returns for them, or in UNSECTIONED.
+        """
+        config: Dict[str, Dict[str, str]] = {name: {} for name in self.headers}
+        for key, _ in sorted(self.entries.items(), key=lambda item: item[1]):
+            section = self.key_sections[key]
+            if section is None:
+                section = (section_of(key) if section_of else None) or UNSECTIONED
+            config.setdefault(section, {})[key] = self.get(key)
+        return config
+
+    def set(self, section: str, key: str, value: str) -> bool:
+        """Set a value, adding the key to its section if missing
+
+        Returns whether the document changed.
+        """
+        number = self.entries.get(key)
+        if number is None:
+            self._insert(section, key, value)
+        else:
+            line = self.lines[number]
+            start, end = self._value_span(line)
+            if line[start:end] == value:
+                return False
+            self.lines[number] = line[:start] + value + line[end:]
+            self._dirty.add(number)
+        self._edits[key] = (section, value)
+        return True
+
+    def update(self, config: Dict[str, Dict[str, str]]) -> List[str]:
+        """Apply a sectioned configuration and return the keys that changed"""
+        return [
+            key
+            for section, values in config.items()
+            for key, value in values.items()
+            if self.set(section, key, value)
+        ]
+
+    def _insert(self, section: str, key: str, value: str):
+        block = [number for name, number in self.entries.items()
+                 if self.key_sections[name] == (section or None)]
+        new_lines = [f"{key}={value}\n"]
+        if block:
+            position = max(block) + 1
+        elif section in self.headers:
+            # After the header's comment lines and the blank line below them
+            position = self.headers[section] + 1
+            while position < len(self.lines) and self.lines[position].strip().startswith('#'):
+                position += 1
+            if position < len(self.lines) and not self.lines[position].strip():
+                position += 1
+        else:
+            position = len(self.lines)
+            new_lines = [
+                f"{SECTION_RULE}\n", f"# Section: {section}\n", f"{SECTION_RULE}\n",
+                "\n", *new_lines, "\n",
+            ]
+            if self.lines and self.lines[-1].strip():
+                new_lines.insert(0, "\n")
+        if position == len(self.lines) and self.lines and not self.lines[-1].endswith("\n"):
+            self.lines[-1] += "\n"
+            self._dirty.add(position - 1)
+        self.lines[position:position] = new_lines
+        if self._first_insert is None or position < self._first_insert:
+            self._first_insert = position
+        self._index()
+
+    def render(self) -> str:
+        return "".join(self.lines)
+
+    def has_changes(self) -> bool:
+        return bool(self._dirty) or self._first_insert is not None
+
+    @staticmethod
+    def _stat(stat: os.stat_result) -> Tuple[int, int]:
+        return stat.st_size, stat.st_mtime_ns
+
+    def _on_disk(self, path: str) -> bool:
+        """Whether path still holds exactly what this document last read or wrote"""
+        try:
+            state = self._stat(os.stat(path))
+        except FileNotFoundError:
+            return False
+        return path == self.path and state == self._disk_state and state[0] == self._offsets[-1]
+
+    def save(self, path: Optional[str] = None) -> int:
+        """Write pending changes and return the number of bytes written"""
+        path = path or self.path
+        if path == self.path and self._disk_state is not None and not self._on_disk(path) \
+                and os.path.exists(path):
+            self._rebase()
+        if self._on_disk(path):
+            written = self._patch(path)
+        else:
+            data = self.render().encode(ENCODING, ERRORS)
+            with open(path, 'wb') as f:
+                f.write(data)
+            written = len(data)
+            self._offsets = [0]
+            for line in self.lines:
+                self._offsets.append(self._offsets[-1] + _encoded_length(line))
+        self.path = path
+        self._disk_state = self._stat(os.stat(path))
+        self._dirty.clear()
+        self._first_insert = None
+        self._edits.clear()
+        return written
+
+    def _rebase(self):
+        """Re-read a file changed by someone else and re-apply our edits to it"""
+        edits = self._edits
+        with open(self.path, 'rb') as f:
+            self._load(f.read().decode(ENCODING, ERRORS))
+            self._disk_state = self._stat(os.fstat(f.fileno()))
+        for key, (section, value) in edits.items():
+            self.set(section, key, value)
+
+    def _patch(self, path: str) -> int:
+        if not self.has_changes():
+            return 0
+        in_place = self._first_insert is None and all(
+            _encoded_length(self.lines[number]) == self._offsets[number + 1] - self._offsets[number]
+            for number in self._dirty
+        )
+        written = 0
+        with open(path, 'r+b') as f:
+            if in_place:
+                for number in sorted(self._dirty):
+                    data = self.lines[number].encode(ENCODING, ERRORS)
+                    f.seek(self._offsets[number])
+                    written += f.write(data)
+            else:
+                changed = set(self._dirty)
+                if self._first_insert is not None:
+                    changed.add(self._first_insert)
+                start = min(changed)
+                data = "".join(self.lines[start:]).encode(ENCODING, ERRORS)
+                f.seek(self._offsets[start])
+                written = f.write(data)
+                f.truncate()
+                del self._offsets[start + 1:]
+                for line in self.lines[start:]:
+                    self._offsets.append(self._offsets[-1] + _encoded_length(line))
+        return written
+
+def read_document(filepath: str) -> EnvDocument:
+    """Read an .env file for lossless editing"""
+    try:
+        return EnvDocument.read(filepath)
+    except Exception as e:
+        raise Exception(f"Failed to load configuration: {str(e)}")
+
+def write_env(config: Dict[str, Dict[str, str]], filepath: str,
+              document: Optional[EnvDocument] = None) -> EnvDocument:
+    """Write a sectioned configuration to an .env file
+
+    An existing file keeps its comments, unknown keys and ordering and only
+    the changed values are rewritten. Pass the document returned by an
+    earlier read or write to avoid re-reading the file.
+    """
+    try:
+        if document is None or document.path != filepath:
+            if os.path.exists(filepath):
+                document = EnvDocument.read(filepath)
+            else:
+                document = EnvDocument(format_env(config))
+        document.update(config)
+        document.save(filepath)
+        return document
+    except Exception as e:
+        raise Exception(f"Failed to save configuration: {str(e)}")
+
+def parse_env(lines) -> Dict[str, Dict[str, str]]:
+    """Parse .env lines written with '# Section:' headers into a sectioned configuration"""
+    return EnvDocument("".join(lines)).to_config(get_registry().section_of)
+
+def load_config(filepath: str) -> Dict[str, Dict[str, str]]:
+    """Load a sectioned configuration from an .env file"""
+    return read_document(filepath).to_config(get_registry().section_of)
+
+save_config = write_env
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from broadsea_core.compose import ComposeGenerator, yaml_dumper
+from broadsea_core.envfile import ENCODING, ERRORS, EnvDocument, format_env
+from broadsea_core.journal import write_atomic
+
+Config = Dict[str, Dict[str, str]]
+
+# Records the hash of every file written so unchanged exports can be skipped
+MANIFEST_NAME = ".broadsea-export.json"
+
+def render_env(config: Config, path: str) -> bytes:
+    # An existing .env keeps its comments and unknown keys
+    if os.path.exists(path):
+        document = EnvDocument.read(path)
+        document.update(config)
+        return document.render().encode(ENCODING, ERRORS)
+    return format_env(config).encode(ENCODING)
+
+def render_json(config: Config, path: str) -> bytes:
+    return (json.dumps(config, indent=2) + "\n").encode()
+
+def render_yaml(config: Config, path: str) -> bytes:
+    yaml, dumper = yaml_dumper()
+    return yaml.dump(config, Dumper=dumper, default_flow_style=False).encode()
+
+def render_compose(config: Config, path: str) -> bytes:
+    values = {key: value for section in config.values() for key, value in section.items()}
+    return ComposeGenerator().render(values).encode()
+
+@dataclass(frozen=True)
+class ExportTarget:
+    name: str
+    title: str
+    filename: str
+    render: Callable[[Config, str], bytes]
+
+TARGETS: Dict[str, ExportTarget] = {
+    target.name: target for target in (
+        ExportTarget("env", ".env", ".env", render_env),
+        ExportTarget("json", "JSON", "broadsea-config.json", render_json),
+        ExportTarget("yaml", "YAML", "broadsea-config.yaml", render_yaml),
+        ExportTarget("compose", "Docker Compose", "docker-compose.yml", render_compose),
+    )
+}
+
+@dataclass(frozen=True)
+class ExportResult:
+    target: str
+    path: str
+    digest: str
+    written: bool
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(directory: str) -> Dict[str, dict]:
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r') as f:
+            return json.load(f).get("files", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _unchanged(path: str, digest: str, size: int, entry: Optional[dict]) -> bool:
+    """Whether path already holds content with the given digest"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return False
+    if entry and entry.get("sha256") == digest and \
+            entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    # Not written by us or touched since; compare with what is on disk
+    return stat.st_size == size and file_digest(path) == digest
+
+def export(config: Config, directory: str, targets: Optional[Iterable[str]] = None) -> List[ExportResult]:
+    """Render one configuration to every target in directory
+
+    Files whose content would not change are left untouched.
+    """
+    names = list(targets) if targets is not None else list(TARGETS)
+    unknown = [name for name in names if name not in TARGETS]
+    if unknown:
+        raise Exception(f"Unknown export target: {', '.join(unknown)}")
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        manifest = load_manifest(directory)
+        manifest_changed = False
+        results = []
+        for name in names:
+            target = TARGETS[name]
+            path = os.path.join(directory, target.filename)
+            data = target.render(config, path)
+            digest = hashlib.sha256(data).hexdigest()
+            written = not _unchanged(path, digest, len(data), manifest.get(target.filename))
+            if written:
+                write_atomic(path, data)
+            stat = os.stat(path)
+            entry = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            if manifest.get(target.filename) != entry:
+                manifest[target.filename] = entry
+                manifest_changed = True
+            results.append(ExportResult(name, path, digest, written))
+        if manifest_changed:
+            write_atomic(
+                os.path.join(directory, MANIFEST_NAME),
+                json.dumps({"files": manifest}, indent=2).encode()
+            )
+        return results
+    except Exception as e:
+        raise Exception(f"Failed to export configuration: {str(e)}")
@@ -0,0 +1,204 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from broadsea_core.generate import flatten_answers
+from broadsea_core.layers import Layer, OverlayResolver, defaults_layer
+
+# Inventory column naming each site; also the directory its files are written to
+SITE_COLUMN = "site"
+# Optional inventory column naming the site's environment overlay file
+ENVIRONMENT_COLUMN = "environment"
+
+Inventory = List[Tuple[str, Dict[str, str]]]
+
+@dataclass(frozen=True)
+class SiteResult:
+    site: str
+    # ok, invalid or failed
+    status: str
+    path: str = ""
+    issues: Tuple[str, ...] = ()
+    seconds: float = 0.0
+
+def check_site_name(site: str):
+    if not site or site in (".", "..") or "/" in site or "\\" in site:
+        raise Exception(f"Invalid site name '{site}'")
+
+def load_inventory(filepath: str) -> Inventory:
+    """Per-site overrides from a CSV or JSON inventory
+
+    CSV files have a site column and one column per key; empty cells keep the
+    base value. JSON files hold either a list of objects with a site key or an
+    object mapping site names to (flat or sectioned) overrides. An environment
+    column or key names an overlay file, relative to the inventory, applied
+    between the base and the site's overrides.
+    """
+    try:
+        if filepath.endswith(".csv"):
+            with open(filepath, 'r', newline='') as f:
+                reader = csv.DictReader(f)
+                if SITE_COLUMN not in (reader.fieldnames or []):
+                    raise Exception(f"missing '{SITE_COLUMN}' column")
+                rows = [
+                    (row[SITE_COLUMN].strip(), {
+                        key.strip(): value for key, value in row.items()
+                        if key and key != SITE_COLUMN and value not in (None, "")
+                    })
+                    for row in reader
+                ]
+        else:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                items = list(data.items())
+            elif isinstance(data, list):
+                items = [(str(entry.get(SITE_COLUMN, "")), {k: v for k, v in entry.items() if k != SITE_COLUMN})
+                         for entry in data]
+            else:
+                raise Exception("expected a list or an object")
+            rows = [(site, flatten_answers(overrides)) for site, overrides in items]
+    except Exception as e:
+        raise Exception(f"Failed to load inventory: {str(e)}")
+
+    seen = set()
+    for site, overrides in rows:
+        check_site_name(site)
+        if site in seen:
+            raise Exception(f"Failed to load inventory: site '{site}' is listed twice")
+        seen.add(site)
+        if overrides.get(ENVIRONMENT_COLUMN):
+            overrides[ENVIRONMENT_COLUMN] = os.path.join(os.path.dirname(filepath), overrides[ENVIRONMENT_COLUMN])
+    return rows
+
+def resolve_sites(base: Sequence[Layer], inventory: Inventory,
+                  resolver: Optional[OverlayResolver] = None) -> List[Tuple[str, Dict[str, str], Tuple[str, ...]]]:
+    """Values of every site merged from defaults, base, environment and site layers
+
+    One resolver serves every site, so the defaults and base layers are
+    merged once and each environment once per distinct stack; a site only
+    costs the merge of its own overrides. Returns each site's values and
+    the keys of its overrides that no section defines.
+    """
+    from broadsea_core.generate import unknown_keys
+    from broadsea_core.schema import create_sections
+
+    sections = create_sections()
+    resolver = resolver or OverlayResolver()
+    stack = [defaults_layer(), *base]
+    environments: Dict[str, Layer] = {}
+    sites = []
+    for site, overrides in inventory:
+        overrides = dict(overrides)
+        layers = list(stack)
+        environment = overrides.pop(ENVIRONMENT_COLUMN, "")
+        if environment:
+            if environment not in environments:
+                try:
+                    environments[environment] = Layer.from_file(environment)
+                except Exception as e:
+                    raise Exception(f"Failed to load environment of site '{site}': {str(e)}")
+            layers.append(environments[environment])
+        layers.append(Layer(f"site {site}", overrides))
+        unknown = tuple(unknown_keys(sections, overrides))
+        sites.append((site, dict(resolver.resolve(layers).values), unknown))
+    return sites
+
+# Per-process state so every worker builds the schema, its compiled rules
+# and the compose fragment cache once
+_state = None
+
+def _worker_state():
+    global _state
+    if _state is None:
+        from broadsea_core.compose import ComposeGenerator
+        from broadsea_core.schema import create_sections
+        from broadsea_core.validation import compile_sections
+        sections = create_sections()
+        _state = (sections, compile_sections(sections), ComposeGenerator())
+    return _state
+
+def render_site(site: str, values: Mapping[str, str], directory: str, compose: bool = False,
+                skip_validation: bool = False, unknown: Sequence[str] = ()) -> SiteResult:
+    """Validate and write one site's files from its resolved values; never raises"""
+    from broadsea_core.envfile import write_env
+    from broadsea_core.generate import build_config, collect_values
+    from broadsea_core.validation import validate_config
+
+    started = time.perf_counter()
+    site_dir = os.path.join(directory, site)
+    try:
+        sections, compiled, generator = _worker_state()
+        issues = [f"unknown key {key}" for key in unknown]
+        # Normalizes values the way the wizard stores them
+        values = collect_values(sections, values)
+        problems = validate_config(sections, values, compiled)
+        issues += problems
+        if problems and not skip_validation:
+            return SiteResult(site, "invalid", "", tuple(issues), time.perf_counter() - started)
+        os.makedirs(site_dir, exist_ok=True)
+        path = os.path.join(site_dir, ".env")
+        config = build_config(sections, values)
+        write_env(config, path)
+        if compose:
+            values = {key: value for section in config.values() for key, value in section.items()}
+            generator.write(values, os.path.join(site_dir, "docker-compose.yml"))
+    except Exception as e:
+        return SiteResult(site, "failed", "", (str(e),), time.perf_counter() - started)
+    return SiteResult(site, "ok", path, tuple(issues), time.perf_counter() - started)
+
+def render_fleet(base: Sequence[Layer], inventory: Inventory, directory: str,
+                 workers: Optional[int] = None, compose: bool = False, skip_validation: bool = False,
+                 progress: Optional[Callable[[int, int, SiteResult], None]] = None,
+                 resolver: Optional[OverlayResolver] = None) -> List[SiteResult]:
+    """Render every site of inventory below directory in a process pool
+
+    Layers are resolved in the parent (see resolve_sites); the workers
+    validate and write. A site that fails validation or raises is reported
+    and the others still render. progress is called in the parent as each
+    site completes. Results are returned in inventory order.
+    """
+    workers = workers or os.cpu_count() or 1
+    sites = resolve_sites(base, inventory, resolver)
+    results: Dict[str, SiteResult] = {}
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except Exception as e:
+        raise Exception(f"Failed to create {directory}: {str(e)}")
+
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(inventory), 1))) as pool:
+        futures = {
+            pool.submit(render_site, site, values, directory, compose, skip_validation, unknown): site
+            for site, values, unknown in sites
+        }
+        for future in as_completed(futures):
+            site = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = SiteResult(site, "failed", "", (str(e),))
+            results[site] = result
+            if progress:
+                progress(len(results), len(inventory), result)
+    return [results[site] for site, _ in inventory]
+
+def write_report(results: List[SiteResult], path: str):
+    """JSON report with a summary and the issues of every site that did not render cleanly"""
+    summary: Dict[str, int] = {"ok": 0, "invalid": 0, "failed": 0}
+    for result in results:
+        summary[result.status] += 1
+    report = {
+        "summary": {"sites": len(results), **summary},
+        "sites": [asdict(result) for result in results if result.status != "ok" or result.issues],
+    }
+    try:
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    except Exception as e:
+        raise Exception(f"Failed to write report: {str(e)}")
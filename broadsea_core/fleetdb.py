@@ -0,0 +1,254 @@
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from broadsea_core.envfile import ENCODING, ERRORS, EnvDocument, write_env
+from broadsea_core.schema import get_registry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS site (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    path TEXT,
+    digest TEXT,
+    imported_at REAL
+);
+CREATE TABLE IF NOT EXISTS section (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS entry (
+    site_id INTEGER NOT NULL REFERENCES site(id) ON DELETE CASCADE,
+    section_id INTEGER NOT NULL REFERENCES section(id),
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    -- Order of the key in its file, so exports keep the layout
+    position INTEGER NOT NULL,
+    PRIMARY KEY (site_id, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entry_key_value ON entry(key, value);
+CREATE INDEX IF NOT EXISTS entry_value ON entry(value);
+CREATE INDEX IF NOT EXISTS entry_section ON entry(section_id, key);
+"""
+
+def is_env_file(filename: str) -> bool:
+    return filename == ".env" or filename.endswith(".env")
+
+def site_name(relpath: str) -> str:
+    """Site name for an .env path relative to the imported directory
+
+    site-a/.env and site-a.env both become site-a.
+    """
+    relpath = relpath.replace(os.sep, "/")
+    if relpath.endswith("/.env"):
+        return relpath[:-len("/.env")]
+    if relpath.endswith(".env") and relpath != ".env":
+        return relpath[:-len(".env")]
+    return relpath
+
+def site_of(filepath: str, directory: Optional[str] = None) -> str:
+    """Site name of an .env file, relative to the directory it was imported from
+
+    Without a directory, the file's own site directory or name is used, so
+    sites/site-a/.env and sites/site-a.env are site-a however they are imported.
+    """
+    path = os.path.abspath(filepath)
+    if directory is None:
+        parent = os.path.dirname(path)
+        directory = os.path.dirname(parent) if os.path.basename(path) == ".env" else parent
+    return site_name(os.path.relpath(path, os.path.abspath(directory)))
+
+def walk_env_files(directory: str) -> Iterator[str]:
+    """Every .env file below directory"""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for filename in sorted(files):
+            if is_env_file(filename):
+                yield os.path.join(root, filename)
+
+class FleetStore:
+    """SQLite store of many sites' configurations with indexed key/value lookups"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self._section_ids: Dict[str, int] = {
+            name: section_id for section_id, name in self.conn.execute("SELECT id, name FROM section")
+        }
+
+    def __enter__(self) -> "FleetStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _section_id(self, name: str) -> int:
+        if name not in self._section_ids:
+            self.conn.execute("INSERT OR IGNORE INTO section(name) VALUES (?)", (name,))
+            row = self.conn.execute("SELECT id FROM section WHERE name = ?", (name,)).fetchone()
+            self._section_ids[name] = row[0]
+        return self._section_ids[name]
+
+    def _put(self, site: str, config: Dict[str, Dict[str, str]],
+             path: Optional[str], digest: Optional[str]):
+        self.conn.execute(
+            "INSERT INTO site(name, path, digest, imported_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET path = excluded.path, digest = excluded.digest, "
+            "imported_at = excluded.imported_at",
+            (site, path, digest, time.time())
+        )
+        site_id = self.conn.execute("SELECT id FROM site WHERE name = ?", (site,)).fetchone()[0]
+        self.conn.execute("DELETE FROM entry WHERE site_id = ?", (site_id,))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entry(site_id, section_id, key, value, position) VALUES (?, ?, ?, ?, ?)",
+            [
+                (site_id, self._section_id(section), key, value, position)
+                for position, (section, key, value) in enumerate(
+                    (section, key, value)
+                    for section, values in config.items()
+                    for key, value in values.items()
+                )
+            ]
+        )
+
+    def import_config(self, site: str, config: Dict[str, Dict[str, str]], path: Optional[str] = None):
+        """Replace one site's configuration"""
+        with self.conn:
+            self._put(site, config, path, None)
+
+    def import_file(self, filepath: str, site: Optional[str] = None) -> str:
+        """Import one .env file and return its site name"""
+        if site is None:
+            site = site_of(filepath)
+        try:
+            document = EnvDocument.read(filepath)
+        except Exception as e:
+            raise Exception(f"Failed to import {filepath}: {str(e)}")
+        with self.conn:
+            self._put(site, document.to_config(get_registry().section_of), filepath, None)
+        return site
+
+    def import_directory(self, directory: str) -> Tuple[int, int, int]:
+        """Import every .env below directory in one transaction
+
+        Files whose content digest matches the last import are skipped, and
+        sites imported from a directory before whose file is gone are
+        removed; sites added with import_file or import_config are kept.
+        Returns the number of imported, skipped and removed sites.
+        """
+        section_of = get_registry().section_of
+        known = dict(self.conn.execute("SELECT name, digest FROM site"))
+        imported = skipped = 0
+        seen = set()
+        try:
+            with self.conn:
+                for filepath in walk_env_files(directory):
+                    relpath = os.path.relpath(filepath, directory)
+                    site = site_of(filepath, directory)
+                    seen.add(site)
+                    with open(filepath, 'rb') as f:
+                        data = f.read()
+                    digest = hashlib.sha256(data).hexdigest()
+                    if known.get(site) == digest:
+                        skipped += 1
+                        continue
+                    document = EnvDocument(data.decode(ENCODING, ERRORS))
+                    self._put(site, document.to_config(section_of), relpath, digest)
+                    imported += 1
+                # Only directory imports record a digest
+                removed = [(site,) for site, digest in known.items() if digest is not None and site not in seen]
+                self.conn.executemany("DELETE FROM site WHERE name = ?", removed)
+        except Exception as e:
+            raise Exception(f"Failed to import {directory}: {str(e)}")
+        return imported, skipped, len(removed)
+
+    def export_directory(self, directory: str) -> int:
+        """Write every site back as an .env below directory, keeping existing files' layout"""
+        count = 0
+        try:
+            for site, path in self.conn.execute("SELECT name, path FROM site ORDER BY name").fetchall():
+                relpath = path if path and not os.path.isabs(path) else os.path.join(site, ".env")
+                target = os.path.join(directory, relpath)
+                os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+                write_env(self.config(site), target)
+                count += 1
+        except Exception as e:
+            raise Exception(f"Failed to export {directory}: {str(e)}")
+        return count
+
+    def remove(self, site: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM site WHERE name = ?", (site,))
+
+    def sites(self) -> List[str]:
+        return [name for (name,) in self.conn.execute("SELECT name FROM site ORDER BY name")]
+
+    def config(self, site: str) -> Dict[str, Dict[str, str]]:
+        """One site's configuration grouped by section"""
+        config: Dict[str, Dict[str, str]] = {}
+        rows = self.conn.execute(
+            "SELECT section.name, entry.key, entry.value FROM entry "
+            "JOIN site ON site.id = entry.site_id "
+            "JOIN section ON section.id = entry.section_id "
+            "WHERE site.name = ? ORDER BY entry.position",
+            (site,)
+        )
+        for section, key, value in rows:
+            config.setdefault(section, {})[key] = value
+        return config
+
+    def find(self, key: str, equals: Optional[str] = None, prefix: Optional[str] = None,
+             contains: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(site, value) pairs for key, optionally filtered by its value
+
+        equals and prefix use the (key, value) index; contains scans only the
+        rows of key.
+        """
+        query = (
+            "SELECT site.name, entry.value FROM entry "
+            "JOIN site ON site.id = entry.site_id WHERE entry.key = ?"
+        )
+        params: List[str] = [key]
+        if equals is not None:
+            query += " AND entry.value = ?"
+            params.append(equals)
+        if prefix is not None:
+            # Range scan instead of LIKE so the index is used and case is kept
+            query += " AND entry.value >= ? AND entry.value < ?"
+            params += [prefix, prefix + "\U0010ffff"]
+        if contains is not None:
+            query += " AND instr(entry.value, ?) > 0"
+            params.append(contains)
+        return list(self.conn.execute(query + " ORDER BY site.name", params))
+
+    def sites_with_value(self, value: str) -> List[Tuple[str, str]]:
+        """(site, key) pairs of every key set to value"""
+        return list(self.conn.execute(
+            "SELECT site.name, entry.key FROM entry JOIN site ON site.id = entry.site_id "
+            "WHERE entry.value = ? ORDER BY site.name, entry.key",
+            (value,)
+        ))
+
+    def distribution(self, key: str) -> List[Tuple[str, int]]:
+        """Distinct values of key and the number of sites using each"""
+        return list(self.conn.execute(
+            "SELECT value, COUNT(*) FROM entry WHERE key = ? GROUP BY value ORDER BY COUNT(*) DESC, value",
+            (key,)
+        ))
+
+    def section_keys(self, section: str) -> List[Tuple[str, int]]:
+        """Keys stored under a section and the number of sites setting each"""
+        return list(self.conn.execute(
+            "SELECT entry.key, COUNT(*) FROM entry JOIN section ON section.id = entry.section_id "
+            "WHERE section.name = ? GROUP BY entry.key ORDER BY entry.key",
+            (section,)
+        ))
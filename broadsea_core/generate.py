@@ -0,0 +1,96 @@
+import json
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from broadsea_core.schema import ConfigField, ConfigSection
+from broadsea_core.dependencies import DependencyGraph
+from broadsea_core.interpolate import resolve_values
+from broadsea_core.validation import validate_config
+
+def load_answers(filepath: str) -> Dict[str, str]:
+    """Load a JSON or YAML answers file as a flat key/value mapping"""
+    try:
+        with open(filepath, 'r') as f:
+            if filepath.endswith(('.yaml', '.yml')):
+                import yaml
+                data = yaml.safe_load(f) or {}
+            else:
+                data = json.load(f)
+    except ImportError:
+        raise Exception("PyYAML is required for YAML answers files")
+    except Exception as e:
+        raise Exception(f"Failed to load answers: {str(e)}")
+
+    if not isinstance(data, dict):
+        raise Exception("Answers file must contain a mapping")
+    return flatten_answers(data)
+
+def flatten_answers(data: Mapping[str, object]) -> Dict[str, str]:
+    """Accept both flat {"KEY": value} and sectioned {"Section": {"KEY": value}} answers"""
+    answers = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                answers[sub_key] = _to_str(sub_value)
+        else:
+            answers[key] = _to_str(value)
+    return answers
+
+def _to_str(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+def normalize_value(field: ConfigField, value: str) -> str:
+    """Normalize a raw value the way the wizard widget would store it"""
+    if field.field_type == "checkbox":
+        return str(value.lower() == "true").lower()
+    return value
+
+def collect_values(sections: List[ConfigSection],
+                   answers: Optional[Mapping[str, str]] = None,
+                   environ: Optional[Mapping[str, str]] = None,
+                   env_prefix: str = "",
+                   overrides: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+    """Merge schema defaults, answers, environment variables and overrides (in that order)"""
+    values = {}
+    for section in sections:
+        for field in section.fields:
+            value = field.default_value
+            if answers and field.name in answers:
+                value = answers[field.name]
+            if environ is not None and env_prefix + field.name in environ:
+                value = environ[env_prefix + field.name]
+            if overrides and field.name in overrides:
+                value = overrides[field.name]
+            values[field.name] = normalize_value(field, value)
+    return values
+
+def build_config(sections: List[ConfigSection], values: Mapping[str, str]) -> Dict[str, Dict[str, str]]:
+    """Build the sectioned configuration written to .env from flat values"""
+    # Templates are written as entered, but whether a field applies depends on the literals
+    active = DependencyGraph(sections).evaluate(resolve_values(values)[0])
+    config = {}
+    for section in sections:
+        section_config = {}
+        for field in section.fields:
+            value = values.get(field.name, "") if active.get(field.name, True) else ""
+            if value or field.required:
+                section_config[field.name] = value
+        config[section.name] = section_config
+    return config
+
+def generate(sections: List[ConfigSection],
+             answers: Optional[Mapping[str, str]] = None,
+             environ: Optional[Mapping[str, str]] = None,
+             env_prefix: str = "",
+             overrides: Optional[Mapping[str, str]] = None) -> Tuple[Dict[str, Dict[str, str]], List[str]]:
+    """Resolve values for every section and return the config with its validation issues"""
+    values = collect_values(sections, answers, environ, env_prefix, overrides)
+    return build_config(sections, values), validate_config(sections, values)
+
+def unknown_keys(sections: List[ConfigSection], answers: Mapping[str, str]) -> List[str]:
+    """Return answer keys that no section defines"""
+    known = {field.name for section in sections for field in section.fields}
+    return sorted(key for key in answers if key not in known)
@@ -0,0 +1,141 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from broadsea_core.compose import SECRET_KEYS, secret_name
+from broadsea_core.envfile import ENCODING, ERRORS
+from broadsea_core.schema import ConfigSection, create_sections
+
+# Section holding imported keys the schema does not know
+EXTRA_SECTION = "Extra"
+
+def yaml_loader():
+    """The libyaml-backed loader when PyYAML was built with it"""
+    try:
+        import yaml
+    except ImportError:
+        raise Exception("PyYAML is required to import compose files")
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def parse_env_line(line: str) -> Optional[Tuple[str, str]]:
+    """Key and value of a KEY=value line as Docker Compose reads it, or None"""
+    stripped = line.strip()
+    if not stripped or stripped.startswith('#') or '=' not in stripped:
+        return None
+    key, value = stripped.split('=', 1)
+    key = key.strip()
+    if key.startswith("export "):
+        key = key[len("export "):].strip()
+    value = value.strip()
+    if value[:1] in ("'", '"') and value.find(value[0], 1) > 0:
+        # Quoted values end at the closing quote, ignoring any comment after it
+        value = value[1:value.find(value[0], 1)]
+    elif " #" in value:
+        # Unquoted values end at an inline comment
+        value = value.split(" #", 1)[0].rstrip()
+    return key, value
+
+@dataclass
+class ImportResult:
+    # Imported values grouped by schema section, in schema order
+    config: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    # Keys no section owns, with their values
+    extras: Dict[str, str] = field(default_factory=dict)
+    # File each value was taken from
+    sources: Dict[str, str] = field(default_factory=dict)
+
+    def to_config(self) -> Dict[str, Dict[str, str]]:
+        """Sectioned configuration with extras in their own section, ready for write_env"""
+        config = {section: dict(values) for section, values in self.config.items() if values}
+        if self.extras:
+            config[EXTRA_SECTION] = dict(self.extras)
+        return config
+
+class Importer:
+    """Maps keys from upstream Broadsea .env and compose files to the sections that own them
+
+    The key to section index is built once from the schema, so every key
+    costs one dict lookup however the source file is laid out; section
+    comments in the source are ignored.
+    """
+
+    def __init__(self, sections: Optional[List[ConfigSection]] = None):
+        self.sections = sections if sections is not None else create_sections()
+        self.index: Dict[str, str] = {
+            field.name: section.name for section in self.sections for field in section.fields
+        }
+        self.order: Dict[str, int] = {key: number for number, key in enumerate(self.index)}
+
+    def _add(self, result: ImportResult, values: Iterable[Tuple[str, str]], source: str, override: bool):
+        for key, value in values:
+            if not override and key in result.sources:
+                continue
+            section = self.index.get(key)
+            if section is None:
+                result.extras[key] = value
+            else:
+                result.config[section][key] = value
+            result.sources[key] = source
+
+    def env_values(self, path: str) -> List[Tuple[str, str]]:
+        try:
+            with open(path, 'r', encoding=ENCODING, errors=ERRORS) as f:
+                return [pair for pair in map(parse_env_line, f) if pair is not None]
+        except Exception as e:
+            raise Exception(f"Failed to import {path}: {str(e)}")
+
+    def compose_values(self, path: str) -> List[Tuple[str, str]]:
+        """Schema keys set literally in a compose file
+
+        Service environment entries named like a schema key are taken unless
+        they only reference the .env (${KEY}), and file-based secrets give
+        the matching *_FILE key.
+        """
+        yaml, loader = yaml_loader()
+        try:
+            with open(path, 'r', encoding=ENCODING, errors=ERRORS) as f:
+                data = yaml.load(f, Loader=loader) or {}
+        except Exception as e:
+            raise Exception(f"Failed to import {path}: {str(e)}")
+        if not isinstance(data, dict):
+            raise Exception(f"Failed to import {path}: not a compose file")
+
+        values: List[Tuple[str, str]] = []
+        for service in (data.get("services") or {}).values():
+            environment = (service or {}).get("environment") or {}
+            if isinstance(environment, list):
+                environment = dict(
+                    entry.split('=', 1) if '=' in entry else (entry, None) for entry in map(str, environment)
+                )
+            for key, value in environment.items():
+                if key in self.index and value is not None and "${" not in str(value):
+                    values.append((key, _to_str(value)))
+        secrets = data.get("secrets") or {}
+        for key in SECRET_KEYS:
+            secret = secrets.get(secret_name(key))
+            if isinstance(secret, dict) and secret.get("file") and "${" not in str(secret["file"]):
+                values.append((key, str(secret["file"])))
+        return values
+
+    def load(self, env_paths: Iterable[str] = (), compose_paths: Iterable[str] = (),
+             defaults: bool = False) -> ImportResult:
+        """Import .env files, later ones overriding earlier ones, then fill gaps from compose files"""
+        result = ImportResult({section.name: {} for section in self.sections})
+        for path in env_paths:
+            self._add(result, self.env_values(path), path, override=True)
+        for path in compose_paths:
+            self._add(result, self.compose_values(path), path, override=False)
+        if defaults:
+            self._add(result, ((field.name, field.default_value) for section in self.sections
+                               for field in section.fields), "", override=False)
+        for section, values in result.config.items():
+            result.config[section] = dict(sorted(values.items(), key=lambda item: self.order[item[0]]))
+        return result
+
+def _to_str(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+def import_files(env_paths: Iterable[str] = (), compose_paths: Iterable[str] = (),
+                 defaults: bool = False) -> ImportResult:
+    return Importer().load(env_paths, compose_paths, defaults)
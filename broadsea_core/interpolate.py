@@ -0,0 +1,168 @@
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# ${KEY}, ${KEY:-default} (unset or empty), ${KEY-default} (unset) and $$ for
+# a literal $, as Docker Compose reads them from an .env file
+REFERENCE = re.compile(r"\$(?:\$|\{([A-Za-z_][A-Za-z0-9_]*)(?:(:?-)([^}]*))?\})")
+
+def references(template: str) -> Tuple[str, ...]:
+    """Keys referenced by a value, in order of first use"""
+    if "$" not in template:
+        return ()
+    return tuple(dict.fromkeys(match.group(1) for match in REFERENCE.finditer(template) if match.group(1)))
+
+class Interpolator:
+    """Resolves ${KEY} references between values, caching literals until a dependency changes
+
+    Templates are kept as entered so they can be saved unchanged. A key in
+    a reference cycle, or referencing an unknown key without a default,
+    is listed in errors; a cycle leaves its keys' templates unresolved.
+    """
+
+    def __init__(self, templates: Optional[Mapping[str, str]] = None):
+        self.templates: Dict[str, str] = {}
+        self._refs: Dict[str, Tuple[str, ...]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._cache: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        if templates:
+            self.update(templates)
+
+    def _link(self, key: str, template: str):
+        for ref in self._refs.pop(key, ()):
+            self._dependents[ref].discard(key)
+        refs = references(template)
+        if refs:
+            self._refs[key] = refs
+            for ref in refs:
+                self._dependents.setdefault(ref, set()).add(key)
+
+    def dependents(self, key: str) -> List[str]:
+        """Every key whose resolved value depends on key, nearest first"""
+        found: List[str] = []
+        seen = {key}
+        queue = [key]
+        while queue:
+            name = queue.pop(0)
+            for dependent in sorted(self._dependents.get(name, ())):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    found.append(dependent)
+                    queue.append(dependent)
+        return found
+
+    def _invalidate(self, keys: Iterable[str]):
+        for key in keys:
+            self._cache.pop(key, None)
+            self.errors.pop(key, None)
+
+    def set(self, key: str, template: str) -> List[str]:
+        """Change one template; returns key and the dependents whose cache was dropped"""
+        if self.templates.get(key) == template and key in self.templates:
+            return []
+        self.templates[key] = template
+        self._link(key, template)
+        affected = [key, *self.dependents(key)]
+        self._invalidate(affected)
+        return affected
+
+    def update(self, templates: Mapping[str, str]) -> List[str]:
+        affected: Dict[str, None] = {}
+        for key, template in templates.items():
+            affected.update(dict.fromkeys(self.set(key, template)))
+        return list(affected)
+
+    def get(self, key: str, default: str = "") -> str:
+        """Resolved literal of key"""
+        if key not in self.templates:
+            return default
+        if key not in self._cache:
+            self._resolve(key, [])
+        return self._cache[key]
+
+    def _resolve(self, key: str, stack: List[str]) -> Optional[str]:
+        """Fill the cache for key; returns None while key is being resolved (a cycle)"""
+        if key in self._cache:
+            return self._cache[key]
+        if key in stack:
+            return None
+        template = self.templates[key]
+        refs = self._refs.get(key)
+        if not refs and "$$" not in template:
+            self._cache[key] = template
+            return template
+
+        stack.append(key)
+        cycle: List[str] = []
+        missing: List[str] = []
+
+        def substitute(match) -> str:
+            name, operator, fallback = match.groups()
+            if name is None:
+                return "$"
+            if name not in self.templates:
+                if operator is None:
+                    missing.append(name)
+                    return ""
+                return fallback
+            value = self._resolve(name, stack)
+            if value is None:
+                cycle.append(name)
+                return match.group(0)
+            if operator == ":-" and not value:
+                return fallback
+            return value
+
+        value = REFERENCE.sub(substitute, template)
+        if cycle:
+            loop = stack[stack.index(cycle[0]):]
+            message = f"circular references: {' -> '.join([*loop, loop[0]])}"
+            for name in loop:
+                self.errors[name] = f"{name} has {message}"
+        stack.pop()
+        if key in self.errors:
+            # Part of a cycle found here or while resolving a reference
+            value = template
+        elif missing:
+            self.errors[key] = f"{key} references unknown {', '.join(missing)}"
+        self._cache[key] = value
+        return value
+
+    def resolved(self) -> Dict[str, str]:
+        """Every key's resolved literal"""
+        return {key: self.get(key) for key in self.templates}
+
+    def order(self) -> List[str]:
+        """Keys with every key ordered after those it references
+
+        Raises ValueError naming the keys of any reference cycle.
+        """
+        indegree = {key: 0 for key in self.templates}
+        for key, refs in self._refs.items():
+            indegree[key] = sum(1 for ref in refs if ref in self.templates)
+        ready = [key for key, count in indegree.items() if count == 0]
+        ordered = []
+        while ready:
+            key = ready.pop(0)
+            ordered.append(key)
+            for dependent in sorted(self._dependents.get(key, ())):
+                if dependent in indegree:
+                    indegree[dependent] -= 1
+                    if indegree[dependent] == 0:
+                        ready.append(dependent)
+        if len(ordered) != len(indegree):
+            cyclic = sorted(key for key, count in indegree.items() if count > 0 and key not in ordered)
+            raise ValueError(f"Circular references between: {', '.join(cyclic)}")
+        return ordered
+
+def resolve_values(values: Mapping[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Resolved literals of a flat mapping and the interpolation error of each failing key"""
+    if not any("$" in value for value in values.values()):
+        return dict(values), {}
+    interpolator = Interpolator(values)
+    return interpolator.resolved(), dict(interpolator.errors)
+
+def resolve_config(config: Mapping[str, Mapping[str, str]]) -> Dict[str, Dict[str, str]]:
+    """Copy of a sectioned configuration with every value replaced by its literal"""
+    values, _ = resolve_values({key: value for section in config.values() for key, value in section.items()})
+    return {section: {key: values[key] for key in section_values} for section, section_values in config.items()}
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".broadsea-configurator", "autosave")
+
+def _read_umask() -> int:
+    # os.umask can only be read by setting it, which is process-wide, so
+    # this is done once at import rather than on every write
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+UMASK = _read_umask()
+
+def journal_name(target: Optional[str]) -> str:
+    """File name stem for the journal of a target .env file, or of an unsaved one"""
+    if not target:
+        return "untitled"
+    path = os.path.abspath(target)
+    digest = hashlib.sha1(path.encode()).hexdigest()[:12]
+    return f"{os.path.basename(path)}-{digest}"
+
+def write_atomic(path: str, data: bytes, mode: Optional[int] = None):
+    """Replace path with data so readers see either the old or the new content
+
+    The file keeps its permissions, or gets mode or the umask default when new.
+    """
+    directory = os.path.dirname(path) or "."
+    if mode is None:
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class EditJournal:
+    """Append-only journal of unsaved edits, written in batches on a background thread"""
+
+    # Edits are recorded relative to the last save of the target. Each batch
+    # appends one JSON line per changed key; repeated edits of a key between
+    # flushes are coalesced to its latest value. Every compact_after records
+    # the folded state is written to a checkpoint with an atomic rename and
+    # the journal is truncated. recover() reads the checkpoint and replays the
+    # journal on top, ignoring a line torn by a crash.
+
+    def __init__(self, target: Optional[str] = None, directory: str = AUTOSAVE_DIR,
+                 flush_interval: float = 0.5, compact_after: int = 200):
+        self.target = target
+        self.directory = directory
+        name = journal_name(target)
+        self.journal_path = os.path.join(directory, f"{name}.journal")
+        self.checkpoint_path = os.path.join(directory, f"{name}.checkpoint.json")
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+
+        # Folded state of everything written so far
+        self.state: Dict[str, Dict[str, str]] = {}
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._appended = 0
+        # Bumped by discard() so a batch taken before it is dropped
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def recover(self) -> Dict[str, Dict[str, str]]:
+        """Edits left by a session that ended without saving, grouped by section"""
+        state: Dict[str, Dict[str, str]] = {}
+        torn = False
+        try:
+            if os.path.exists(self.checkpoint_path):
+                with open(self.checkpoint_path, 'r') as f:
+                    state = json.load(f)
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, 'r') as f:
+                    for line in f:
+                        try:
+                            section, key, value = json.loads(line)
+                        except ValueError:
+                            # Torn final write
+                            torn = True
+                            break
+                        state.setdefault(section, {})[key] = value
+        except Exception as e:
+            raise Exception(f"Failed to recover autosaved edits: {str(e)}")
+        with self._io_lock:
+            self.state = state
+            if torn:
+                # Later appends must not land behind the partial line
+                self._compact()
+        return {section: dict(values) for section, values in state.items()}
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="edit-journal", daemon=True)
+            self._thread.start()
+
+    def record(self, section: str, key: str, value: str):
+        """Queue an edit; cheap enough to call on every keystroke"""
+        with self._lock:
+            self._pending[(section, key)] = value
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait()
+            # Let a burst of typing collapse into a single append
+            self._stop.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Autosave is best effort; the next batch retries the write
+                pass
+
+    def _open_journal(self, flags: int) -> int:
+        """Open the journal for writing, private as it holds password values"""
+        fd = os.open(self.journal_path, os.O_WRONLY | os.O_CREAT | flags, 0o600)
+        try:
+            # Journals written before it was created private
+            os.fchmod(fd, 0o600)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    def flush(self):
+        """Append pending edits now, compacting when the journal has grown"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            epoch = self._epoch
+        if not pending:
+            return
+        with self._io_lock:
+            if epoch != self._epoch:
+                return
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            data = "".join(
+                json.dumps([section, key, value]) + "\n"
+                for (section, key), value in pending.items()
+            )
+            try:
+                with os.fdopen(self._open_journal(os.O_APPEND), 'a') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception:
+                # Keep the edits for the next attempt unless newer ones replaced them
+                with self._lock:
+                    self._pending = {**pending, **self._pending}
+                raise
+            for (section, key), value in pending.items():
+                self.state.setdefault(section, {})[key] = value
+            self._appended += len(pending)
+            if self._appended >= self.compact_after:
+                self._compact()
+
+    def compact(self):
+        """Fold the journal into the checkpoint"""
+        self.flush()
+        with self._io_lock:
+            self._compact()
+
+    def _compact(self):
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        # Values include passwords
+        write_atomic(self.checkpoint_path, json.dumps(self.state).encode(), mode=0o600)
+        # A crash before the truncate only replays edits already in the checkpoint
+        os.close(self._open_journal(os.O_TRUNC))
+        self._appended = 0
+
+    def discard(self):
+        """Forget all edits, e.g. after the target has been saved"""
+        with self._lock:
+            self._pending.clear()
+            self._epoch += 1
+        with self._io_lock:
+            self.state = {}
+            self._appended = 0
+            for path in (self.journal_path, self.checkpoint_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def close(self):
+        """Stop the writer thread after writing any pending edits"""
+        if self._thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
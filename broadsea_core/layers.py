@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from broadsea_core.schema import get_registry
+
+DEFAULTS_LAYER = "defaults"
+
+def load_values(filepath: str) -> Dict[str, str]:
+    """Flat values of an .env or a JSON/YAML answers file"""
+    if os.path.basename(filepath) == ".env" or filepath.endswith(".env"):
+        from broadsea_core.envfile import load_config
+        config = load_config(filepath)
+        return {key: value for section in config.values() for key, value in section.items()}
+    from broadsea_core.generate import load_answers
+    return load_answers(filepath)
+
+@dataclass(frozen=True)
+class Layer:
+    """Named set of flat values applied on top of the layers before it"""
+    name: str
+    values: Mapping[str, str]
+    digest: str = field(default="", compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "values", MappingProxyType(dict(self.values)))
+        if not self.digest:
+            # The name is part of the digest so provenance is never shared between layers
+            payload = json.dumps([self.name, sorted(self.values.items())]).encode()
+            object.__setattr__(self, "digest", hashlib.sha256(payload).hexdigest())
+
+    @classmethod
+    def from_file(cls, path: str, name: Optional[str] = None) -> "Layer":
+        """Layer from an .env or a JSON/YAML answers file, named after the path"""
+        return cls(name or path, load_values(path))
+
+def defaults_layer() -> Layer:
+    """Schema defaults from create_sections(), the bottom of every stack"""
+    registry = get_registry()
+    return Layer(DEFAULTS_LAYER, {key: registry.field(key).default_value for key in registry.keys()})
+
+@dataclass(frozen=True)
+class Resolved:
+    """Merged values and the name of the layer that supplied each"""
+    values: Mapping[str, str]
+    sources: Mapping[str, str]
+
+    def to_config(self) -> Dict[str, Dict[str, str]]:
+        """Values grouped by section, with inactive fields cleared as in a saved .env"""
+        from broadsea_core.generate import build_config
+        return build_config(get_registry().sections, self.values)
+
+    def explain(self, key: str) -> Tuple[str, str]:
+        """Value of key and the layer it came from"""
+        return self.values.get(key, ""), self.sources.get(key, "")
+
+class OverlayResolver:
+    """Merges layer stacks, memoizing every prefix by its tuple of layer digests
+
+    Resolving many stacks that share their first layers only merges the
+    layers after the longest prefix already resolved.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, ...], Resolved]" = OrderedDict()
+        # Layers merged, to show how much memoization saved
+        self.merges = 0
+
+    def _lookup(self, digests: Tuple[str, ...]) -> Optional[Resolved]:
+        resolved = self._cache.get(digests)
+        if resolved is not None:
+            self._cache.move_to_end(digests)
+        return resolved
+
+    def _store(self, digests: Tuple[str, ...], resolved: Resolved):
+        self._cache[digests] = resolved
+        self._cache.move_to_end(digests)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def resolve(self, layers: Sequence[Layer]) -> Resolved:
+        """Merge layers in order, later layers overriding earlier ones"""
+        digests = tuple(layer.digest for layer in layers)
+        start = len(digests)
+        resolved = None
+        while start > 0:
+            resolved = self._lookup(digests[:start])
+            if resolved is not None:
+                break
+            start -= 1
+        values = dict(resolved.values) if resolved else {}
+        sources = dict(resolved.sources) if resolved else {}
+        for index in range(start, len(layers)):
+            layer = layers[index]
+            values.update(layer.values)
+            sources.update(dict.fromkeys(layer.values, layer.name))
+            self.merges += 1
+            resolved = Resolved(MappingProxyType(dict(values)), MappingProxyType(dict(sources)))
+            self._store(digests[:index + 1], resolved)
+        return resolved or Resolved(MappingProxyType({}), MappingProxyType({}))
+
+    def resolve_files(self, paths: Sequence[str], with_defaults: bool = True) -> Resolved:
+        layers: List[Layer] = [defaults_layer()] if with_defaults else []
+        layers += [Layer.from_file(path) for path in paths]
+        return self.resolve(layers)
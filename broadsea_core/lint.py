@@ -0,0 +1,123 @@
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from broadsea_core.fleetdb import walk_env_files
+
+@dataclass(frozen=True)
+class LintIssue:
+    key: str
+    section: str
+    message: str
+    # error or warning
+    severity: str = "error"
+
+@dataclass(frozen=True)
+class LintResult:
+    path: str
+    issues: Tuple[LintIssue, ...] = ()
+    # Set when the file could not be read at all
+    error: str = ""
+    seconds: float = 0.0
+
+    def failed(self, strict: bool = False) -> bool:
+        if self.error:
+            return True
+        return any(issue.severity == "error" or strict for issue in self.issues)
+
+def expand_paths(paths: Iterable[str]) -> Iterator[str]:
+    """Files as given, and every .env below the given directories"""
+    for path in paths:
+        if os.path.isdir(path):
+            yield from walk_env_files(path)
+        else:
+            yield path
+
+# Per-process schema and compiled rules, built on first use in each worker
+_state = None
+
+def _worker_state():
+    global _state
+    if _state is None:
+        from broadsea_core.schema import create_sections, get_registry
+        from broadsea_core.validation import compile_sections
+        sections = create_sections()
+        _state = (sections, compile_sections(sections), get_registry())
+    return _state
+
+def lint_file(path: str) -> LintResult:
+    """Validate the values of one .env file the way the section validators would"""
+    from broadsea_core.envfile import EnvDocument
+    from broadsea_core.validation import config_issues
+
+    started = time.perf_counter()
+    try:
+        sections, compiled, registry = _worker_state()
+        document = EnvDocument.read(path)
+        values = {key: document.get(key) for key in document.entries}
+        issues = [
+            LintIssue(key, section.title, message)
+            for section, key, message in config_issues(sections, values, compiled)
+        ]
+        issues += [
+            LintIssue(key, "", f"{key} is not a Broadsea setting", "warning")
+            for key in values if registry.section_of(key) is None
+        ]
+    except Exception as e:
+        return LintResult(path, error=str(e), seconds=time.perf_counter() - started)
+    return LintResult(path, tuple(issues), seconds=time.perf_counter() - started)
+
+def lint_files(paths: Iterable[str], workers: Optional[int] = None) -> List[LintResult]:
+    """Lint files in a process pool, returning results in input order"""
+    paths = list(paths)
+    workers = min(workers or os.cpu_count() or 1, max(len(paths), 1))
+    if workers == 1:
+        return [lint_file(path) for path in paths]
+    # Batches keep the per-file cost to parsing and validation rather than IPC
+    chunksize = max(1, min(64, len(paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lint_file, paths, chunksize=chunksize))
+
+def json_report(results: List[LintResult], strict: bool = False) -> str:
+    report = {
+        "summary": {
+            "files": len(results),
+            "failed": sum(1 for result in results if result.failed(strict)),
+            "errors": sum(1 for result in results for issue in result.issues if issue.severity == "error"),
+            "warnings": sum(1 for result in results for issue in result.issues if issue.severity == "warning"),
+        },
+        "files": [asdict(result) for result in results if result.issues or result.error],
+    }
+    return json.dumps(report, indent=2) + "\n"
+
+def junit_report(results: List[LintResult], strict: bool = False) -> str:
+    """JUnit XML with one test case per file and one failure per issue"""
+    suite = ET.Element("testsuite", {
+        "name": "broadsea-lint",
+        "tests": str(len(results)),
+        "failures": str(sum(1 for result in results if result.failed(strict) and not result.error)),
+        "errors": str(sum(1 for result in results if result.error)),
+        "time": f"{sum(result.seconds for result in results):.3f}",
+    })
+    for result in results:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": "broadsea-lint",
+            "name": result.path,
+            "time": f"{result.seconds:.3f}",
+        })
+        if result.error:
+            ET.SubElement(case, "error", {"message": result.error})
+        for issue in result.issues:
+            if issue.severity == "error" or strict:
+                failure = ET.SubElement(case, "failure", {"message": issue.message, "type": issue.key})
+                failure.text = f"{issue.section}: {issue.message}" if issue.section else issue.message
+    return ET.tostring(suite, encoding="unicode", xml_declaration=True) + "\n"
+
+REPORTS = {
+    "json": json_report,
+    "junit": junit_report,
+}
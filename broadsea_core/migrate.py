@@ -0,0 +1,367 @@
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from broadsea_core.envfile import ENCODING, ERRORS, SECTION_RULE
+
+# First line of a migrated file; records the schema it follows
+VERSION_MARKER = "# Broadsea configuration schema:"
+VERSION_LINE = re.compile(r"#\s*Broadsea configuration schema:\s*(\S+)")
+
+@dataclass(frozen=True)
+class Rename:
+    old: str
+    new: str
+
+@dataclass(frozen=True)
+class Remove:
+    """Key dropped from the schema; the line is kept as a comment"""
+    key: str
+
+@dataclass(frozen=True)
+class Add:
+    """Key new in the schema, appended to its section with the schema default"""
+    key: str
+
+@dataclass(frozen=True)
+class ChangeDefault:
+    """Default that changed; values still at the old default follow it
+
+    Only for keys with no state outside the file, such as build sources.
+    """
+    key: str
+    old: str
+    new: str
+
+@dataclass(frozen=True)
+class Advise:
+    """Default that changed for a path, schema or endpoint; reported, never rewritten
+
+    Following it would point the site at secrets, data or services it
+    does not have.
+    """
+    key: str
+    old: str
+    new: str
+
+@dataclass(frozen=True)
+class SchemaVersion:
+    version: str
+    # Changes from the previous version to this one
+    changes: Tuple[object, ...] = ()
+
+    def of_type(self, kind) -> List:
+        return [change for change in self.changes if isinstance(change, kind)]
+
+# 3.0 is the schema of the standalone widgets in sections.py, 3.5 that of
+# create_sections()
+VERSIONS: Tuple[SchemaVersion, ...] = (
+    SchemaVersion("3.0"),
+    SchemaVersion("3.5", (
+        *(Remove(key) for key in (
+            "BROADSEA_CERTS_FOLDER", "GITHUB_PAT_SECRET_FILE", "ATLAS_INSTANCE_NAME",
+            "ATLAS_USE_EXECUTION_ENGINE", "ATLAS_DISABLE_BROWSER_CHECK", "ATLAS_ENABLE_TAGGING_SECTION",
+            "ATLAS_CACHE_SOURCES", "ATLAS_POLL_INTERVAL", "ATLAS_ENABLE_SKIP_LOGIN", "ATLAS_VIEW_PROFILE_DATES",
+            "ATLAS_ENABLE_COSTS", "ATLAS_SUPPORT_URL", "ATLAS_SUPPORT_MAIL", "ATLAS_DEFAULT_LOCALE",
+            "ATLAS_ENABLE_PERSON_COUNT", "ATLAS_ENABLE_TERMS_AND_CONDITIONS",
+            "WEBAPI_LOGGING_LEVEL_ORG_APACHE_SHIRO", "WEBAPI_DATASOURCE_OHDSI_SCHEMA",
+            "WEBAPI_ADDITIONAL_JDBC_FILE_PATH", "WEBAPI_CACERTS_FILE", "CACHE_GENERATION_INVALIDAFTERDAYS",
+            "CACHE_GENERATION_CLEANUPINTERVAL", "I18N_ENABLED", "EXECUTIONENGINE_URL",
+            "WEBAPI_CDM_SNOWFLAKE_PRIVATE_KEY_FILE", "ATLAS_SECURITY_ICON", "ATLAS_SECURITY_USE_FORM",
+            "WEBAPI_SECURITY_PROVIDER", "SECURITY_TOKEN_EXPIRATION", "SECURITY_AUTH_AD_ENABLED",
+            "SECURITY_AD_URL", "SECURITY_AUTH_OAUTH_ENABLED", "SECURITY_OAUTH_CALLBACK_UI",
+            "SECURITY_AUTH_OPENID_ENABLED", "SECURITY_AUTH_KERBEROS_ENABLED", "SECURITY_AUTH_CAS_ENABLED",
+            "SECURITY_AUTH_GOOGLEIAP_ENABLED", "CDM_SOURCE_NAME", "CDM_VERSION", "CDM_CONNECTIONDETAILS_PORT",
+            "CDM_DATABASE_SCHEMA", "RESULTS_DATABASE_SCHEMA", "TEMP_DATABASE_SCHEMA", "ATLAS_BUILD_FROM_GIT",
+            "DOCKER_COMPOSE_VERSION", "BUILD_ENV", "ENABLE_DEBUG", "LOG_LEVEL", "LOG_FORMAT", "LOG_PATH",
+            "LOG_RETENTION_DAYS", "LOG_MAX_SIZE", "ENABLE_METRICS", "METRICS_PORT", "ENABLE_HEALTH_CHECK",
+            "HEALTH_CHECK_PATH", "ENABLE_TRACING", "TRACING_SAMPLE_RATE", "ENABLE_USAGE_STATS",
+            "ANALYTICS_DB_PATH", "ANALYTICS_RETENTION_MONTHS",
+        )),
+        *(Add(key) for key in (
+            "ATLAS_VERSION", "ATLAS_PORT", "SOLR_VOCAB_DATABASE_SCHEMA", "HADES_USER", "HADES_PASSWORD_FILE",
+            "PHOEBE_PG_HOST", "PHOEBE_PG_DATABASE", "PHOEBE_PG_SCHEMA", "PHOEBE_PG_USER",
+            "PHOEBE_PG_PASSWORD_FILE", "ARES_DATA_FOLDER", "CONTENT_TITLE", "CONTENT_ARES_DISPLAY",
+            "CONTENT_ATLAS_DISPLAY", "CONTENT_HADES_DISPLAY", "CONTENT_OPENSHINYSERVER_DISPLAY",
+            "CONTENT_PGADMIN4_DISPLAY", "CONTENT_POSITCONNECT_DISPLAY", "CONTENT_PERSEUS_DISPLAY",
+            "OPENLDAP_USERS", "OPENLDAP_ADMIN_PASSWORD_FILE", "OPENLDAP_ACCOUNT_PASSWORDS_FILE",
+            "OPEN_SHINY_SERVER_APP_ROOT", "POSIT_CONNECT_LICENSE_SERVER", "POSIT_CONNECT_LICENSE_FILE",
+            "POSIT_CONNECT_GCFG_FILE", "POSIT_CONNECT_R_VERSION", "PERSEUS_SMTP_SERVER", "PERSEUS_SMTP_PORT",
+            "PERSEUS_TOKEN_SECRET_KEY", "PERSEUS_EMAIL_SECRET_KEY", "PERSEUS_VOCAB_FILES_PATH",
+            "ACHILLES_CREATE_TABLE", "ACHILLES_SMALL_CELL_COUNT", "DQD_NUM_THREADS", "DQD_WRITE_TO_TABLE",
+            "ARES_RUN_NETWORK", "PGADMIN_ADMIN_USER", "PGADMIN_DEFAULT_PASSWORD_FILE",
+        )),
+        Advise("CDM_CONNECTIONDETAILS_SERVER", "localhost/postgres", "broadsea-atlasdb/postgres"),
+        Advise("CDM_CONNECTIONDETAILS_PASSWORD_FILE", "./secrets/cdm/CDM_PASSWORD",
+               "./secrets/postprocessing/CDM_CONNECTIONDETAILS_PASSWORD"),
+        Advise("VOCAB_DATABASE_SCHEMA", "vocab", "demo_cdm"),
+        Advise("VOCAB_PG_HOST", "localhost", "broadsea-atlasdb"),
+        Advise("VOCAB_PG_SCHEMA", "vocab", "omop_vocab"),
+        Advise("VOCAB_PG_PASSWORD_FILE", "./secrets/vocab/VOCAB_PASSWORD", "./secrets/omop_vocab/VOCAB_PG_PASSWORD"),
+        Advise("VOCAB_PG_FILES_PATH", "./vocab/files", "./omop_vocab/files"),
+        Advise("UMLS_API_KEY_FILE", "./secrets/vocab/UMLS_API_KEY", "./secrets/omop_vocab/UMLS_API_KEY"),
+        Advise("SOLR_VOCAB_ENDPOINT", "http://broadsea-solr-vocab:8983/solr", ""),
+        ChangeDefault("ATLAS_GITHUB_URL", "https://github.com/OHDSI/Atlas.git#master",
+                      "https://github.com/OHDSI/Atlas.git#1297c137669f21babace1906f23c3a9d70a9da19"),
+        ChangeDefault("WEBAPI_GITHUB_URL", "https://github.com/OHDSI/WebAPI.git#master",
+                      "https://github.com/OHDSI/WebAPI.git#rc-2.13.0"),
+    )),
+)
+
+LATEST = VERSIONS[-1].version
+
+@dataclass
+class Plan:
+    """Every change between two versions, folded into per-key lookups; shared, so never modified"""
+    source: str
+    target: str
+    renames: Dict[str, str] = field(default_factory=dict)
+    removes: Set[str] = field(default_factory=set)
+    # Added keys grouped by section, in schema order
+    adds: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    defaults: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    advisories: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+def version_index(version: str) -> int:
+    for index, schema in enumerate(VERSIONS):
+        if schema.version == version:
+            return index
+    raise Exception(f"Unknown schema version {version}")
+
+@lru_cache(maxsize=None)
+def build_plan(source: str, target: str = LATEST) -> Plan:
+    from broadsea_core.schema import get_registry
+
+    registry = get_registry()
+    plan = Plan(source, target)
+    for schema in VERSIONS[version_index(source) + 1:version_index(target) + 1]:
+        for change in schema.changes:
+            if isinstance(change, Rename):
+                # Chained renames collapse to the first old name
+                original = next((old for old, new in plan.renames.items() if new == change.old), change.old)
+                plan.renames[original] = change.new
+            elif isinstance(change, Remove):
+                plan.removes.add(change.key)
+            elif isinstance(change, Add):
+                field_ = registry.field(change.key)
+                section = field_.section if field_ else ""
+                plan.adds.setdefault(section, []).append((change.key, field_.default_value if field_ else ""))
+            elif isinstance(change, ChangeDefault):
+                old = plan.defaults.get(change.key, (change.old, ""))[0]
+                plan.defaults[change.key] = (old, change.new)
+            elif isinstance(change, Advise):
+                old = plan.advisories.get(change.key, (change.old, ""))[0]
+                plan.advisories[change.key] = (old, change.new)
+    return plan
+
+def detect_version(lines: Iterable[str]) -> str:
+    """Schema version from the marker line, or guessed from which keys are present"""
+    keys = set()
+    for line in lines:
+        stripped = line.strip()
+        if match := VERSION_LINE.match(stripped):
+            return match.group(1)
+        if stripped and not stripped.startswith('#') and '=' in stripped:
+            keys.add(stripped.split('=', 1)[0].strip())
+    version = LATEST
+    for index in range(len(VERSIONS) - 1, 0, -1):
+        schema = VERSIONS[index]
+        removed = {change.key for change in schema.of_type(Remove)}
+        added = {change.key for change in schema.of_type(Add)}
+        if keys & removed or (added and not keys & added):
+            version = VERSIONS[index - 1].version
+        else:
+            break
+    return version
+
+@dataclass(frozen=True)
+class MigrationResult:
+    path: str
+    source: str = ""
+    target: str = ""
+    renamed: Tuple[str, ...] = ()
+    added: Tuple[str, ...] = ()
+    removed: Tuple[str, ...] = ()
+    defaults: Tuple[str, ...] = ()
+    # Values left at an old default that now differs, for the user to review
+    advisories: Tuple[str, ...] = ()
+    backup: str = ""
+    error: str = ""
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.renamed or self.added or self.removed or self.defaults) or self.source != self.target
+
+    def summary(self) -> str:
+        if self.error:
+            return f"{self.path}: error: {self.error}"
+        if not self.changed:
+            return f"{self.path}: already {self.target}"
+        counts = [f"{len(items)} {label}" for items, label in (
+            (self.renamed, "renamed"), (self.added, "added"),
+            (self.removed, "removed"), (self.defaults, "defaults updated"),
+        ) if items]
+        summary = f"{self.path}: {self.source} -> {self.target}" + (f": {', '.join(counts)}" if counts else "")
+        if self.backup:
+            summary += f" (original kept as {self.backup})"
+        return "\n  ".join([summary, *self.advisories])
+
+def _header_section(stripped: str) -> Optional[str]:
+    # Same header convention as EnvDocument
+    if stripped.startswith('#') and 'Section' in stripped:
+        return stripped.split(':')[-1].strip()
+    return None
+
+def migrate_lines(lines: Iterable[str], plan: Plan, report: Dict[str, List[str]]) -> Iterator[str]:
+    """Rewrite a stream of .env lines according to plan
+
+    Lines are yielded as they are read; only comment and blank lines after
+    the last key of a section are held back, so added keys can be placed
+    before the next section's header.
+    """
+    from broadsea_core.schema import get_registry
+
+    section_of = get_registry().section_of
+    pending_adds = {section: list(keys) for section, keys in plan.adds.items()}
+    seen: Set[str] = set()
+    current: Optional[str] = None
+    held: List[str] = []
+
+    def flush_adds(section: Optional[str]) -> Iterator[str]:
+        for key, default in pending_adds.pop(section or "", []):
+            if key not in seen:
+                seen.add(key)
+                report["added"].append(key)
+                yield f"{key}={default}\n"
+
+    yield f"{VERSION_MARKER} {plan.target}\n"
+    for line in lines:
+        stripped = line.strip()
+        if VERSION_LINE.match(stripped):
+            continue
+        header = _header_section(stripped)
+        if header is not None:
+            # Keys added to the section that just ended go before its trailing comments
+            rule = held.pop() if held and held[-1].strip() == SECTION_RULE else None
+            yield from flush_adds(current)
+            yield from held
+            held = []
+            if rule is not None:
+                yield rule
+            current = header
+            yield line
+            continue
+        if not stripped or stripped.startswith('#') or '=' not in stripped:
+            held.append(line)
+            continue
+
+        yield from held
+        held = []
+        key = stripped.split('=', 1)[0].strip()
+        if current is None:
+            current = section_of(key)
+        if key in plan.removes:
+            report["removed"].append(key)
+            yield f"# Removed in schema {plan.target}: {stripped}\n"
+            continue
+        if key in plan.renames:
+            new_key = plan.renames[key]
+            report["renamed"].append(f"{key} -> {new_key}")
+            line = line.replace(key, new_key, 1)
+            key = new_key
+        seen.add(key)
+        if key in plan.defaults:
+            old, new = plan.defaults[key]
+            value = line.split('=', 1)[1].strip()
+            if value == old:
+                report["defaults"].append(key)
+                line = line[:line.index('=') + 1] + new + "\n"
+        if key in plan.advisories:
+            old, new = plan.advisories[key]
+            if line.split('=', 1)[1].strip() == old:
+                report["advisories"].append(
+                    f"{key} left at {old or 'empty'}; schema {plan.target} defaults to {new or 'empty'}"
+                )
+        yield line if line.endswith("\n") else line + "\n"
+
+    yield from flush_adds(current)
+    yield from held
+    # Sections the file did not have at all
+    for section in list(pending_adds):
+        lines = list(flush_adds(section))
+        if lines:
+            yield from ["\n", f"{SECTION_RULE}\n", f"# Section: {section}\n", f"{SECTION_RULE}\n", "\n", *lines]
+
+def keep_backup(path: str) -> str:
+    """Keep the current content of path as path.bak; a hard link when the filesystem allows it"""
+    backup = path + ".bak"
+    if os.path.lexists(backup):
+        os.remove(backup)
+    try:
+        os.link(path, backup)
+    except OSError:
+        shutil.copy2(path, backup)
+    return backup
+
+def migrate_file(path: str, target: str = LATEST, source: Optional[str] = None,
+                 dry_run: bool = False, backup: bool = True) -> MigrationResult:
+    """Migrate one .env in place, streaming it through a temporary file; never raises
+
+    Unless backup is false, the original is kept as path.bak.
+    """
+    try:
+        if source is None:
+            with open(path, 'r', encoding=ENCODING, errors=ERRORS, newline='') as f:
+                source = detect_version(f)
+        if version_index(source) >= version_index(target):
+            return MigrationResult(path, source, source)
+        plan = build_plan(source, target)
+        report: Dict[str, List[str]] = {"renamed": [], "added": [], "removed": [], "defaults": [], "advisories": []}
+        backup_path = ""
+        with open(path, 'r', encoding=ENCODING, errors=ERRORS, newline='') as src:
+            if dry_run:
+                for _ in migrate_lines(src, plan, report):
+                    pass
+            else:
+                # Same directory so the final rename stays on one filesystem
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-")
+                try:
+                    with os.fdopen(fd, 'w', encoding=ENCODING, errors=ERRORS, newline='') as dst:
+                        dst.writelines(migrate_lines(src, plan, report))
+                        dst.flush()
+                        os.fsync(dst.fileno())
+                    os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+                    if backup:
+                        backup_path = keep_backup(path)
+                    os.replace(temp_path, path)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    raise
+        return MigrationResult(path, source, target, tuple(report["renamed"]), tuple(report["added"]),
+                               tuple(report["removed"]), tuple(report["defaults"]), tuple(report["advisories"]),
+                               backup_path)
+    except Exception as e:
+        return MigrationResult(path, error=f"Failed to migrate: {str(e)}")
+
+def _migrate(args: Tuple[str, str, Optional[str], bool, bool]) -> MigrationResult:
+    return migrate_file(*args)
+
+def migrate_files(paths: Iterable[str], target: str = LATEST, source: Optional[str] = None,
+                  dry_run: bool = False, workers: Optional[int] = None,
+                  backup: bool = True) -> Iterator[MigrationResult]:
+    """Migrate files in a process pool, yielding results in input order as they finish"""
+    version_index(target)
+    tasks = [(path, target, source, dry_run, backup) for path in paths]
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if workers == 1:
+        yield from map(_migrate, tasks)
+        return
+    chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_migrate, tasks, chunksize=chunksize)
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Tuple, Union
+
+# Conditions used in ConfigField.depends_on. A plain string is shorthand for
+# Equals(string); predicate objects are picklable, unlike lambdas.
+
+@dataclass(frozen=True)
+class Predicate:
+    """Condition on the value of another field"""
+
+    def __call__(self, value: str) -> bool:
+        raise NotImplementedError
+
+@dataclass(frozen=True)
+class Equals(Predicate):
+    value: str
+
+    def __call__(self, value: str) -> bool:
+        return value == self.value
+
+@dataclass(frozen=True)
+class In(Predicate):
+    values: Tuple[str, ...]
+
+    def __call__(self, value: str) -> bool:
+        return value in self.values
+
+@dataclass(frozen=True)
+class NotEmpty(Predicate):
+
+    def __call__(self, value: str) -> bool:
+        return bool(value.strip())
+
+Condition = Union[str, Predicate]
+
+def as_predicate(condition: Condition) -> Predicate:
+    """Normalize a depends_on value to a predicate"""
+    if isinstance(condition, Predicate):
+        return condition
+    if callable(condition):
+        raise TypeError("depends_on conditions must be strings or Predicate instances")
+    return Equals(condition)
@@ -0,0 +1,233 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Rules are frozen dataclasses holding only plain data and compiled patterns,
+# so compiled rule sets can be pickled and shipped to worker processes.
+
+@dataclass(frozen=True, kw_only=True)
+class Rule:
+    """Base class for declarative validation rules"""
+    message: Optional[str] = None
+    allow_empty: bool = False
+
+    # Keys besides the validated one whose values the rule reads
+    inputs: Tuple[str, ...] = ()
+    # A failing rule with stop=True skips the remaining rules for the key
+    stop = False
+
+    def check(self, key: str, value: str, values: Mapping[str, str]) -> Optional[str]:
+        if self.allow_empty and not value:
+            return None
+        return self.evaluate(key, value, values)
+
+    def evaluate(self, key: str, value: str, values: Mapping[str, str]) -> Optional[str]:
+        raise NotImplementedError
+
+    def fail(self, key: str, default: str, **extra) -> str:
+        return (self.message or default).format(key=key, **extra)
+
+@dataclass(frozen=True, kw_only=True)
+class Required(Rule):
+    """Value must not be empty, or blank with strip=True"""
+    strip: bool = False
+    stop = True
+
+    def evaluate(self, key, value, values):
+        if not (value.strip() if self.strip else value):
+            return self.fail(key, "{key} is required")
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class RequiredIf(Rule):
+    """Value must not be empty when another key has a given value"""
+    other: str
+    equals: str
+    stop = True
+
+    def __post_init__(self):
+        object.__setattr__(self, "inputs", (self.other,))
+
+    def evaluate(self, key, value, values):
+        if values.get(self.other, "").lower() == self.equals.lower() and not value.strip():
+            return self.fail(key, "{key} is required when {other} is {equals}",
+                             other=self.other, equals=self.equals)
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class Port(Rule):
+    """TCP port number between 0 and 65535"""
+    label: Optional[str] = None
+
+    def evaluate(self, key, value, values):
+        name = self.label or key
+        # ASCII only, as int() rejects digits such as "²" that isdigit() accepts
+        if not (value.isascii() and value.isdigit()):
+            return self.fail(name, "{key} must be a number")
+        if not 0 <= int(value) <= 65535:
+            return self.fail(name, "{key} must be between 0 and 65535")
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class Bool(Rule):
+    """Literal true or false, case-insensitive"""
+
+    def evaluate(self, key, value, values):
+        if value.lower() not in ("true", "false"):
+            return self.fail(key, "{key} must be either 'true' or 'false'")
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class Enum(Rule):
+    """One of a fixed set of values"""
+    values: Tuple[str, ...]
+    case_sensitive: bool = False
+    _allowed: frozenset = field(default=frozenset(), repr=False, compare=False)
+
+    def __post_init__(self):
+        allowed = self.values if self.case_sensitive else (v.lower() for v in self.values)
+        object.__setattr__(self, "_allowed", frozenset(allowed))
+
+    def evaluate(self, key, value, values):
+        candidate = value if self.case_sensitive else value.lower()
+        if candidate not in self._allowed:
+            return self.fail(key, "{key} must be one of: {choices}", choices=", ".join(self.values))
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class Regex(Rule):
+    """Value must match a regular expression from its start"""
+    pattern: str
+    _compiled: Optional[re.Pattern] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_compiled", re.compile(self.pattern))
+
+    def matches(self, value: str) -> bool:
+        return self._compiled.match(value) is not None
+
+    def evaluate(self, key, value, values):
+        if not self.matches(value):
+            return self.fail(key, "{key} has invalid format")
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class Range(Rule):
+    """Unsigned integer within optional bounds"""
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+    unit: str = ""
+
+    def evaluate(self, key, value, values):
+        # Signs and surrounding spaces are not digits, as in the isdigit() checks these rules replaced
+        if not (value.isascii() and value.isdigit()):
+            return self.fail(key, "{key} must be a number")
+        number = int(value)
+        if (self.minimum is not None and number < self.minimum) or \
+                (self.maximum is not None and number > self.maximum):
+            if self.maximum is None:
+                bounds = f"at least {self.minimum}"
+            elif self.minimum is None:
+                bounds = f"at most {self.maximum}"
+            else:
+                bounds = f"between {self.minimum} and {self.maximum}"
+            suffix = f" {self.unit}" if self.unit else ""
+            return self.fail(key, "{key} must be {bounds}{suffix}", bounds=bounds, suffix=suffix)
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class Json(Rule):
+    """Valid JSON document"""
+
+    def evaluate(self, key, value, values):
+        try:
+            json.loads(value)
+        except json.JSONDecodeError:
+            return self.fail(key, "{key} must be valid JSON")
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class Path(Rule):
+    """Filesystem path, optionally required to exist or to have an existing parent"""
+    must_exist: bool = False
+    parent_must_exist: bool = False
+
+    def evaluate(self, key, value, values):
+        path = os.path.expanduser(value)
+        if self.must_exist and not os.path.exists(path):
+            return self.fail(key, "{key} does not exist: {path}", path=value)
+        parent = os.path.dirname(path)
+        if self.parent_must_exist and parent and not os.path.isdir(parent):
+            return self.fail(key, "Directory for {key} does not exist: {path}", path=parent)
+        return None
+
+@dataclass(frozen=True, kw_only=True)
+class Email(Rule):
+    """Looks like an email address"""
+
+    def evaluate(self, key, value, values):
+        if "@" not in value:
+            return self.fail(key, "{key} must be a valid email address")
+        return None
+
+# Rule kinds that touch the filesystem or parse large documents
+EXPENSIVE_RULES = (Json, Path)
+
+class CompiledRules:
+    """Rules grouped per key, compiled once and reused for every validation"""
+
+    def __init__(self, rules: Iterable[Tuple[str, Sequence[Rule]]]):
+        self.rules: Dict[str, Tuple[Rule, ...]] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        for key, key_rules in rules:
+            self.rules[key] = self.rules.get(key, ()) + tuple(key_rules)
+            for rule in key_rules:
+                for other in rule.inputs:
+                    self.dependents.setdefault(other, []).append(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rules
+
+    def keys(self) -> List[str]:
+        return list(self.rules)
+
+    def inputs(self, key: str) -> Tuple[str, ...]:
+        """Every key whose value the rules for key read"""
+        inputs = (key,)
+        for rule in self.rules.get(key, ()):
+            inputs += rule.inputs
+        return inputs
+
+    def is_expensive(self, key: str) -> bool:
+        return any(isinstance(rule, EXPENSIVE_RULES) for rule in self.rules.get(key, ()))
+
+    def check(self, key: str, values: Mapping[str, str]) -> List[str]:
+        """Run the rules for one key and return its issues"""
+        value = values.get(key, "")
+        issues = []
+        for rule in self.rules.get(key, ()):
+            if error := rule.check(key, value, values):
+                issues.append(error)
+                if rule.stop:
+                    break
+        return issues
+
+    def key_issues(self, values: Mapping[str, str],
+                   keys: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        """(key, message) for the rules of the given keys, or all keys, in definition order"""
+        issues = []
+        for key in (self.rules if keys is None else keys):
+            issues.extend((key, error) for error in self.check(key, values))
+        return issues
+
+    def validate(self, values: Mapping[str, str], keys: Optional[Iterable[str]] = None) -> List[str]:
+        """Run the rules for the given keys, or all keys, in definition order"""
+        return [error for _, error in self.key_issues(values, keys)]
+
+@lru_cache(maxsize=None)
+def pattern_rule(pattern: str) -> Regex:
+    """Shared precompiled Regex rule for an ad-hoc pattern"""
+    return Regex(pattern=pattern)
@@ -0,0 +1,817 @@
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+from broadsea_core.predicates import Condition, NotEmpty
+from broadsea_core.rules import Email, Port, Range, Rule
+
+@dataclass
+class ConfigField:
+    name: str
+    description: str
+    default_value: str = ""
+    required: bool = True
+    depends_on: Optional[Dict[str, Condition]] = None
+    validation_func: Optional[callable] = None
+    rules: Tuple[Rule, ...] = ()
+    options: Optional[List[str]] = None
+    field_type: str = "text"  # text, password, combo, checkbox, file
+    help_text: str = ""
+    placeholder: str = ""
+    section: str = ""
+    group: str = ""
+
+class ConfigSection:
+    def __init__(self, name: str, title: str, description: str):
+        self.name = name
+        self.title = title
+        self.description = description
+        self.fields: List[ConfigField] = []
+        self.groups: Dict[str, str] = {}
+
+    def add_field(self, field: ConfigField):
+        field.section = self.name
+        self.fields.append(field)
+
+    def add_group(self, name: str, title: str):
+        self.groups[name] = title
+
+def create_sections() -> List[ConfigSection]:
+    sections = []
+
+    # Host Configuration
+    host = ConfigSection(
+        "Host",
+        "Broadsea Host Configuration",
+        "Configure basic host settings for Broadsea"
+    )
+    host.add_group("basic", "Basic Settings")
+    host.add_field(ConfigField(
+        "DOCKER_ARCH",
+        "Docker architecture to use",
+        default_value="linux/amd64",
+        options=["linux/amd64", "linux/arm64"],
+        field_type="combo",
+        help_text="Use linux/arm64 for Mac Silicon, otherwise keep as linux/amd64",
+        group="basic"
+    ))
+    host.add_field(ConfigField(
+        "BROADSEA_HOST",
+        "Host URL without protocol",
+        default_value="127.0.0.1",
+        help_text="Change to your host URL (without the http part)",
+        group="basic"
+    ))
+    host.add_field(ConfigField(
+        "HTTP_TYPE",
+        "HTTP protocol type",
+        default_value="http",
+        options=["http", "https"],
+        field_type="combo",
+        help_text="If using https, you need to add the crt and key files to the ./certs folder",
+        group="basic"
+    ))
+    sections.append(host)
+
+    # Atlas Configuration
+    atlas = ConfigSection(
+        "Atlas",
+        "Atlas Configuration",
+        "Configure OHDSI Atlas settings"
+    )
+    atlas.add_group("basic", "Basic Settings")
+    atlas.add_group("auth", "Authentication")
+    atlas.add_group("features", "Feature Flags")
+    
+    # Basic Settings
+    atlas.add_field(ConfigField(
+        "ATLAS_VERSION",
+        "Atlas Version",
+        default_value="2.12.0",
+        group="basic"
+    ))
+    atlas.add_field(ConfigField(
+        "ATLAS_PORT",
+        "Atlas Port",
+        default_value="8080",
+        rules=(Port(),),
+        group="basic"
+    ))
+    
+    # Authentication
+    atlas.add_field(ConfigField(
+        "ATLAS_USER_AUTH_ENABLED",
+        "Enable User Authentication",
+        default_value="false",
+        field_type="checkbox",
+        help_text="Enable if using security, but ensure you fill out the WebAPI/Atlas security sections",
+        group="auth"
+    ))
+    
+    # Feature Flags
+    atlas.add_field(ConfigField(
+        "ATLAS_COHORT_COMPARISON_RESULTS_ENABLED",
+        "Enable Cohort Comparison Results",
+        default_value="false",
+        field_type="checkbox",
+        group="features"
+    ))
+    atlas.add_field(ConfigField(
+        "ATLAS_PLP_RESULTS_ENABLED",
+        "Enable PLP Results",
+        default_value="false",
+        field_type="checkbox",
+        group="features"
+    ))
+    sections.append(atlas)
+
+    # WebAPI Configuration
+    webapi = ConfigSection(
+        "WebAPI",
+        "WebAPI Configuration",
+        "Configure OHDSI WebAPI settings"
+    )
+    webapi.add_group("basic", "Basic Settings")
+    webapi.add_group("logging", "Logging Configuration")
+    webapi.add_group("database", "Database Connection")
+    
+    # Basic Settings
+    webapi.add_field(ConfigField(
+        "FLYWAY_BASELINE_ON_MIGRATE",
+        "Enable Flyway Baseline on Migrate",
+        default_value="true",
+        field_type="checkbox",
+        help_text="Set to false if not using a pre-filled WebAPI schema",
+        group="basic"
+    ))
+    
+    # Logging Settings
+    webapi.add_field(ConfigField(
+        "WEBAPI_LOGGING_LEVEL_ROOT",
+        "Root Logging Level",
+        default_value="info",
+        options=["trace", "debug", "info", "warn", "error"],
+        field_type="combo",
+        help_text="Logging level for the entire application",
+        group="logging"
+    ))
+    webapi.add_field(ConfigField(
+        "WEBAPI_LOGGING_LEVEL_ORG_OHDSI",
+        "OHDSI Library Logging Level",
+        default_value="info",
+        options=["trace", "debug", "info", "warn", "error"],
+        field_type="combo",
+        help_text="Logging level for OHDSI libraries",
+        group="logging"
+    ))
+    
+    # Database Settings
+    webapi.add_field(ConfigField(
+        "WEBAPI_DATASOURCE_URL",
+        "Database URL",
+        default_value="jdbc:postgresql://broadsea-atlasdb:5432/postgres",
+        help_text="Keep as-is if using Broadsea to launch WebAPI postgres, replace if using external instance",
+        group="database"
+    ))
+    webapi.add_field(ConfigField(
+        "WEBAPI_DATASOURCE_USERNAME",
+        "Database Username",
+        default_value="postgres",
+        group="database"
+    ))
+    webapi.add_field(ConfigField(
+        "WEBAPI_DATASOURCE_PASSWORD_FILE",
+        "Database Password File",
+        default_value="./secrets/webapi/WEBAPI_DATASOURCE_PASSWORD",
+        field_type="file",
+        help_text="Path to file containing database password",
+        group="database"
+    ))
+    sections.append(webapi)
+
+    # Security Configuration
+    security = ConfigSection(
+        "Security",
+        "Security Configuration",
+        "Configure authentication and authorization settings"
+    )
+    security.add_group("provider", "Security Provider")
+    security.add_group("db", "Database Authentication")
+    security.add_group("ldap", "LDAP Authentication")
+    
+    # Provider Settings
+    security.add_field(ConfigField(
+        "ATLAS_SECURITY_PROVIDER_TYPE",
+        "Security Provider Type",
+        default_value="none",
+        options=["none", "ad", "ldap", "kerberos", "openid", "cas", "oauth", "iap", "db"],
+        field_type="combo",
+        help_text="Type of security provider to use",
+        group="provider"
+    ))
+    security.add_field(ConfigField(
+        "ATLAS_SECURITY_PROVIDER_NAME",
+        "Provider Display Name",
+        default_value="none",
+        help_text="What to call the provider in the Atlas GUI",
+        group="provider"
+    ))
+    
+    # Database Auth Settings
+    security.add_field(ConfigField(
+        "SECURITY_AUTH_JDBC_ENABLED",
+        "Enable Database Authentication",
+        default_value="false",
+        field_type="checkbox",
+        group="db"
+    ))
+    security.add_field(ConfigField(
+        "SECURITY_DB_DATASOURCE_SCHEMA",
+        "Security Database Schema",
+        default_value="webapi_security",
+        depends_on={"SECURITY_AUTH_JDBC_ENABLED": "true"},
+        group="db"
+    ))
+    
+    # LDAP Settings
+    security.add_field(ConfigField(
+        "SECURITY_AUTH_LDAP_ENABLED",
+        "Enable LDAP Authentication",
+        default_value="false",
+        field_type="checkbox",
+        group="ldap"
+    ))
+    security.add_field(ConfigField(
+        "SECURITY_LDAP_URL",
+        "LDAP Server URL",
+        default_value="ldap://broadsea-openldap:1389",
+        depends_on={"SECURITY_AUTH_LDAP_ENABLED": "true"},
+        group="ldap"
+    ))
+    sections.append(security)
+
+    # Data Source Configuration
+    datasource = ConfigSection(
+        "DataSource",
+        "Data Source Configuration",
+        "Configure database connections for OMOP CDM"
+    )
+    datasource.add_group("connection", "Database Connection")
+    datasource.add_group("vocab", "Vocabulary Settings")
+    
+    # Connection Settings
+    datasource.add_field(ConfigField(
+        "CDM_CONNECTIONDETAILS_DBMS",
+        "Database Type",
+        default_value="postgresql",
+        options=["postgresql", "sql server", "oracle", "redshift"],
+        field_type="combo",
+        group="connection"
+    ))
+    datasource.add_field(ConfigField(
+        "CDM_CONNECTIONDETAILS_SERVER",
+        "Database Server",
+        default_value="broadsea-atlasdb/postgres",
+        group="connection"
+    ))
+    datasource.add_field(ConfigField(
+        "CDM_CONNECTIONDETAILS_USER",
+        "Database Username",
+        default_value="postgres",
+        group="connection"
+    ))
+    datasource.add_field(ConfigField(
+        "CDM_CONNECTIONDETAILS_PASSWORD_FILE",
+        "Database Password File",
+        default_value="./secrets/postprocessing/CDM_CONNECTIONDETAILS_PASSWORD",
+        field_type="file",
+        group="connection"
+    ))
+    
+    # Vocabulary Settings
+    datasource.add_field(ConfigField(
+        "VOCAB_DATABASE_SCHEMA",
+        "Vocabulary Schema",
+        default_value="demo_cdm",
+        group="vocab"
+    ))
+    sections.append(datasource)
+
+    # Build Configuration
+    build = ConfigSection(
+        "Build",
+        "Build Configuration",
+        "Configure building Atlas and WebAPI from Git"
+    )
+    build.add_group("atlas", "Atlas Build")
+    build.add_group("webapi", "WebAPI Build")
+    
+    # Atlas Build Settings
+    build.add_field(ConfigField(
+        "ATLAS_GITHUB_URL",
+        "Atlas Git URL",
+        default_value="https://github.com/OHDSI/Atlas.git#1297c137669f21babace1906f23c3a9d70a9da19",
+        help_text="Git URL with commit hash for building Atlas from source",
+        group="atlas"
+    ))
+    
+    # WebAPI Build Settings
+    build.add_field(ConfigField(
+        "WEBAPI_GITHUB_URL",
+        "WebAPI Git URL",
+        default_value="https://github.com/OHDSI/WebAPI.git#rc-2.13.0",
+        help_text="Git URL with commit hash for building WebAPI from source",
+        group="webapi"
+    ))
+    build.add_field(ConfigField(
+        "WEBAPI_MAVEN_PROFILE",
+        "Maven Profile",
+        default_value="webapi-docker",
+        help_text="Set to webapi-docker,webapi-solr if you want to enable SOLR Vocab search",
+        group="webapi"
+    ))
+    sections.append(build)
+
+    # SOLR Vocab Configuration
+    solr = ConfigSection(
+        "SOLR",
+        "SOLR Vocabulary Configuration",
+        "Configure SOLR OMOP Vocabulary search (optional)"
+    )
+    solr.add_group("endpoint", "SOLR Endpoint")
+    solr.add_group("vocab", "Vocabulary Settings")
+    
+    # Endpoint Settings
+    solr.add_field(ConfigField(
+        "SOLR_VOCAB_ENDPOINT",
+        "SOLR Endpoint URL",
+        default_value="",
+        required=False,
+        help_text="Keep blank if not using Solr Vocab, use http://broadsea-solr-vocab:8983/solr if using Broadsea SOLR",
+        group="endpoint"
+    ))
+    
+    # Vocabulary Settings
+    solr.add_field(ConfigField(
+        "SOLR_VOCAB_VERSION",
+        "Vocabulary Version",
+        default_value="v5.0_23-JAN-23",
+        help_text="Replace spaces with underscores",
+        depends_on={"SOLR_VOCAB_ENDPOINT": NotEmpty()},
+        group="vocab"
+    ))
+    solr.add_field(ConfigField(
+        "SOLR_VOCAB_DATABASE_SCHEMA",
+        "Vocabulary Schema",
+        default_value="vocab",
+        depends_on={"SOLR_VOCAB_ENDPOINT": NotEmpty()},
+        group="vocab"
+    ))
+    sections.append(solr)
+
+    # HADES Configuration
+    hades = ConfigSection(
+        "HADES",
+        "HADES Configuration",
+        "Configure HADES credentials for RStudio"
+    )
+    hades.add_group("auth", "Authentication")
+    
+    # Authentication Settings
+    hades.add_field(ConfigField(
+        "HADES_USER",
+        "HADES Username",
+        default_value="ohdsi",
+        group="auth"
+    ))
+    hades.add_field(ConfigField(
+        "HADES_PASSWORD_FILE",
+        "Password File",
+        default_value="./secrets/hades/HADES_PASSWORD",
+        field_type="file",
+        help_text="Path to file containing HADES password",
+        group="auth"
+    ))
+    sections.append(hades)
+
+    # Postgres and UMLS Configuration
+    vocab = ConfigSection(
+        "VocabDB",
+        "Vocabulary Database Configuration",
+        "Configure Postgres and UMLS credentials for loading OMOP Vocab files"
+    )
+    vocab.add_group("postgres", "Postgres Settings")
+    vocab.add_group("umls", "UMLS Settings")
+    
+    # Postgres Settings
+    vocab.add_field(ConfigField(
+        "VOCAB_PG_HOST",
+        "Database Host",
+        default_value="broadsea-atlasdb",
+        help_text="Host name without database name",
+        group="postgres"
+    ))
+    vocab.add_field(ConfigField(
+        "VOCAB_PG_DATABASE",
+        "Database Name",
+        default_value="postgres",
+        group="postgres"
+    ))
+    vocab.add_field(ConfigField(
+        "VOCAB_PG_SCHEMA",
+        "Schema Name",
+        default_value="omop_vocab",
+        group="postgres"
+    ))
+    vocab.add_field(ConfigField(
+        "VOCAB_PG_USER",
+        "Username",
+        default_value="postgres",
+        group="postgres"
+    ))
+    vocab.add_field(ConfigField(
+        "VOCAB_PG_PASSWORD_FILE",
+        "Password File",
+        default_value="./secrets/omop_vocab/VOCAB_PG_PASSWORD",
+        field_type="file",
+        group="postgres"
+    ))
+    vocab.add_field(ConfigField(
+        "VOCAB_PG_FILES_PATH",
+        "Vocabulary Files Path",
+        default_value="./omop_vocab/files",
+        help_text="Folder path with vocab files from Athena",
+        field_type="file",
+        group="postgres"
+    ))
+    
+    # UMLS Settings
+    vocab.add_field(ConfigField(
+        "UMLS_API_KEY_FILE",
+        "UMLS API Key File",
+        default_value="./secrets/omop_vocab/UMLS_API_KEY",
+        help_text="API KEY from UMLS account profile if CPT4 conversion needed",
+        field_type="file",
+        required=False,
+        group="umls"
+    ))
+    sections.append(vocab)
+
+    # Phoebe Configuration
+    phoebe = ConfigSection(
+        "Phoebe",
+        "Phoebe Configuration",
+        "Configure Postgres credentials for loading Phoebe file for Atlas Concept Recommendations"
+    )
+    phoebe.add_group("database", "Database Settings")
+    
+    # Database Settings
+    phoebe.add_field(ConfigField(
+        "PHOEBE_PG_HOST",
+        "Database Host",
+        default_value="broadsea-atlasdb",
+        help_text="Host name without database name",
+        group="database"
+    ))
+    phoebe.add_field(ConfigField(
+        "PHOEBE_PG_DATABASE",
+        "Database Name",
+        default_value="postgres",
+        group="database"
+    ))
+    phoebe.add_field(ConfigField(
+        "PHOEBE_PG_SCHEMA",
+        "Schema Name",
+        default_value="omop_vocab",
+        help_text="Should be an existing OMOP Vocabulary schema",
+        group="database"
+    ))
+    phoebe.add_field(ConfigField(
+        "PHOEBE_PG_USER",
+        "Username",
+        default_value="postgres",
+        group="database"
+    ))
+    phoebe.add_field(ConfigField(
+        "PHOEBE_PG_PASSWORD_FILE",
+        "Password File",
+        default_value="./secrets/phoebe/PHOEBE_PG_PASSWORD",
+        field_type="file",
+        group="database"
+    ))
+    sections.append(phoebe)
+
+    # Ares Configuration
+    ares = ConfigSection(
+        "Ares",
+        "Ares Configuration",
+        "Configure Ares Data Folder"
+    )
+    ares.add_group("data", "Data Settings")
+    
+    # Data Settings
+    ares.add_field(ConfigField(
+        "ARES_DATA_FOLDER",
+        "Data Folder Path",
+        default_value="cdm-postprocessing-data",
+        help_text="Path to the Ares data folder on your host",
+        group="data"
+    ))
+    sections.append(ares)
+
+    # Content Page Configuration
+    content = ConfigSection(
+        "Content",
+        "Content Page Configuration",
+        "Configure Broadsea Content Page settings"
+    )
+    content.add_group("basic", "Basic Settings")
+    content.add_group("display", "Display Settings")
+    
+    # Basic Settings
+    content.add_field(ConfigField(
+        "CONTENT_TITLE",
+        "Page Title",
+        default_value="Broadsea 3.5 Applications",
+        help_text="Can change this title to something for your organization",
+        group="basic"
+    ))
+    
+    # Display Settings
+    for app in ["ARES", "ATLAS", "HADES", "OPENSHINYSERVER", "PGADMIN4", "POSITCONNECT", "PERSEUS"]:
+        content.add_field(ConfigField(
+            f"CONTENT_{app}_DISPLAY",
+            f"Show {app}",
+            default_value="show" if app not in ["POSITCONNECT", "PERSEUS"] else "none",
+            options=["show", "none"],
+            field_type="combo",
+            help_text=f"{'Requires commercial license' if app == 'POSITCONNECT' else ''}",
+            group="display"
+        ))
+    sections.append(content)
+
+    # OpenLDAP Configuration
+    ldap = ConfigSection(
+        "OpenLDAP",
+        "OpenLDAP Configuration",
+        "Configure OpenLDAP for testing Atlas with security"
+    )
+    ldap.add_group("auth", "Authentication")
+    
+    # Authentication Settings
+    ldap.add_field(ConfigField(
+        "OPENLDAP_USERS",
+        "LDAP Users",
+        default_value="user1",
+        help_text="Comma separated list of users",
+        group="auth"
+    ))
+    ldap.add_field(ConfigField(
+        "OPENLDAP_ADMIN_PASSWORD_FILE",
+        "Admin Password File",
+        default_value="./secrets/openldap/OPENLDAP_ADMIN_PASSWORD",
+        field_type="file",
+        group="auth"
+    ))
+    ldap.add_field(ConfigField(
+        "OPENLDAP_ACCOUNT_PASSWORDS_FILE",
+        "Account Passwords File",
+        default_value="./secrets/openldap/OPENLDAP_ACCOUNT_PASSWORDS",
+        field_type="file",
+        group="auth"
+    ))
+    sections.append(ldap)
+
+    # Shiny Server Configuration
+    shiny = ConfigSection(
+        "ShinyServer",
+        "Open Shiny Server Configuration",
+        "Configure open-source Shiny Server"
+    )
+    shiny.add_group("basic", "Basic Settings")
+    
+    # Basic Settings
+    shiny.add_field(ConfigField(
+        "OPEN_SHINY_SERVER_APP_ROOT",
+        "App Root Directory",
+        default_value="./shiny_server",
+        help_text="Root folder containing Shiny apps",
+        field_type="file",
+        group="basic"
+    ))
+    sections.append(shiny)
+
+    # Posit Connect Configuration
+    posit = ConfigSection(
+        "PositConnect",
+        "Posit Connect Configuration",
+        "Configure Posit Connect (requires commercial license)"
+    )
+    posit.add_group("license", "License Settings")
+    posit.add_group("config", "Configuration Settings")
+    
+    # License Settings
+    posit.add_field(ConfigField(
+        "POSIT_CONNECT_LICENSE_SERVER",
+        "License Server URL",
+        default_value="",
+        required=False,
+        help_text="Server URL that hosts the license",
+        group="license"
+    ))
+    posit.add_field(ConfigField(
+        "POSIT_CONNECT_LICENSE_FILE",
+        "License File",
+        default_value="./posit_connect/posit_license.lic",
+        field_type="file",
+        help_text="Path to license file",
+        group="license"
+    ))
+    
+    # Configuration Settings
+    posit.add_field(ConfigField(
+        "POSIT_CONNECT_GCFG_FILE",
+        "Global Config File",
+        default_value="./posit_connect/rstudio-connect.gcfg",
+        field_type="file",
+        help_text="Global configuration file for Posit Connect",
+        group="config"
+    ))
+    posit.add_field(ConfigField(
+        "POSIT_CONNECT_R_VERSION",
+        "R Version",
+        default_value="4.2.3",
+        help_text="R version to use (versions listed at https://cdn.posit.co/r/versions.json)",
+        group="config"
+    ))
+    sections.append(posit)
+
+    # Perseus Configuration
+    perseus = ConfigSection(
+        "Perseus",
+        "Perseus Configuration",
+        "Configure Perseus for ETL design and execution"
+    )
+    perseus.add_group("email", "Email Settings")
+    perseus.add_group("security", "Security Settings")
+    perseus.add_group("vocab", "Vocabulary Settings")
+    
+    # Email Settings
+    perseus.add_field(ConfigField(
+        "PERSEUS_SMTP_SERVER",
+        "SMTP Server",
+        default_value="",
+        required=False,
+        group="email"
+    ))
+    perseus.add_field(ConfigField(
+        "PERSEUS_SMTP_PORT",
+        "SMTP Port",
+        default_value="",
+        required=False,
+        rules=(Port(allow_empty=True),),
+        group="email"
+    ))
+    
+    # Security Settings
+    perseus.add_field(ConfigField(
+        "PERSEUS_TOKEN_SECRET_KEY",
+        "Token Secret Key",
+        default_value="Perseus-Arcad!a",
+        group="security"
+    ))
+    perseus.add_field(ConfigField(
+        "PERSEUS_EMAIL_SECRET_KEY",
+        "Email Secret Key",
+        default_value="8cmuh4t5xTtR1EHaojWL0aqCR3vZ48PZF5AYkTe0iqo=",
+        group="security"
+    ))
+    
+    # Vocabulary Settings
+    perseus.add_field(ConfigField(
+        "PERSEUS_VOCAB_FILES_PATH",
+        "Vocabulary Files Path",
+        default_value="./omop_vocab/files",
+        field_type="file",
+        group="vocab"
+    ))
+    sections.append(perseus)
+
+    # Post-Processing Configuration
+    postproc = ConfigSection(
+        "PostProcessing",
+        "Post-Processing Configuration",
+        "Configure CDM post-processing tools (Achilles, DQD, AresIndexer)"
+    )
+    postproc.add_group("achilles", "Achilles Settings")
+    postproc.add_group("dqd", "Data Quality Dashboard Settings")
+    postproc.add_group("ares", "Ares Indexer Settings")
+    
+    # Achilles Settings
+    postproc.add_field(ConfigField(
+        "ACHILLES_CREATE_TABLE",
+        "Create Tables",
+        default_value="true",
+        field_type="checkbox",
+        group="achilles"
+    ))
+    postproc.add_field(ConfigField(
+        "ACHILLES_SMALL_CELL_COUNT",
+        "Small Cell Count",
+        default_value="0",
+        rules=(Range(minimum=0),),
+        group="achilles"
+    ))
+    
+    # DQD Settings
+    postproc.add_field(ConfigField(
+        "DQD_NUM_THREADS",
+        "Number of Threads",
+        default_value="2",
+        rules=(Range(minimum=1),),
+        group="dqd"
+    ))
+    postproc.add_field(ConfigField(
+        "DQD_WRITE_TO_TABLE",
+        "Write to Table",
+        default_value="TRUE",
+        field_type="checkbox",
+        group="dqd"
+    ))
+    
+    # Ares Settings
+    postproc.add_field(ConfigField(
+        "ARES_RUN_NETWORK",
+        "Run Network Analysis",
+        default_value="FALSE",
+        field_type="checkbox",
+        help_text="Should the full Ares network analysis be run?",
+        group="ares"
+    ))
+    sections.append(postproc)
+
+    # pgAdmin Configuration
+    pgadmin = ConfigSection(
+        "pgAdmin",
+        "pgAdmin Configuration",
+        "Configure pgAdmin4 settings"
+    )
+    pgadmin.add_group("auth", "Authentication")
+    
+    # Authentication Settings
+    pgadmin.add_field(ConfigField(
+        "PGADMIN_ADMIN_USER",
+        "Admin Email",
+        default_value="user@domain.com",
+        rules=(Email(),),
+        group="auth"
+    ))
+    pgadmin.add_field(ConfigField(
+        "PGADMIN_DEFAULT_PASSWORD_FILE",
+        "Password File",
+        default_value="./secrets/pgadmin4/PGADMIN_DEFAULT_PASSWORD",
+        field_type="file",
+        group="auth"
+    ))
+    sections.append(pgadmin)
+
+    return sections
+
+class SchemaRegistry:
+    """Lookup tables over a list of sections for fast key and section access"""
+
+    def __init__(self, sections: List[ConfigSection]):
+        self.sections = sections
+        self._sections: Dict[str, ConfigSection] = {section.name: section for section in sections}
+        self._fields: Dict[str, ConfigField] = {}
+        for section in sections:
+            for field in section.fields:
+                self._fields[field.name] = field
+
+    def section(self, name: str) -> Optional[ConfigSection]:
+        return self._sections.get(name)
+
+    def field(self, key: str) -> Optional[ConfigField]:
+        return self._fields.get(key)
+
+    def section_of(self, key: str) -> Optional[str]:
+        field = self._fields.get(key)
+        return field.section if field else None
+
+    def keys(self) -> List[str]:
+        return list(self._fields)
+
+    def defaults(self) -> Dict[str, Dict[str, str]]:
+        """Default values grouped by section"""
+        return {
+            section.name: {field.name: field.default_value for field in section.fields}
+            for section in self.sections
+        }
+
+_default_registry: Optional[SchemaRegistry] = None
+
+def get_registry() -> SchemaRegistry:
+    """Return the shared registry built from create_sections()"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = SchemaRegistry(create_sections())
+    return _default_registry
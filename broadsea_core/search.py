@@ -0,0 +1,99 @@
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set, Tuple
+
+from broadsea_core.schema import ConfigSection
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Score given to a field for a token found in each of its attributes
+NAME_WEIGHT = 4
+TEXT_WEIGHT = 2
+GROUP_WEIGHT = 1
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _deletions(token: str) -> Set[str]:
+    """Every string obtained by deleting one character from token"""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+@dataclass(frozen=True)
+class SearchHit:
+    section: str
+    field: str
+    score: float
+
+class FieldSearchIndex:
+    """Inverted index over field names, descriptions, help texts and group titles"""
+
+    def __init__(self, sections: Iterable[ConfigSection]):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.section_of: Dict[str, str] = {}
+        for section in sections:
+            for field in section.fields:
+                self.section_of[field.name] = section.name
+                self._add(field.name, tokenize(field.name), NAME_WEIGHT)
+                self._add(field.name, tokenize(field.description), TEXT_WEIGHT)
+                self._add(field.name, tokenize(field.help_text), TEXT_WEIGHT)
+                self._add(field.name, tokenize(section.groups.get(field.group, "")), GROUP_WEIGHT)
+                self._add(field.name, tokenize(section.title), GROUP_WEIGHT)
+
+        # Sorted vocabulary for prefix lookups and a one-deletion map for typos
+        self.tokens: List[str] = sorted(self.postings)
+        self.deletions: Dict[str, Set[str]] = {}
+        for token in self.tokens:
+            if len(token) > 3:
+                for variant in _deletions(token) | {token}:
+                    self.deletions.setdefault(variant, set()).add(token)
+
+    def _add(self, field_name: str, tokens: List[str], weight: int):
+        for token in tokens:
+            postings = self.postings.setdefault(token, {})
+            postings[field_name] = max(postings.get(field_name, 0), weight)
+
+    def _prefix_matches(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self.tokens, prefix)
+        end = bisect.bisect_right(self.tokens, prefix + "\uffff")
+        return self.tokens[start:end]
+
+    def _fuzzy_matches(self, token: str) -> Set[str]:
+        """Vocabulary tokens within one insertion, deletion or substitution"""
+        if len(token) <= 3:
+            return set()
+        matches = set()
+        for variant in _deletions(token) | {token}:
+            matches |= self.deletions.get(variant, set())
+        return matches
+
+    def _match_token(self, token: str) -> Dict[str, float]:
+        """Field scores for one query token, preferring exact over prefix over fuzzy"""
+        scores: Dict[str, float] = {}
+        for candidate, factor in self._candidates(token):
+            for field_name, weight in self.postings[candidate].items():
+                scores[field_name] = max(scores.get(field_name, 0), weight * factor)
+        return scores
+
+    def _candidates(self, token: str) -> List[Tuple[str, float]]:
+        candidates = []
+        if token in self.postings:
+            candidates.append((token, 1.0))
+        candidates.extend((match, 0.75) for match in self._prefix_matches(token) if match != token)
+        if not candidates:
+            candidates.extend((match, 0.5) for match in self._fuzzy_matches(token))
+        return candidates
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Fields matching every token of the query, best first"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        totals = self._match_token(tokens[0])
+        for token in tokens[1:]:
+            scores = self._match_token(token)
+            totals = {name: total + scores[name] for name, total in totals.items() if name in scores}
+            if not totals:
+                return []
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [SearchHit(self.section_of[name], name, score) for name, score in ranked]
@@ -0,0 +1,192 @@
+import hashlib
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from broadsea_core.envfile import ENCODING, ERRORS
+
+SectionItems = Tuple[Tuple[str, str], ...]
+
+def section_digest(items: SectionItems) -> str:
+    """Content digest of one section's key/value pairs"""
+    digest = hashlib.sha256()
+    for key, value in items:
+        # Values keep undecodable bytes of the file as surrogates
+        digest.update(key.encode(ENCODING, ERRORS))
+        digest.update(b"=")
+        digest.update(value.encode(ENCODING, ERRORS))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+class ConfigSnapshot:
+    """Immutable, hashable view of every section's values at one point in time"""
+
+    __slots__ = ("_items", "_sections", "_flat", "_hash")
+
+    def __init__(self, items: Tuple[Tuple[str, SectionItems], ...]):
+        self._items = items
+        self._sections: Dict[str, Mapping[str, str]] = {}
+        self._flat = None
+        self._hash = None
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(self._items)
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ConfigSnapshot):
+            return NotImplemented
+        return self is other or self._items == other._items
+
+    def __contains__(self, section: str) -> bool:
+        return any(name == section for name, _ in self._items)
+
+    def __iter__(self):
+        return (name for name, _ in self._items)
+
+    @property
+    def items(self) -> Tuple[Tuple[str, SectionItems], ...]:
+        return self._items
+
+    def get(self, section: str, key: str, default: str = "") -> str:
+        return self.section(section).get(key, default)
+
+    def section(self, section: str) -> Mapping[str, str]:
+        """Read-only mapping of one section's values"""
+        # Built on first access so taking a snapshot stays cheap
+        if section not in self._sections:
+            self._sections[section] = MappingProxyType(dict(self.section_items(section)))
+        return self._sections[section]
+
+    def section_items(self, section: str) -> SectionItems:
+        for name, values in self._items:
+            if name == section:
+                return values
+        return ()
+
+    def flat(self) -> Mapping[str, str]:
+        """Read-only mapping of all values keyed by name only"""
+        if self._flat is None:
+            flat = {}
+            for _, values in self._items:
+                flat.update(values)
+            self._flat = MappingProxyType(flat)
+        return self._flat
+
+    def to_config(self) -> Dict[str, Dict[str, str]]:
+        """Mutable copy of all values grouped by section"""
+        return {name: dict(values) for name, values in self._items}
+
+Listener = Callable[[str, str, str], None]
+
+class ConfigStore:
+    """Configuration values held per section and key, independent of any widgets"""
+
+    def __init__(self, config: Optional[Mapping[str, Mapping[str, str]]] = None):
+        self._values: Dict[str, Dict[str, str]] = {}
+        self._frozen: Dict[str, SectionItems] = {}
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._listeners: List[Listener] = []
+        # Digests recorded by mark_clean() and sections edited since then
+        self._clean_digests: Dict[str, str] = {}
+        self._clean: Optional[ConfigSnapshot] = None
+        self._dirty: Set[str] = set()
+        if config:
+            self.load(config)
+
+    @classmethod
+    def from_registry(cls, registry) -> "ConfigStore":
+        """Create a store seeded with the schema defaults"""
+        return cls(registry.defaults())
+
+    def subscribe(self, listener: Listener):
+        """Call listener(section, key, value) whenever a value changes"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def load(self, config: Mapping[str, Mapping[str, str]]):
+        """Set the values of every section present in config"""
+        for section, values in config.items():
+            self._values.setdefault(section, {})
+            self._invalidate(section)
+            for key, value in values.items():
+                self.set(section, key, value)
+
+    def get(self, section: str, key: str, default: str = "") -> str:
+        return self._values.get(section, {}).get(key, default)
+
+    def set(self, section: str, key: str, value: str):
+        values = self._values.setdefault(section, {})
+        if key in values and values[key] == value:
+            return
+        values[key] = value
+        self._invalidate(section)
+        for listener in list(self._listeners):
+            listener(section, key, value)
+
+    def _invalidate(self, section: str):
+        self._frozen.pop(section, None)
+        self._snapshot = None
+        self._dirty.add(section)
+
+    def mark_clean(self):
+        """Record the current content as saved, e.g. after a load or save"""
+        snapshot = self.snapshot()
+        self._clean = snapshot
+        self._clean_digests = {
+            section: section_digest(items) for section, items in snapshot.items
+        }
+        self._dirty.clear()
+
+    def changed_sections(self) -> List[str]:
+        """Sections whose content differs from the last mark_clean()"""
+        if not self._dirty:
+            return []
+        snapshot = self.snapshot()
+        changed = []
+        for section in list(self._dirty):
+            if section_digest(snapshot.section_items(section)) == self._clean_digests.get(section):
+                # Edited back to the saved content
+                self._dirty.discard(section)
+            else:
+                changed.append(section)
+        return [section for section in snapshot if section in changed]
+
+    def clean_snapshot(self) -> ConfigSnapshot:
+        """Values as of the last mark_clean(), or empty if never marked"""
+        return self._clean if self._clean is not None else ConfigSnapshot(())
+
+    def has_changes(self) -> bool:
+        return bool(self.changed_sections())
+
+    def section(self, section: str) -> Dict[str, str]:
+        """Return a copy of one section's values"""
+        return dict(self._values.get(section, {}))
+
+    def sections(self) -> List[str]:
+        return list(self._values)
+
+    def snapshot(self) -> ConfigSnapshot:
+        """Return an immutable snapshot, reusing it while nothing has changed"""
+        # Only sections edited since the last snapshot are re-frozen
+        if self._snapshot is None:
+            items = []
+            for section, values in self._values.items():
+                frozen = self._frozen.get(section)
+                if frozen is None:
+                    frozen = tuple(values.items())
+                    self._frozen[section] = frozen
+                items.append((section, frozen))
+            self._snapshot = ConfigSnapshot(tuple(items))
+        return self._snapshot
+
+    def to_config(self) -> Dict[str, Dict[str, str]]:
+        """Return a copy of all values grouped by section"""
+        return self.snapshot().to_config()
+
+    def flat(self) -> Dict[str, str]:
+        """Return all values keyed by name only"""
+        return dict(self.snapshot().flat())
@@ -0,0 +1,243 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from broadsea_core.rules import (
+    Bool, CompiledRules, Email, Enum, Json, Port, Range, Regex, Required, RequiredIf, Rule
+)
+from broadsea_core.dependencies import DependencyGraph
+from broadsea_core.interpolate import resolve_values
+from broadsea_core.schema import ConfigField, ConfigSection
+
+def field_rules(field: ConfigField) -> Tuple[Rule, ...]:
+    """Declarative rules for a schema field, including those implied by its type"""
+    rules: Tuple[Rule, ...] = ()
+    if field.required:
+        rules += (Required(),)
+    rules += tuple(field.rules)
+    if field.field_type == "combo" and field.options:
+        rules += (Enum(values=tuple(field.options), case_sensitive=True, allow_empty=not field.required),)
+    return rules
+
+def compile_sections(sections: List[ConfigSection]) -> CompiledRules:
+    """Compile the rules of every field in a schema"""
+    return CompiledRules(
+        (field.name, field_rules(field)) for section in sections for field in section.fields
+    )
+
+def validate_field(field: ConfigField, value: str) -> Optional[str]:
+    """Validate a field value"""
+    for rule in field_rules(field):
+        if error := rule.check(field.name, value, {field.name: value}):
+            return error
+    return check_validation_func(field, value)
+
+def check_validation_func(field: ConfigField, value: str) -> Optional[str]:
+    """Run an ad-hoc validation_func, kept for fields not expressed as rules"""
+    if field.validation_func:
+        try:
+            if not field.validation_func(value):
+                return f"{field.name} validation failed"
+        except Exception as e:
+            return f"{field.name} validation error: {str(e)}"
+
+    return None
+
+def config_issues(sections: List[ConfigSection], values: Mapping[str, str],
+                  compiled: Optional[CompiledRules] = None) -> List[Tuple[ConfigSection, str, str]]:
+    """(section, key, message) for every issue of the active fields
+
+    ${KEY} references are resolved first, so rules see the literal values.
+    """
+    compiled = compiled or compile_sections(sections)
+    values, interpolation_errors = resolve_values(values)
+    active = DependencyGraph(sections).evaluate(values)
+    issues = []
+    for section in sections:
+        for field in section.fields:
+            if not active.get(field.name, True):
+                continue
+            if field.name in interpolation_errors:
+                issues.append((section, field.name, interpolation_errors[field.name]))
+                continue
+            errors = compiled.check(field.name, values)
+            if not errors and (error := check_validation_func(field, values.get(field.name, ""))):
+                errors = [error]
+            issues.extend((section, field.name, error) for error in errors)
+    return issues
+
+def validate_config(sections: List[ConfigSection], values: Mapping[str, str],
+                    compiled: Optional[CompiledRules] = None) -> List[str]:
+    """Validate active fields of every section against a flat key/value mapping"""
+    return [f"{section.title}: {error}" for section, _, error in config_issues(sections, values, compiled)]
+
+class ValidationCache:
+    """Per-field validation results reused until the field or its dependencies change"""
+
+    # Values longer than this are validated off the GUI thread
+    LARGE_VALUE = 4096
+
+    def __init__(self, sections: List[ConfigSection]):
+        self.compiled = compile_sections(sections)
+        self.graph = DependencyGraph(sections)
+        self.fields: Dict[str, ConfigField] = {}
+        self.titles: Dict[str, str] = {}
+        self.dependents: Dict[str, List[str]] = {
+            key: list(dependents) for key, dependents in self.compiled.dependents.items()
+        }
+        for section in sections:
+            for field in section.fields:
+                self.fields[field.name] = field
+                self.titles[field.name] = section.title
+                for dep_field in self.graph.ancestors(field.name):
+                    self.dependents.setdefault(dep_field, []).append(field.name)
+        self._results: Dict[str, Tuple[Tuple[str, ...], Optional[str]]] = {}
+
+    def affected(self, field_name: str) -> List[str]:
+        """The edited field followed by every field that depends on it"""
+        affected = [field_name]
+        seen = {field_name}
+        for name in affected:
+            for dependent in self.dependents.get(name, []):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    affected.append(dependent)
+        return affected
+
+    def is_expensive(self, field_name: str, value: str) -> bool:
+        field = self.fields.get(field_name)
+        return (field is not None and field.field_type == "file") or \
+            self.compiled.is_expensive(field_name) or len(value) > self.LARGE_VALUE
+
+    def _inputs(self, field: ConfigField, values: Mapping[str, str]) -> Tuple[str, ...]:
+        return tuple(values.get(key, "") for key in self.compiled.inputs(field.name)) + tuple(
+            values.get(dep_field, "") for dep_field in self.graph.ancestors(field.name)
+        )
+
+    def cached(self, field_name: str, values: Mapping[str, str]) -> Tuple[bool, Optional[str]]:
+        """Return (hit, error) without validating"""
+        field = self.fields.get(field_name)
+        result = self._results.get(field_name)
+        if field is None:
+            return True, None
+        if result is not None and result[0] == self._inputs(field, values):
+            return True, result[1]
+        return False, None
+
+    def validate(self, field_name: str, values: Mapping[str, str]) -> Optional[str]:
+        """Validate one field, reusing the previous result if its inputs are unchanged"""
+        hit, error = self.cached(field_name, values)
+        if hit:
+            return error
+        field = self.fields[field_name]
+        inputs = self._inputs(field, values)
+        error = None
+        if self.graph.is_active(field_name, values):
+            issues = self.compiled.check(field_name, values)
+            error = issues[0] if issues else check_validation_func(field, inputs[0])
+        self._results[field_name] = (inputs, error)
+        return error
+
+    def validate_all(self, values: Mapping[str, str], errors: Optional[Mapping[str, str]] = None) -> List[str]:
+        """Issues of every active field; errors, e.g. failed ${KEY} references, replace a key's rules"""
+        errors = errors or {}
+        issues = []
+        for name in self.fields:
+            if name in errors:
+                error = errors[name] if self.graph.is_active(name, values) else None
+            else:
+                error = self.validate(name, values)
+            if error:
+                issues.append(f"{self.titles[name]}: {error}")
+        return issues
+
+# Rules for the tabbed editor sections, keyed by section name
+SECTION_RULES: Dict[str, List[Tuple[str, Tuple[Rule, ...]]]] = {
+    "Host": [
+        ("HOST_PORT", (Port(label="Port"),)),
+        ("HOST_PROTOCOL", (Enum(values=("http", "https"),
+                                message="Protocol must be either 'http' or 'https'"),)),
+    ],
+    "Atlas": [
+        ("ATLAS_PORT", (Port(),)),
+        ("ATLAS_DB_PORT", (Port(),)),
+        ("ATLAS_CONFIG", (Json(),)),
+    ],
+    "WebAPI": [
+        ("WEBAPI_PORT", (Port(),)),
+        ("WEBAPI_DB_PORT", (Port(),)),
+        ("WEBAPI_DATASOURCES_JSON", (Json(),)),
+        ("WEBAPI_CORS_ENABLED", (Bool(),)),
+        ("WEBAPI_SECURITY_ENABLED", (Bool(),)),
+    ],
+    "Security": [
+        ("SECURITY_DB_PORT", (Port(),)),
+        ("SECURITY_ENABLED", (Bool(),)),
+        ("SECURITY_SSL_ENABLED", (Bool(),)),
+        ("SECURITY_AUTH_PROVIDER", (Enum(values=("db", "oauth", "ldap")),)),
+        *[
+            (key, (RequiredIf(other="SECURITY_AUTH_PROVIDER", equals="oauth",
+                              message="{key} is required when using OAuth"),))
+            for key in ["SECURITY_OAUTH_CLIENT_ID", "SECURITY_OAUTH_CLIENT_SECRET",
+                        "SECURITY_OAUTH_CALLBACK_URL"]
+        ],
+        *[
+            (key, (RequiredIf(other="SECURITY_SSL_ENABLED", equals="true",
+                              message="{key} is required when SSL is enabled"),))
+            for key in ["SECURITY_SSL_KEYSTORE", "SECURITY_SSL_KEYSTORE_PASSWORD"]
+        ],
+    ],
+    "DataSource": [
+        ("DATASOURCE_DB_PORT", (Port(),)),
+        ("DATASOURCE_DIALECT", (Enum(values=("postgresql", "sql server", "oracle", "redshift", "bigquery")),)),
+        ("DATASOURCE_KEY", (Required(strip=True, message="{key} cannot be empty"),
+                            Regex(pattern=r"(?=\w*[^\W_])\w+$",
+                                  message="{key} must contain only letters, numbers, and underscores"))),
+        ("DATASOURCE_ADVANCED_OPTIONS", (Json(),)),
+        *[
+            (key, (Required(strip=True, message="{key} cannot be empty"),))
+            for key in ["DATASOURCE_NAME", "DATASOURCE_CDM_SCHEMA",
+                        "DATASOURCE_VOCAB_SCHEMA", "DATASOURCE_RESULTS_SCHEMA"]
+        ],
+    ],
+    "Build": [
+        ("BUILD_MODE", (Enum(values=("development", "production", "test")),)),
+        *[
+            (key, (Bool(),))
+            for key in ["BUILD_CLEAN", "BUILD_PARALLEL", "BUILD_SKIP_TESTS",
+                        "BUILD_SKIP_LINT", "BUILD_SKIP_DOCS"]
+        ],
+        ("BUILD_MAVEN_OPTS", (
+            Regex(pattern=r"-Xm[xs]", allow_empty=True, message="{key} must start with -Xmx or -Xms"),
+            Regex(pattern=r".*[gmk]$", allow_empty=True, message="{key} must end with g, m, or k"),
+        )),
+        ("BUILD_TARGET_DIR", (
+            Required(strip=True, message="{key} cannot be empty"),
+            Regex(pattern=r"(\.|/|~/)", message="{key} must be an absolute path or start with ./"),
+        )),
+    ],
+    "Monitoring": [
+        ("MONITORING_ENABLED", (Bool(),)),
+        ("MONITORING_PORT", (Port(),)),
+        ("MONITORING_INTERVAL", (Range(minimum=1, maximum=3600, unit="seconds"),)),
+        ("MONITORING_RETENTION_DAYS", (Range(minimum=1, maximum=365, unit="days"),)),
+        ("MONITORING_DISK_THRESHOLD", (Range(minimum=0, maximum=100, unit="percent"),)),
+        ("MONITORING_MEMORY_THRESHOLD", (Range(minimum=0, maximum=100, unit="percent"),)),
+        ("MONITORING_CPU_THRESHOLD", (Range(minimum=0, maximum=100, unit="percent"),)),
+        ("MONITORING_LOG_LEVEL", (Enum(values=("debug", "info", "warning", "error", "critical")),)),
+        ("MONITORING_ALERT_EMAIL", (Email(allow_empty=True),)),
+        ("MONITORING_ALERT_SLACK", (Regex(pattern=r"https://hooks\.slack\.com/", allow_empty=True,
+                                          message="{key} must be a valid Slack webhook URL"),)),
+    ],
+}
+
+_compiled_sections: Dict[str, CompiledRules] = {}
+
+def section_rules(section_name: str) -> Optional[CompiledRules]:
+    """Compiled rules for a tabbed editor section, built on first use"""
+    if section_name not in _compiled_sections and section_name in SECTION_RULES:
+        _compiled_sections[section_name] = CompiledRules(SECTION_RULES[section_name])
+    return _compiled_sections.get(section_name)
+
+def validate_section(section_name: str, config: Mapping[str, str]) -> List[Tuple[str, str]]:
+    """(key, message) for every issue of one tabbed editor section, by name"""
+    rules = section_rules(section_name)
+    return rules.key_issues(config) if rules else []
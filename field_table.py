@@ -0,0 +1,231 @@
+from typing import Dict, Optional
+from PyQt6.QtWidgets import (
+    QWidget, QHBoxLayout, QLineEdit, QComboBox, QToolButton, QFileDialog,
+    QTableView, QHeaderView, QAbstractItemView, QStyledItemDelegate
+)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor, QFont
+
+from broadsea_core.schema import ConfigField, ConfigSection
+from broadsea_core.store import ConfigStore
+
+ERROR_COLOR = QColor("#d9534f")
+PASSWORD_MASK = "•" * 8
+
+class FieldTableModel(QAbstractTableModel):
+    """Table model exposing one section's fields as rows backed by the value store"""
+
+    NAME_COLUMN = 0
+    VALUE_COLUMN = 1
+
+    def __init__(self, section: ConfigSection, store: ConfigStore, parent=None):
+        super().__init__(parent)
+        self.section = section
+        self.store = store
+        self.fields = list(section.fields)
+        self.rows: Dict[str, int] = {field.name: row for row, field in enumerate(self.fields)}
+        self.errors: Dict[str, Optional[str]] = {}
+        self.bold = QFont()
+        self.bold.setBold(True)
+        store.subscribe(self.on_store_changed)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.fields)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return ("Setting", "Value")[section]
+        return None
+
+    def field_at(self, row: int) -> ConfigField:
+        return self.fields[row]
+
+    def value_index(self, field_name: str) -> QModelIndex:
+        return self.index(self.rows[field_name], self.VALUE_COLUMN)
+
+    def value(self, field: ConfigField) -> str:
+        return self.store.get(self.section.name, field.name, field.default_value)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        field = self.fields[index.row()]
+        if index.column() == self.NAME_COLUMN:
+            return self.name_data(field, role)
+
+        value = self.value(field)
+        error = self.errors.get(field.name)
+        if role == Qt.ItemDataRole.DisplayRole:
+            if field.field_type == "checkbox":
+                return None
+            if field.field_type == "password" and value:
+                return PASSWORD_MASK
+            return value
+        if role == Qt.ItemDataRole.EditRole:
+            return value
+        if role == Qt.ItemDataRole.CheckStateRole and field.field_type == "checkbox":
+            return Qt.CheckState.Checked if value.lower() == "true" else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return error or field.placeholder or None
+        if role == Qt.ItemDataRole.ForegroundRole and error:
+            return ERROR_COLOR
+        return None
+
+    def name_data(self, field: ConfigField, role):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return field.name + " *" if field.required else field.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            group = self.section.groups.get(field.group)
+            parts = [group, field.description, field.help_text]
+            return "\n\n".join(part for part in parts if part) or None
+        if role == Qt.ItemDataRole.FontRole:
+            return self.bold
+        if role == Qt.ItemDataRole.ForegroundRole and self.errors.get(field.name):
+            return ERROR_COLOR
+        return None
+
+    def flags(self, index: QModelIndex):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.VALUE_COLUMN:
+            if self.fields[index.row()].field_type == "checkbox":
+                flags |= Qt.ItemFlag.ItemIsUserCheckable
+            else:
+                flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or index.column() != self.VALUE_COLUMN:
+            return False
+        field = self.fields[index.row()]
+        if role == Qt.ItemDataRole.CheckStateRole:
+            value = "true" if Qt.CheckState(value) == Qt.CheckState.Checked else "false"
+        elif role != Qt.ItemDataRole.EditRole:
+            return False
+        # The store listener emits dataChanged
+        self.store.set(self.section.name, field.name, str(value))
+        return True
+
+    def on_store_changed(self, section: str, key: str, value: str):
+        if section == self.section.name and key in self.rows:
+            index = self.value_index(key)
+            self.dataChanged.emit(index, index)
+
+    def set_error(self, field_name: str, error: Optional[str]):
+        if field_name not in self.rows or self.errors.get(field_name) == error:
+            return
+        self.errors[field_name] = error
+        row = self.rows[field_name]
+        self.dataChanged.emit(self.index(row, self.NAME_COLUMN), self.index(row, self.VALUE_COLUMN))
+
+class FileEditor(QWidget):
+    """Line edit with a browse button, used as the editor of file fields"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        self.line_edit = QLineEdit()
+        self.browse_btn = QToolButton()
+        self.browse_btn.setText("...")
+        layout.addWidget(self.line_edit)
+        layout.addWidget(self.browse_btn)
+        self.setFocusProxy(self.line_edit)
+        self.setAutoFillBackground(True)
+
+class FieldValueDelegate(QStyledItemDelegate):
+    """Create an editor matching the field type only for the cell being edited"""
+
+    def createEditor(self, parent, option, index):
+        field = index.model().field_at(index.row())
+        if field.field_type == "combo" and field.options:
+            editor = QComboBox(parent)
+            editor.addItems(field.options)
+            editor.activated.connect(lambda _: self.commitData.emit(editor))
+            return editor
+        if field.field_type == "file":
+            editor = FileEditor(parent)
+            editor.line_edit.setPlaceholderText(field.placeholder)
+            editor.browse_btn.clicked.connect(lambda: self.browse_file(editor, field.name))
+            return editor
+        editor = QLineEdit(parent)
+        editor.setPlaceholderText(field.placeholder)
+        if field.field_type == "password":
+            editor.setEchoMode(QLineEdit.EchoMode.Password)
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.EditRole) or ""
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(value)
+        elif isinstance(editor, FileEditor):
+            editor.line_edit.setText(value)
+        else:
+            editor.setText(value)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            value = editor.currentText()
+        elif isinstance(editor, FileEditor):
+            value = editor.line_edit.text()
+        else:
+            value = editor.text()
+        model.setData(index, value, Qt.ItemDataRole.EditRole)
+
+    def browse_file(self, editor: FileEditor, field_name: str):
+        filename, _ = QFileDialog.getOpenFileName(
+            editor,
+            f"Select {field_name}",
+            "",
+            "All Files (*.*)"
+        )
+        if filename:
+            editor.line_edit.setText(filename)
+            self.commitData.emit(editor)
+
+class FieldTableView(QTableView):
+    """Virtualized editor for large sections
+
+    Rows have a fixed height so the view only lays out and paints the rows in
+    the viewport, and an editor widget exists only for the cell being edited.
+    """
+
+    def __init__(self, model: FieldTableModel, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegateForColumn(FieldTableModel.VALUE_COLUMN, FieldValueDelegate(self))
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked
+            | QAbstractItemView.EditTrigger.SelectedClicked
+            | QAbstractItemView.EditTrigger.EditKeyPressed
+            | QAbstractItemView.EditTrigger.AnyKeyPressed
+        )
+        self.setWordWrap(False)
+        self.setAlternatingRowColors(True)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(FieldTableModel.NAME_COLUMN, QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        self.setColumnWidth(FieldTableModel.NAME_COLUMN, 280)
+
+    def field_model(self) -> FieldTableModel:
+        return self.model()
+
+    def set_field_visible(self, field_name: str, visible: bool):
+        row = self.field_model().rows.get(field_name)
+        if row is not None:
+            self.setRowHidden(row, not visible)
+
+    def focus_field(self, field_name: str):
+        if field_name not in self.field_model().rows:
+            return
+        index = self.field_model().value_index(field_name)
+        self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+        self.setCurrentIndex(index)
+        self.setFocus()
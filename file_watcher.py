@@ -0,0 +1,87 @@
+import os
+from typing import Dict, Iterable, Optional, Set, Tuple
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Size, modification time and inode of path, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+class FileWatcher(QObject):
+    """Debounce change notifications for a set of files
+
+    Directories holding the files are watched too, so a file replaced by
+    an editor's rename or deleted and created again is picked up. Paths
+    are only reported when their stat signature actually changed.
+    """
+
+    # Emitted with the absolute paths that changed during one burst of writes
+    filesChanged = pyqtSignal(list)
+
+    def __init__(self, delay_ms: int = 300, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        # Signature of every watched path as last reported
+        self.signatures: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self.pending: Set[str] = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def watch(self, paths: Iterable[str]):
+        """Watch exactly these files, keeping the signatures of those already watched"""
+        paths = {os.path.abspath(path) for path in paths}
+        self.signatures = {path: self.signatures.get(path, file_signature(path)) for path in paths}
+        directories = {os.path.dirname(path) for path in paths}
+        stale = [path for path in self.watcher.files() if path not in paths]
+        stale += [path for path in self.watcher.directories() if path not in directories]
+        if stale:
+            self.watcher.removePaths(stale)
+        self.pending &= paths
+        self._arm()
+
+    def _arm(self):
+        """Add files and directories that exist but are not watched, e.g. after a rename"""
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        missing = [path for path in self.signatures if path not in watched and os.path.isfile(path)]
+        missing += [
+            directory for directory in {os.path.dirname(path) for path in self.signatures}
+            if directory not in watched and os.path.isdir(directory)
+        ]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def acknowledge(self, path: str):
+        """Record the current state of path, e.g. after the application wrote it itself"""
+        path = os.path.abspath(path)
+        if path in self.signatures:
+            self.signatures[path] = file_signature(path)
+
+    def on_file_changed(self, path: str):
+        if path in self.signatures:
+            self.pending.add(path)
+            self.timer.start()
+
+    def on_directory_changed(self, directory: str):
+        candidates = [path for path in self.signatures if os.path.dirname(path) == directory]
+        if candidates:
+            self.pending.update(candidates)
+            self.timer.start()
+
+    def flush(self):
+        pending, self.pending = self.pending, set()
+        self._arm()
+        changed = []
+        for path in sorted(pending):
+            signature = file_signature(path)
+            if signature != self.signatures.get(path):
+                self.signatures[path] = signature
+                changed.append(path)
+        if changed:
+            self.filesChanged.emit(changed)
@@ -14,19 +14,3 @@ class BroadseaHostSection(BaseConfigSection):
         self.add_field(form_layout, "HOST_PORT", default="8080")
         self.add_field(form_layout, "HOST_PROTOCOL", default="http")
         self.add_field(form_layout, "HOST_CONTEXT_PATH", default="/")
-
-    def validate(self) -> list[str]:
-        """Validate host configuration"""
-        issues = []
-        port = self.fields["HOST_PORT"].text()
-        
-        if not port.isdigit():
-            issues.append("Port must be a number")
-        elif not (0 <= int(port) <= 65535):
-            issues.append("Port must be between 0 and 65535")
-
-        protocol = self.fields["HOST_PROTOCOL"].text().lower()
-        if protocol not in ["http", "https"]:
-            issues.append("Protocol must be either 'http' or 'https'")
-
-        return issues
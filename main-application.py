@@ -1,58 +1,65 @@
 import sys
 import os
+import re
 import json
 import webbrowser
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QFileDialog, QMessageBox, QTabWidget,
     QMenuBar, QMenu, QStatusBar, QDialog, QDialogButtonBox,
-    QLineEdit, QTextEdit, QComboBox
+    QLineEdit, QTextEdit, QComboBox, QListWidget, QListWidgetItem
 )
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QAction, QIcon
 
+from broadsea_core import envfile, export
+from broadsea_core.store import ConfigStore
+from broadsea_core.journal import EditJournal
+from broadsea_core.diff import diff_configs, format_change
+from broadsea_core.interpolate import Interpolator
+from broadsea_core.validation import section_rules, validate_section
+from validation_worker import ValidationScheduler
+from file_watcher import FileWatcher
+
+# Keys listed in the unsaved changes prompt before it is cut short
+MAX_LISTED_CHANGES = 15
+
+# Export formats for this editor's keys; Docker Compose and deployment files
+# are built from the create_sections() keys, which these sections do not use
+EXPORT_TARGETS = ("env", "json", "yaml")
+
+# Fields naming a secret file, watched alongside the .env
+SECRET_FILE_KEY = re.compile(r"_(PASSWORDS?|KEY)_FILE$")
+
 class ConfigManager:
     """Manages configuration file operations"""
 
-    @staticmethod
-    def load_config(filepath: str) -> dict:
-        """Load configuration from file"""
-        config = {}
-        current_section = None
-
-        try:
-            with open(filepath, 'r') as file:
-                for line in file:
-                    line = line.strip()
-                    if line.startswith('#'):
-                        if 'Section' in line:
-                            current_section = line.split(':')[-1].strip()
-                            config[current_section] = {}
-                    elif '=' in line:
-                        if current_section:
-                            key, value = line.split('=', 1)
-                            config[current_section][key.strip()] = value.strip()
-            return config
-        except Exception as e:
-            raise Exception(f"Failed to load configuration: {str(e)}")
+    def __init__(self):
+        # Document of the last opened or saved file, patched in place on save
+        self.document = None
+        # Tab section of every key the tabs show, for keys before the first header
+        self.key_sections: Dict[str, str] = {}
 
-    @staticmethod
-    def save_config(config: dict, filepath: str):
+    def load_config(self, filepath: str) -> dict:
+        """Load configuration from file"""
+        self.document = envfile.read_document(filepath)
+        return self.document.to_config(self.key_sections.get)
+
+    def repeated_keys(self) -> List[str]:
+        """Keys of the loaded file set under more than one section; only the last value is used"""
+        if self.document is None:
+            return []
+        return [
+            f"{key} is set under {', '.join(section or 'no section' for section in sections)}; "
+            f"using the value under {sections[-1] or 'no section'}"
+            for key, sections in self.document.repeated.items()
+        ]
+
+    def save_config(self, config: dict, filepath: str):
         """Save configuration to file"""
-        try:
-            with open(filepath, 'w') as file:
-                for section, values in config.items():
-                    file.write(f"############################################################################################\n")
-                    file.write(f"# Section: {section}\n")
-                    file.write(f"############################################################################################\n\n")
-
-                    for key, value in values.items():
-                        file.write(f"{key}={value}\n")
-                    file.write("\n")
-        except Exception as e:
-            raise Exception(f"Failed to save configuration: {str(e)}")
+        self.document = envfile.save_config(config, filepath, self.document)
 
 class ConfigurationApp(QMainWindow):
     """Main application window"""
@@ -61,7 +68,23 @@ class ConfigurationApp(QMainWindow):
         super().__init__()
         self.current_file = None
         self.config_manager = ConfigManager()
+        self.store = ConfigStore()
+        # Validation issues of each section's keys, with the inputs they were computed for
+        self.key_issues: Dict[str, Dict[str, Tuple[Any, List[Tuple[str, str]]]]] = {}
+        # ${KEY} references between values, resolved for validation
+        self.interpolation = Interpolator()
+        self.key_sections: Dict[str, str] = {}
+        self.validator = ValidationScheduler(parent=self)
+        self.validator.resultReady.connect(self.on_key_validated)
+        self.store.subscribe(self.on_value_changed)
+        self.journal = None
+        self.store.subscribe(self.record_edit)
+        # Reloads the .env and revalidates secret file fields when they change on disk
+        self.watch_files = True
+        self.watcher = FileWatcher(parent=self)
+        self.watcher.filesChanged.connect(self.on_files_changed)
         self.setup_ui()
+        self.open_journal()
 
     def setup_ui(self):
         """Initialize the user interface"""
@@ -135,6 +158,14 @@ class ConfigurationApp(QMainWindow):
         export_action.triggered.connect(self.export_config)
         tools_menu.addAction(export_action)
 
+        tools_menu.addSeparator()
+
+        watch_action = QAction("Reload External Changes", self)
+        watch_action.setCheckable(True)
+        watch_action.setChecked(self.watch_files)
+        watch_action.toggled.connect(self.set_watch_files)
+        tools_menu.addAction(watch_action)
+
         # Help menu
         help_menu = menubar.addMenu("Help")
 
@@ -169,14 +200,252 @@ class ConfigurationApp(QMainWindow):
         }
 
         for name, section in self.sections.items():
+            section.bind(self.store)
             self.tab_widget.addTab(section, name)
+        self.store.mark_clean()
+        self.config_manager.key_sections = {
+            key: section.section_name for section in self.sections.values() for key in section.fields
+        }
+
+    def on_value_changed(self, section: str, key: str, value: str):
+        """Schedule validation of the edited key, the keys whose rules read it and the keys referencing it"""
+        self.key_sections[key] = section
+        affected = self.interpolation.set(key, value)
+        for name in dict.fromkeys([key, *affected]):
+            name_section = self.key_sections.get(name)
+            if name_section is None:
+                continue
+            rules = section_rules(name_section)
+            for dependent in dict.fromkeys([name, *(rules.dependents.get(name, []) if rules else [])]):
+                self.schedule_key_validation(name_section, dependent)
+
+    def secret_files(self) -> Dict[str, List[Tuple[Optional[str], str]]]:
+        """Absolute path of every secret file the current file names, with the section and key naming it
+
+        Read from the parsed document, as no tab has fields for these keys.
+        """
+        document = self.config_manager.document
+        if document is None or not self.current_file:
+            return {}
+        paths: Dict[str, List[Tuple[Optional[str], str]]] = {}
+        for key, section in document.key_sections.items():
+            secret = self.secret_file(key)
+            if secret is not None:
+                paths.setdefault(secret[0], []).append((section, key))
+        return paths
+
+    def secret_file(self, key: str) -> Optional[Tuple[str, str]]:
+        """Absolute path and value of the secret file key names in the current file, if any"""
+        document = self.config_manager.document
+        if document is None or not self.current_file or not SECRET_FILE_KEY.search(key):
+            return None
+        value = document.get(key)
+        if not value:
+            return None
+        base = os.path.dirname(os.path.abspath(self.current_file))
+        return os.path.normpath(os.path.join(base, os.path.expanduser(value))), value
+
+    @staticmethod
+    def secret_file_issue(key: str, path: str, value: str) -> Optional[Tuple[str, str]]:
+        """(key, message) if the secret file is missing or empty; reads only the file system"""
+        try:
+            empty = os.path.getsize(path) == 0
+        except OSError:
+            return key, f"{key}: {value} does not exist"
+        return (key, f"{key}: {value} is empty") if empty else None
+
+    def secret_file_issues(self, section: str) -> List[Tuple[str, str]]:
+        """(key, message) for missing or empty secret files named under a section of the current file"""
+        issues = []
+        for path, names in self.secret_files().items():
+            for key in (key for name, key in names if name == section):
+                if issue := self.secret_file_issue(key, path, self.config_manager.document.get(key)):
+                    issues.append(issue)
+        return issues
+
+    def update_watches(self):
+        """Watch the current file and the secret files it names"""
+        if not self.watch_files or not self.current_file:
+            self.watcher.watch([])
+            return
+        self.watcher.watch([self.current_file, *self.secret_files()])
+
+    def set_watch_files(self, enabled: bool):
+        self.watch_files = enabled
+        self.update_watches()
+
+    def on_files_changed(self, paths: List[str]):
+        """Apply a changed .env to the affected widgets and revalidate sections naming changed secret files"""
+        current = os.path.abspath(self.current_file) if self.current_file else None
+        if current in paths:
+            self.reload_current_file()
+        secrets = self.secret_files()
+        changed = [path for path in paths if path in secrets]
+        sections = dict.fromkeys(
+            section for path in changed for section, _ in secrets[path] if section in self.sections
+        )
+        for path in changed:
+            for section, key in secrets[path]:
+                if section in self.sections:
+                    # The key's value is unchanged, so its cached result would be reused
+                    self.key_issues.get(section, {}).pop(key, None)
+                    self.schedule_key_validation(section, key)
+        if changed:
+            self.update_status(f"Secret file(s) changed on disk: {', '.join(map(os.path.basename, changed))}")
+
+    def reload_current_file(self):
+        """Re-read the current file and set only the values changed on disk since it was loaded
+
+        Values also edited here and not saved are kept and reported.
+        """
+        try:
+            disk = self.config_manager.load_config(self.current_file)
+        except Exception as e:
+            self.update_status(f"Failed to reload {self.current_file}: {str(e)}")
+            return
+        clean = self.store.clean_snapshot()
+        had_changes = self.store.has_changes()
+        applied, kept = [], []
+        # Values read from disk are not edits to journal
+        journal, self.journal = self.journal, None
+        try:
+            for change in diff_configs(clean.to_config(), disk, mask_secrets=False):
+                section = self.key_sections.get(change.key)
+                if change.kind == "removed" or section is None:
+                    continue
+                current = self.store.get(section, change.key)
+                if current == change.new:
+                    continue
+                if current != clean.get(section, change.key):
+                    kept.append(change.key)
+                    continue
+                # Pushed into the one widget showing the key by the store listener
+                self.store.set(section, change.key, change.new)
+                applied.append(change.key)
+        finally:
+            self.journal = journal
+        if not had_changes:
+            self.store.mark_clean()
+        message = f"Reloaded {len(applied)} changed value(s) from {os.path.basename(self.current_file)}"
+        if kept:
+            message += f"; kept unsaved edits of {', '.join(kept)}"
+        repeated = self.config_manager.repeated_keys()
+        if repeated:
+            message += f"; {len(repeated)} key(s) set under more than one section"
+        self.update_status(message)
+        # The file may now name other secret files
+        self.update_watches()
+        for section in self.sections:
+            self.schedule_section_validation(section)
+
+    def resolved_section(self, section: str) -> Dict[str, str]:
+        """Values of a section with ${KEY} references replaced by their literals"""
+        return {
+            key: self.interpolation.get(key, value)
+            for key, value in self.store.snapshot().section_items(section)
+        }
+
+    def schedule_section_validation(self, section: str):
+        """Schedule validation of every key of a section, including the secret files it names"""
+        keys = list(self.sections[section].fields) if section in self.sections else []
+        keys += [key for names in self.secret_files().values() for name, key in names if name == section]
+        for key in dict.fromkeys(keys):
+            self.schedule_key_validation(section, key)
+
+    def schedule_key_validation(self, section: str, key: str):
+        """Schedule a debounced validation of one key
+
+        Everything the job reads is captured here on the GUI thread; jobs
+        with expensive rules or a secret file to check run on the pool.
+        """
+        rules = section_rules(section)
+        values = self.resolved_section(section)
+        error = self.interpolation.errors.get(key)
+        secret = self.secret_file(key)
+        inputs = (
+            tuple(values.get(name, "") for name in (rules.inputs(key) if rules else (key,))),
+            error, secret
+        )
+        name = f"{section}/{key}"
+        cached = self.key_issues.get(section, {}).get(key)
+        if cached is not None and cached[0] == inputs:
+            # Scheduled anyway so that a pending job for older inputs is superseded
+            self.validator.schedule(name, lambda: cached)
+            return
+
+        def job():
+            issues = [(key, error)] if error else []
+            if secret is not None and (issue := self.secret_file_issue(key, *secret)):
+                issues.append(issue)
+            if rules is not None and key in rules and not error:
+                issues += rules.key_issues(values, [key])
+            return inputs, issues
+
+        self.validator.schedule(
+            name, job, expensive=secret is not None or (rules is not None and rules.is_expensive(key))
+        )
+
+    def on_key_validated(self, name: str, result):
+        section, key = name.split("/", 1)
+        if isinstance(result, str):
+            # The validation job itself failed
+            result = (None, [(key, result)])
+        self.key_issues.setdefault(section, {})[key] = result
+        self.show_section_issues(section)
+
+    def show_section_issues(self, section: str):
+        issues = [issue for _, key_issues in self.key_issues.get(section, {}).values() for issue in key_issues]
+        for widget in self.sections.values():
+            if widget.section_name == section:
+                widget.show_issues(issues)
+
+    def record_edit(self, section: str, key: str, value: str):
+        if self.journal is not None:
+            self.journal.record(section, key, value)
+
+    def open_journal(self):
+        """Journal edits of the current file, offering to restore edits left by a crash"""
+        self.journal = EditJournal(self.current_file)
+        try:
+            recovered = self.journal.recover()
+        except Exception as e:
+            QMessageBox.warning(self, "Autosave", str(e))
+            recovered = {}
+        if recovered:
+            reply = QMessageBox.question(
+                self,
+                "Restore Unsaved Changes",
+                "A previous session ended without saving "
+                f"{os.path.basename(self.current_file or 'a new configuration')}.\n\n"
+                "Do you want to restore its changes?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.Yes
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                self.store.load(recovered)
+            else:
+                self.journal.discard()
+        self.journal.start()
+
+    def close_journal(self, discard: bool = True):
+        if self.journal is not None:
+            journal, self.journal = self.journal, None
+            journal.close()
+            if discard:
+                journal.discard()
 
     def new_config(self):
         """Create new configuration"""
         if self.check_unsaved_changes():
+            self.close_journal()
             self.current_file = None
+            self.config_manager.document = None
+            self.key_issues.clear()
             for section in self.sections.values():
                 section.reset_to_defaults()
+            self.store.mark_clean()
+            self.open_journal()
+            self.update_watches()
             self.update_status("New configuration created")
 
     def open_config(self):
@@ -194,13 +463,29 @@ class ConfigurationApp(QMainWindow):
         if filename:
             try:
                 config = self.config_manager.load_config(filename)
-                self.current_file = filename
+                self.close_journal()
+                self.key_issues.clear()
 
                 # Update each section with loaded configuration
                 for section in self.sections.values():
                     section.load_config(config.get(section.section_name, {}))
+                self.store.mark_clean()
+                # Switched to the new file only once its values are loaded
+                self.current_file = filename
+                self.open_journal()
+                self.update_watches()
+                # Secret files are only named in the document, so no edit schedules them
+                for section in self.sections:
+                    self.schedule_section_validation(section)
 
                 self.update_status(f"Loaded configuration from {filename}")
+                repeated = self.config_manager.repeated_keys()
+                if repeated:
+                    QMessageBox.warning(
+                        self,
+                        "Repeated Keys",
+                        "The following keys are set more than once:\n\n" + "\n".join(repeated)
+                    )
             except Exception as e:
                 QMessageBox.critical(
                     self,
@@ -215,11 +500,13 @@ class ConfigurationApp(QMainWindow):
             return
 
         try:
-            config = {}
-            for section in self.sections.values():
-                config[section.section_name] = section.get_config()
-
-            self.config_manager.save_config(config, self.current_file)
+            self.config_manager.save_config(self.store.to_config(), self.current_file)
+            self.update_watches()
+            # Our own write is not an external change
+            self.watcher.acknowledge(self.current_file)
+            self.store.mark_clean()
+            self.close_journal()
+            self.open_journal()
             self.update_status(f"Saved configuration to {self.current_file}")
         except Exception as e:
             QMessageBox.critical(
@@ -245,9 +532,12 @@ class ConfigurationApp(QMainWindow):
         """Validate all configuration sections"""
         issues = []
         for name, section in self.sections.items():
-            section_issues = section.validate()
+            values = self.resolved_section(section.section_name)
+            section_issues = [(key, self.interpolation.errors[key]) for key in values if key in self.interpolation.errors]
+            section_issues += self.secret_file_issues(section.section_name)
+            section_issues += validate_section(section.section_name, values)
             if section_issues:
-                issues.extend([f"{name}: {issue}" for issue in section_issues])
+                issues.extend([f"{name}: {message}" for _, message in section_issues])
 
         if issues:
             QMessageBox.warning(
@@ -263,97 +553,33 @@ class ConfigurationApp(QMainWindow):
             )
 
     def export_config(self):
-        """Export configuration to different formats"""
-        formats = {
-            "JSON": (".json", self.export_json),
-            "YAML": (".yaml", self.export_yaml),
-            "Docker Compose": (".yml", self.export_docker_compose)
-        }
-
-        dialog = ExportDialog(list(formats.keys()), self)
-        if dialog.exec():
-            format_name = dialog.get_selected_format()
-            if format_name in formats:
-                extension, export_func = formats[format_name]
+        """Export configuration to one or more formats in a directory"""
+        dialog = ExportDialog(
+            {name: export.TARGETS[name].title for name in EXPORT_TARGETS}, self
+        )
+        if not dialog.exec():
+            return
+        targets = dialog.get_selected_formats()
+        if not targets:
+            return
 
-                filename, _ = QFileDialog.getSaveFileName(
+        directory = QFileDialog.getExistingDirectory(self, "Export to Directory")
+        if directory:
+            try:
+                # One snapshot feeds every target
+                results = export.export(self.store.snapshot().to_config(), directory, targets)
+                written = sum(result.written for result in results)
+                self.update_status(
+                    f"Exported {written} file(s) to {directory}, "
+                    f"{len(results) - written} unchanged"
+                )
+            except Exception as e:
+                QMessageBox.critical(
                     self,
-                    f"Export as {format_name}",
-                    "",
-                    f"{format_name} Files (*{extension});;All Files (*.*)"
+                    "Export Error",
+                    str(e)
                 )
 
-                if filename:
-                    try:
-                        export_func(filename)
-                        self.update_status(f"Exported configuration as {format_name}")
-                    except Exception as e:
-                        QMessageBox.critical(
-                            self,
-                            "Export Error",
-                            f"Failed to export configuration: {str(e)}"
-                        )
-
-    def export_json(self, filename):
-        """Export configuration as JSON"""
-        config = {}
-        for section in self.sections.values():
-            config[section.section_name] = section.get_config()
-
-        with open(filename, 'w') as f:
-            json.dump(config, f, indent=2)
-
-    def export_yaml(self, filename):
-        """Export configuration as YAML"""
-        try:
-            import yaml
-            config = {}
-            for section in self.sections.values():
-                config[section.section_name] = section.get_config()
-
-            with open(filename, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False)
-        except ImportError:
-            raise Exception("PyYAML is required for YAML export")
-
-    def export_docker_compose(self, filename):
-        """Export configuration as Docker Compose file"""
-        services = {
-            "atlas": {
-                "image": f"ohdsi/atlas:{self.sections['Atlas'].get_config()['ATLAS_VERSION']}",
-                "ports": [f"{self.sections['Atlas'].get_config()['ATLAS_PORT']}:8080"],
-                "environment": self.sections['Atlas'].get_config(),
-                "depends_on": ["postgres", "webapi"]
-            },
-            "webapi": {
-                "image": f"ohdsi/webapi:{self.sections['WebAPI'].get_config()['WEBAPI_VERSION']}",
-                "ports": [f"{self.sections['WebAPI'].get_config()['WEBAPI_PORT']}:8080"],
-                "environment": self.sections['WebAPI'].get_config(),
-                "depends_on": ["postgres"]
-            },
-            "postgres": {
-                "image": "postgres:13",
-                "ports": ["5432:5432"],
-                "environment": {
-                    "POSTGRES_USER": self.sections['DataSource'].get_config()['DATASOURCE_DB_USER'],
-                    "POSTGRES_PASSWORD": self.sections['DataSource'].get_config()['DATASOURCE_DB_PASS'],
-                    "POSTGRES_DB": self.sections['DataSource'].get_config()['DATASOURCE_DB_NAME']
-                },
-                "volumes": ["postgres_data:/var/lib/postgresql/data"]
-            }
-        }
-
-        compose_config = {
-            "version": "3.8",
-            "services": services,
-            "volumes": {
-                "postgres_data": None
-            }
-        }
-
-        with open(filename, 'w') as f:
-            yaml.dump(compose_config, f, default_flow_style=False)
-
     def show_about(self):
         """Show about dialog"""
         QMessageBox.about(
@@ -378,40 +604,38 @@ class ConfigurationApp(QMainWindow):
 
     def check_unsaved_changes(self) -> bool:
         """Check for unsaved changes"""
-        if not self.current_file:
+        changed = self.store.changed_sections()
+        if not changed:
             return True
 
-        try:
-            current_config = {}
-            for section in self.sections.values():
-                current_config[section.section_name] = section.get_config()
-
-            saved_config = self.config_manager.load_config(self.current_file)
-
-            if current_config != saved_config:
-                reply = QMessageBox.question(
-                    self,
-                    "Unsaved Changes",
-                    "You have unsaved changes. Do you want to continue?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                    QMessageBox.StandardButton.No
-                )
-                return reply == QMessageBox.StandardButton.Yes
-
-        except Exception:
-            # If there's any error reading the saved file, assume it's safe to proceed
-            pass
+        changes = diff_configs(self.store.clean_snapshot().to_config(), self.store.to_config())
+        details = "\n".join(format_change(change) for change in changes[:MAX_LISTED_CHANGES])
+        if len(changes) > MAX_LISTED_CHANGES:
+            details += f"\n... and {len(changes) - MAX_LISTED_CHANGES} more"
+        reply = QMessageBox.question(
+            self,
+            "Unsaved Changes",
+            "You have unsaved changes in: " + ", ".join(changed) + "\n\n"
+            + details + "\n\n"
+            "Do you want to continue?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
 
-        return True
+    def closeEvent(self, event):
+        # Edits that were not saved stay in the journal for the next start
+        self.close_journal(discard=not self.store.has_changes())
+        super().closeEvent(event)
 
     def update_status(self, message: str):
         """Update status bar message"""
         self.status_bar.showMessage(message)
 
 class ExportDialog(QDialog):
-    """Dialog for selecting export format"""
+    """Dialog for selecting export formats"""
 
-    def __init__(self, formats, parent=None):
+    def __init__(self, formats: Dict[str, str], parent=None):
         super().__init__(parent)
         self.formats = formats
         self.setup_ui()
@@ -422,10 +646,15 @@ class ExportDialog(QDialog):
         layout = QVBoxLayout(self)
 
         # Format selection
-        layout.addWidget(QLabel("Select Export Format:"))
-        self.format_combo = QComboBox()
-        self.format_combo.addItems(self.formats)
-        layout.addWidget(self.format_combo)
+        layout.addWidget(QLabel("Select Export Formats:"))
+        self.format_list = QListWidget()
+        for name, title in self.formats.items():
+            item = QListWidgetItem(title)
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.format_list.addItem(item)
+        layout.addWidget(self.format_list)
 
         # Buttons
         button_box = QDialogButtonBox(
@@ -436,9 +665,14 @@ class ExportDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
 
-    def get_selected_format(self) -> str:
-        """Get selected format"""
-        return self.format_combo.currentText()
+    def get_selected_formats(self) -> List[str]:
+        """Get selected formats"""
+        items = (self.format_list.item(row) for row in range(self.format_list.count()))
+        return [
+            item.data(Qt.ItemDataRole.UserRole)
+            for item in items
+            if item.checkState() == Qt.CheckState.Checked
+        ]
 
 def main():
     app = QApplication(sys.argv)
@@ -1,62 +1,85 @@
+import os
 import sys
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QWizard, QWizardPage, QLineEdit,
     QComboBox, QCheckBox, QTextEdit, QMessageBox, QFileDialog,
-    QGroupBox, QScrollArea, QSpacerItem, QSizePolicy
+    QGroupBox, QScrollArea, QSpacerItem, QSizePolicy, QListWidget, QListWidgetItem
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon
 
-@dataclass
-class ConfigField:
-    name: str
-    description: str
-    default_value: str = ""
-    required: bool = True
-    depends_on: Optional[Dict[str, str]] = None
-    validation_func: Optional[callable] = None
-    options: Optional[List[str]] = None
-    field_type: str = "text"  # text, password, combo, checkbox, file
-    help_text: str = ""
-    placeholder: str = ""
-    section: str = ""
-    group: str = ""
-
-class ConfigSection:
-    def __init__(self, name: str, title: str, description: str):
-        self.name = name
-        self.title = title
-        self.description = description
-        self.fields: List[ConfigField] = []
-        self.groups: Dict[str, str] = {}
-
-    def add_field(self, field: ConfigField):
-        field.section = self.name
-        self.fields.append(field)
-
-    def add_group(self, name: str, title: str):
-        self.groups[name] = title
+from broadsea_core.schema import ConfigField, ConfigSection, create_sections
+from broadsea_core.validation import ValidationCache, validate_field
+from broadsea_core.dependencies import DependencyState
+from broadsea_core.generate import build_config, normalize_value
+from broadsea_core.envfile import write_env
+from broadsea_core.store import ConfigStore
+from broadsea_core.search import FieldSearchIndex
+from broadsea_core.journal import EditJournal
+from broadsea_core.interpolate import Interpolator
+from validation_worker import ValidationScheduler
+from field_table import FieldTableModel, FieldTableView
+
+ERROR_STYLE = "border: 1px solid #d9534f;"
+
+# Sections that grow with every datasource, LDAP user or Posit setting a site
+# adds are edited in a virtualized table
+TABLE_VIEW_SECTIONS = ("DataSource", "OpenLDAP", "PositConnect")
+# So are other sections with at least this many fields (Content has 8)
+TABLE_VIEW_MIN_FIELDS = 8
+
+def uses_table_view(section: ConfigSection) -> bool:
+    return section.name in TABLE_VIEW_SECTIONS or len(section.fields) >= TABLE_VIEW_MIN_FIELDS
 
 class ConfigWizardPage(QWizardPage):
-    def __init__(self, section: ConfigSection, parent=None):
+    def __init__(self, section: ConfigSection, store: ConfigStore,
+                 dependencies: DependencyState, parent=None):
         super().__init__(parent)
         self.section = section
+        self.store = store
+        self.dependencies = dependencies
+        self.field_defs: Dict[str, ConfigField] = {field.name: field for field in section.fields}
         self.fields: Dict[str, QWidget] = {}
-        self.setup_ui()
-
-    def setup_ui(self):
+        self.containers: Dict[str, QWidget] = {}
+        self.field_errors: Dict[str, Optional[str]] = {}
+        self.table: Optional[FieldTableView] = None
+        self.built = False
         self.setTitle(self.section.title)
         self.setSubTitle(self.section.description)
 
+    def initializePage(self):
+        """Build the widget tree the first time the page is shown"""
+        if not self.is_passing_through():
+            self.ensure_built()
+        super().initializePage()
+
+    def showEvent(self, event):
+        # Pages skipped while jumping to a search hit are built when revisited
+        if not self.is_passing_through():
+            self.ensure_built()
+        super().showEvent(event)
+
+    def is_passing_through(self) -> bool:
+        wizard = self.wizard()
+        return wizard is not None and getattr(wizard, "jumping", False)
+
+    def ensure_built(self):
+        if not self.built:
+            self.setup_ui()
+            self.built = True
+            for field_name, error in self.field_errors.items():
+                self.show_field_error(field_name, error)
+
+    def setup_ui(self):
+        if uses_table_view(self.section):
+            self.setup_table()
+            return
+
         # Create main layout
         layout = QVBoxLayout(self)
 
-        # Dictionary to track dependencies
-        self.dependency_map = {}
-        
         # Create scroll area for content
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -113,37 +136,13 @@ class ConfigWizardPage(QWizardPage):
                     field_layout.addWidget(help_label)
 
                 group_layout.addWidget(field_container)
-                self.fields[field.name] = field_widget
+                self.containers[field.name] = field_container
+                # File fields register their line edit rather than the container
+                self.fields.setdefault(field.name, field_widget)
+                self.bind_field(field.name)
 
-                # Setup field dependencies
-                if field.depends_on:
-                    for dep_field, dep_value in field.depends_on.items():
-                        if dep_field not in self.dependency_map:
-                            self.dependency_map[dep_field] = []
-                        self.dependency_map[dep_field].append({
-                            'target_field': field.name,
-                            'required_value': dep_value,
-                            'container': field_container
-                        })
-                        # Initially hide if dependency not met
-                        if dep_field in self.fields:
-                            self.update_field_visibility(dep_field)
-
-        # Connect dependency signals
-        for field_name, field_widget in self.fields.items():
-            if field_name in self.dependency_map:
-                if isinstance(field_widget, QCheckBox):
-                    field_widget.stateChanged.connect(
-                        lambda state, name=field_name: self.update_field_visibility(name)
-                    )
-                elif isinstance(field_widget, QComboBox):
-                    field_widget.currentTextChanged.connect(
-                        lambda text, name=field_name: self.update_field_visibility(name)
-                    )
-                elif isinstance(field_widget, QLineEdit):
-                    field_widget.textChanged.connect(
-                        lambda text, name=field_name: self.update_field_visibility(name)
-                    )
+                # Initially hide if dependency not met
+                field_container.setVisible(self.dependencies.is_active(field.name))
 
         # Add vertical spacer at the bottom
         content_layout.addItem(
@@ -152,28 +151,55 @@ class ConfigWizardPage(QWizardPage):
 
         scroll.setWidget(content_widget)
         layout.addWidget(scroll)
+        self.scroll = scroll
+
+    def setup_table(self):
+        """Edit the section in a table that only realizes the visible rows"""
+        layout = QVBoxLayout(self)
+        self.table = FieldTableView(FieldTableModel(self.section, self.store, self))
+        for field in self.section.fields:
+            self.table.set_field_visible(field.name, self.dependencies.is_active(field.name))
+        layout.addWidget(self.table)
+
+    def bind_field(self, field_name: str):
+        """Write widget edits through to the value store"""
+        widget = self.fields[field_name]
+        section_name = self.section.name
+        if isinstance(widget, QCheckBox):
+            widget.stateChanged.connect(
+                lambda state, w=widget: self.store.set(section_name, field_name, str(w.isChecked()).lower())
+            )
+        elif isinstance(widget, QComboBox):
+            widget.currentTextChanged.connect(
+                lambda text: self.store.set(section_name, field_name, text)
+            )
+        elif isinstance(widget, QLineEdit):
+            widget.textChanged.connect(
+                lambda text: self.store.set(section_name, field_name, text)
+            )
 
     def create_field_widget(self, field: ConfigField) -> QWidget:
+        value = self.store.get(self.section.name, field.name, field.default_value)
         if field.field_type == "text":
             widget = QLineEdit()
-            widget.setText(field.default_value)
+            widget.setText(value)
             widget.setPlaceholderText(field.placeholder)
             return widget
         elif field.field_type == "password":
             widget = QLineEdit()
             widget.setEchoMode(QLineEdit.EchoMode.Password)
-            widget.setText(field.default_value)
+            widget.setText(value)
             widget.setPlaceholderText(field.placeholder)
             return widget
         elif field.field_type == "combo" and field.options:
             widget = QComboBox()
             widget.addItems(field.options)
-            if field.default_value in field.options:
-                widget.setCurrentText(field.default_value)
+            if value in field.options:
+                widget.setCurrentText(value)
             return widget
         elif field.field_type == "checkbox":
             widget = QCheckBox()
-            widget.setChecked(field.default_value.lower() == "true")
+            widget.setChecked(value.lower() == "true")
             return widget
         elif field.field_type == "file":
             container = QWidget()
@@ -181,7 +207,7 @@ class ConfigWizardPage(QWizardPage):
             layout.setContentsMargins(0, 0, 0, 0)
             
             line_edit = QLineEdit()
-            line_edit.setText(field.default_value)
+            line_edit.setText(value)
             line_edit.setPlaceholderText(field.placeholder)
             
             browse_btn = QPushButton("Browse...")
@@ -206,63 +232,105 @@ class ConfigWizardPage(QWizardPage):
         if filename:
             line_edit.setText(filename)
 
-    def update_field_visibility(self, field_name: str):
-        """Update visibility of dependent fields"""
-        if field_name not in self.dependency_map:
+    def set_field_visible(self, field_name: str, visible: bool):
+        """Show or hide a field whose dependencies changed"""
+        if self.table is not None:
+            self.table.set_field_visible(field_name, visible)
             return
-
-        field_widget = self.fields[field_name]
-        current_value = ""
-        
-        if isinstance(field_widget, QCheckBox):
-            current_value = str(field_widget.isChecked()).lower()
-        elif isinstance(field_widget, QComboBox):
-            current_value = field_widget.currentText()
-        elif isinstance(field_widget, QLineEdit):
-            current_value = field_widget.text()
-        elif isinstance(field_widget, QTextEdit):
-            current_value = field_widget.toPlainText()
-
-        for dependency in self.dependency_map[field_name]:
-            show = current_value == dependency['required_value']
-            dependency['container'].setVisible(show)
-            # Clear value when hidden
-            if not show and dependency['target_field'] in self.fields:
-                target_widget = self.fields[dependency['target_field']]
-                if isinstance(target_widget, QLineEdit):
-                    target_widget.clear()
-                elif isinstance(target_widget, QComboBox):
-                    target_widget.setCurrentIndex(0)
-                elif isinstance(target_widget, QCheckBox):
-                    target_widget.setChecked(False)
-                elif isinstance(target_widget, QTextEdit):
-                    target_widget.clear()
+        container = self.containers.get(field_name)
+        if container is not None:
+            container.setVisible(visible)
+
+    def focus_field(self, field_name: str):
+        """Scroll to a field and give it keyboard focus"""
+        self.ensure_built()
+        if self.table is not None:
+            self.table.focus_field(field_name)
+            return
+        container = self.containers.get(field_name)
+        if container is not None:
+            self.scroll.ensureWidgetVisible(container)
+        widget = self.fields.get(field_name)
+        if widget is not None:
+            widget.setFocus()
+
+    def set_field_error(self, field_name: str, error: Optional[str]):
+        """Remember a validation result and mark the widget if it exists"""
+        self.field_errors[field_name] = error
+        if self.built:
+            self.show_field_error(field_name, error)
+
+    def show_field_error(self, field_name: str, error: Optional[str]):
+        if self.table is not None:
+            self.table.field_model().set_error(field_name, error)
+            return
+        widget = self.fields.get(field_name)
+        if widget is None:
+            return
+        widget.setStyleSheet(ERROR_STYLE if error else "")
+        widget.setToolTip(error or "")
 
     def get_field_value(self, field_name: str) -> str:
-        widget = self.fields.get(field_name)
-        if not widget:
+        field = self.field_defs.get(field_name)
+        if field is None:
             return ""
-            
-        # Skip hidden fields
-        if not widget.isVisible():
+
+        # Skip fields hidden by their dependencies
+        if not self.dependencies.is_active(field_name):
             return ""
-            
-        if isinstance(widget, QLineEdit):
-            return widget.text()
-        elif isinstance(widget, QComboBox):
-            return widget.currentText()
-        elif isinstance(widget, QCheckBox):
-            return str(widget.isChecked()).lower()
-        elif isinstance(widget, QTextEdit):
-            return widget.toPlainText()
-        return ""
+
+        return self.store.get(self.section.name, field_name)
 
 class ConfigWizard(QWizard):
     def __init__(self, sections: List[ConfigSection], parent=None):
         super().__init__(parent)
         self.sections = sections
         self.pages: List[ConfigWizardPage] = []
+        self.store = ConfigStore({
+            section.name: {
+                field.name: normalize_value(field, field.default_value)
+                for field in section.fields
+            }
+            for section in sections
+        })
+        self.validation_cache = ValidationCache(sections)
+        # Fields hold ${KEY} templates; visibility and validation use the literals
+        self.interpolation = Interpolator(self.store.snapshot().flat())
+        self.dependencies = DependencyState(self.validation_cache.graph, self.interpolation.resolved())
+        self.validator = ValidationScheduler(parent=self)
+        self.validator.resultReady.connect(self.on_field_validated)
+        self.store.subscribe(self.on_value_changed)
         self.setup_ui()
+        self.journal = EditJournal(self.target)
+        self.restore_journal()
+        self.store.subscribe(self.journal.record)
+        self.journal.start()
+
+    @property
+    def target(self) -> str:
+        return os.path.abspath('.env')
+
+    def restore_journal(self):
+        """Offer to restore edits left by a session that did not finish"""
+        try:
+            recovered = self.journal.recover()
+        except Exception as e:
+            QMessageBox.warning(None, "Autosave", str(e))
+            return
+        if not recovered:
+            return
+        reply = QMessageBox.question(
+            None,
+            "Restore Unsaved Changes",
+            "A previous session ended without saving.\n\n"
+            "Do you want to restore its changes?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.store.load(recovered)
+        else:
+            self.journal.discard()
 
     def setup_ui(self):
         self.setWindowTitle("Broadsea Configuration Wizard")
@@ -270,9 +338,29 @@ class ConfigWizard(QWizard):
         
         # Add pages for each section
         for section in self.sections:
-            page = ConfigWizardPage(section)
+            page = ConfigWizardPage(section, self.store, self.dependencies)
             self.addPage(page)
             self.pages.append(page)
+        self.field_pages: Dict[str, ConfigWizardPage] = {
+            field.name: page for page in self.pages for field in page.section.fields
+        }
+
+        # Field search shown beside the pages
+        self.jumping = False
+        self.search_index = FieldSearchIndex(self.sections)
+        search_panel = QWidget()
+        search_layout = QVBoxLayout(search_panel)
+        search_layout.setContentsMargins(0, 0, 0, 0)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search settings...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.update_search_results)
+        self.search_results = QListWidget()
+        self.search_results.itemActivated.connect(self.on_search_result_activated)
+        self.search_results.itemClicked.connect(self.on_search_result_activated)
+        search_layout.addWidget(self.search_box)
+        search_layout.addWidget(self.search_results)
+        self.setSideWidget(search_panel)
 
         # Set window properties
         self.setMinimumSize(800, 600)
@@ -280,50 +368,92 @@ class ConfigWizard(QWizard):
         # Connect signals
         self.finished.connect(self.on_finish)
 
+    def update_search_results(self, query: str):
+        self.search_results.clear()
+        for hit in self.search_index.search(query):
+            page = self.field_pages[hit.field]
+            item = QListWidgetItem(f"{hit.field}\n  {page.section.title}")
+            item.setData(Qt.ItemDataRole.UserRole, hit.field)
+            self.search_results.addItem(item)
+
+    def on_search_result_activated(self, item: QListWidgetItem):
+        self.jump_to_field(item.data(Qt.ItemDataRole.UserRole))
+
+    def jump_to_field(self, field_name: str):
+        """Navigate to the page owning a field, building only that page"""
+        page = self.field_pages.get(field_name)
+        if page is None:
+            return
+        target = self.pages.index(page)
+        self.jumping = True
+        try:
+            while self.currentPage() is not page:
+                current = self.pages.index(self.currentPage())
+                if current < target:
+                    self.next()
+                else:
+                    self.back()
+                if self.pages.index(self.currentPage()) == current:
+                    # Navigation refused, e.g. by validatePage
+                    break
+        finally:
+            self.jumping = False
+        self.currentPage().ensure_built()
+        if self.currentPage() is page:
+            page.focus_field(field_name)
+
+    def on_value_changed(self, section: str, key: str, value: str):
+        """Update dependent visibility and schedule validation of the affected fields"""
+        # The edited key and every key whose literal references it
+        changed = self.interpolation.set(key, value)
+        values = self.interpolation.resolved()
+        affected: Dict[str, None] = {}
+        for changed_key in changed:
+            for field_name in self.dependencies.update(changed_key, values):
+                page = self.field_pages.get(field_name)
+                if page is not None:
+                    page.set_field_visible(field_name, self.dependencies.is_active(field_name))
+            affected.update(dict.fromkeys(self.validation_cache.affected(changed_key)))
+        for field_name in affected:
+            self.validator.schedule(
+                field_name,
+                lambda field_name=field_name: self.validation_cache.validate(field_name, values),
+                expensive=self.validation_cache.is_expensive(field_name, values.get(field_name, ""))
+            )
+
+    def on_field_validated(self, field_name: str, error: Optional[str]):
+        page = self.field_pages.get(field_name)
+        if page is not None:
+            page.set_field_error(field_name, error)
+
     def get_config(self) -> Dict[str, Dict[str, str]]:
-        config = {}
-        for page in self.pages:
-            section_config = {}
-            for field in page.section.fields:
-                value = page.get_field_value(field.name)
-                if value or field.required:
-                    section_config[field.name] = value
-            config[page.section.name] = section_config
-        return config
+        return build_config(self.sections, self.store.snapshot().flat())
 
     def validate_field(self, field: ConfigField, value: str) -> Optional[str]:
         """Validate a field value"""
-        if field.required and not value:
-            return f"{field.name} is required"
-            
-        if field.validation_func:
-            try:
-                if not field.validation_func(value):
-                    return f"{field.name} validation failed"
-            except Exception as e:
-                return f"{field.name} validation error: {str(e)}"
-                
-        return None
+        return validate_field(field, value)
 
     def validate_page(self, page: ConfigWizardPage) -> List[str]:
-        """Validate all fields on a page"""
+        """Validate all active fields on a page"""
+        values = self.interpolation.resolved()
         issues = []
         for field in page.section.fields:
-            value = page.get_field_value(field.name)
-            if error := self.validate_field(field, value):
+            if error := self.interpolation.errors.get(field.name) or \
+                    self.validation_cache.validate(field.name, values):
                 issues.append(error)
         return issues
 
     def validate_all(self) -> List[str]:
         """Validate all pages"""
-        issues = []
-        for page in self.pages:
-            page_issues = self.validate_page(page)
-            if page_issues:
-                issues.extend([f"{page.section.title}: {issue}" for issue in page_issues])
-        return issues
+        values = self.interpolation.resolved()
+        return self.validation_cache.validate_all(values, self.interpolation.errors)
 
     def on_finish(self):
+        # Unsaved edits stay in the journal unless they are saved or cancelled
+        self.journal.close()
+        if self.result() != QWizard.DialogCode.Accepted:
+            self.journal.discard()
+
         if self.result() == QWizard.DialogCode.Accepted:
             # Validate all fields
             if issues := self.validate_all():
@@ -337,6 +467,7 @@ class ConfigWizard(QWizard):
             try:
                 config = self.get_config()
                 self.save_config(config)
+                self.journal.discard()
                 QMessageBox.information(
                     self,
                     "Success",
@@ -350,759 +481,7 @@ class ConfigWizard(QWizard):
                 )
 
     def save_config(self, config: Dict[str, Dict[str, str]]):
-        try:
-            with open('.env', 'w') as f:
-                for section_name, section_config in config.items():
-                    f.write(f"{'#' * 92}\n")
-                    f.write(f"# Section: {section_name}\n")
-                    f.write(f"{'#' * 92}\n\n")
-
-                    for key, value in section_config.items():
-                        f.write(f"{key}={value}\n")
-                    f.write("\n")
-        except Exception as e:
-            raise Exception(f"Failed to save configuration: {str(e)}")
-
-def create_sections() -> List[ConfigSection]:
-    sections = []
-
-    # Host Configuration
-    host = ConfigSection(
-        "Host",
-        "Broadsea Host Configuration",
-        "Configure basic host settings for Broadsea"
-    )
-    host.add_group("basic", "Basic Settings")
-    host.add_field(ConfigField(
-        "DOCKER_ARCH",
-        "Docker architecture to use",
-        default_value="linux/amd64",
-        options=["linux/amd64", "linux/arm64"],
-        field_type="combo",
-        help_text="Use linux/arm64 for Mac Silicon, otherwise keep as linux/amd64",
-        group="basic"
-    ))
-    host.add_field(ConfigField(
-        "BROADSEA_HOST",
-        "Host URL without protocol",
-        default_value="127.0.0.1",
-        help_text="Change to your host URL (without the http part)",
-        group="basic"
-    ))
-    host.add_field(ConfigField(
-        "HTTP_TYPE",
-        "HTTP protocol type",
-        default_value="http",
-        options=["http", "https"],
-        field_type="combo",
-        help_text="If using https, you need to add the crt and key files to the ./certs folder",
-        group="basic"
-    ))
-    sections.append(host)
-
-    # Atlas Configuration
-    atlas = ConfigSection(
-        "Atlas",
-        "Atlas Configuration",
-        "Configure OHDSI Atlas settings"
-    )
-    atlas.add_group("basic", "Basic Settings")
-    atlas.add_group("auth", "Authentication")
-    atlas.add_group("features", "Feature Flags")
-    
-    # Basic Settings
-    atlas.add_field(ConfigField(
-        "ATLAS_VERSION",
-        "Atlas Version",
-        default_value="2.12.0",
-        group="basic"
-    ))
-    atlas.add_field(ConfigField(
-        "ATLAS_PORT",
-        "Atlas Port",
-        default_value="8080",
-        validation_func=lambda x: x.isdigit() and 0 <= int(x) <= 65535,
-        group="basic"
-    ))
-    
-    # Authentication
-    atlas.add_field(ConfigField(
-        "ATLAS_USER_AUTH_ENABLED",
-        "Enable User Authentication",
-        default_value="false",
-        field_type="checkbox",
-        help_text="Enable if using security, but ensure you fill out the WebAPI/Atlas security sections",
-        group="auth"
-    ))
-    
-    # Feature Flags
-    atlas.add_field(ConfigField(
-        "ATLAS_COHORT_COMPARISON_RESULTS_ENABLED",
-        "Enable Cohort Comparison Results",
-        default_value="false",
-        field_type="checkbox",
-        group="features"
-    ))
-    atlas.add_field(ConfigField(
-        "ATLAS_PLP_RESULTS_ENABLED",
-        "Enable PLP Results",
-        default_value="false",
-        field_type="checkbox",
-        group="features"
-    ))
-    sections.append(atlas)
-
-    # WebAPI Configuration
-    webapi = ConfigSection(
-        "WebAPI",
-        "WebAPI Configuration",
-        "Configure OHDSI WebAPI settings"
-    )
-    webapi.add_group("basic", "Basic Settings")
-    webapi.add_group("logging", "Logging Configuration")
-    webapi.add_group("database", "Database Connection")
-    
-    # Basic Settings
-    webapi.add_field(ConfigField(
-        "FLYWAY_BASELINE_ON_MIGRATE",
-        "Enable Flyway Baseline on Migrate",
-        default_value="true",
-        field_type="checkbox",
-        help_text="Set to false if not using a pre-filled WebAPI schema",
-        group="basic"
-    ))
-    
-    # Logging Settings
-    webapi.add_field(ConfigField(
-        "WEBAPI_LOGGING_LEVEL_ROOT",
-        "Root Logging Level",
-        default_value="info",
-        options=["trace", "debug", "info", "warn", "error"],
-        field_type="combo",
-        help_text="Logging level for the entire application",
-        group="logging"
-    ))
-    webapi.add_field(ConfigField(
-        "WEBAPI_LOGGING_LEVEL_ORG_OHDSI",
-        "OHDSI Library Logging Level",
-        default_value="info",
-        options=["trace", "debug", "info", "warn", "error"],
-        field_type="combo",
-        help_text="Logging level for OHDSI libraries",
-        group="logging"
-    ))
-    
-    # Database Settings
-    webapi.add_field(ConfigField(
-        "WEBAPI_DATASOURCE_URL",
-        "Database URL",
-        default_value="jdbc:postgresql://broadsea-atlasdb:5432/postgres",
-        help_text="Keep as-is if using Broadsea to launch WebAPI postgres, replace if using external instance",
-        group="database"
-    ))
-    webapi.add_field(ConfigField(
-        "WEBAPI_DATASOURCE_USERNAME",
-        "Database Username",
-        default_value="postgres",
-        group="database"
-    ))
-    webapi.add_field(ConfigField(
-        "WEBAPI_DATASOURCE_PASSWORD_FILE",
-        "Database Password File",
-        default_value="./secrets/webapi/WEBAPI_DATASOURCE_PASSWORD",
-        field_type="file",
-        help_text="Path to file containing database password",
-        group="database"
-    ))
-    sections.append(webapi)
-
-    # Security Configuration
-    security = ConfigSection(
-        "Security",
-        "Security Configuration",
-        "Configure authentication and authorization settings"
-    )
-    security.add_group("provider", "Security Provider")
-    security.add_group("db", "Database Authentication")
-    security.add_group("ldap", "LDAP Authentication")
-    
-    # Provider Settings
-    security.add_field(ConfigField(
-        "ATLAS_SECURITY_PROVIDER_TYPE",
-        "Security Provider Type",
-        default_value="none",
-        options=["none", "ad", "ldap", "kerberos", "openid", "cas", "oauth", "iap", "db"],
-        field_type="combo",
-        help_text="Type of security provider to use",
-        group="provider"
-    ))
-    security.add_field(ConfigField(
-        "ATLAS_SECURITY_PROVIDER_NAME",
-        "Provider Display Name",
-        default_value="none",
-        help_text="What to call the provider in the Atlas GUI",
-        group="provider"
-    ))
-    
-    # Database Auth Settings
-    security.add_field(ConfigField(
-        "SECURITY_AUTH_JDBC_ENABLED",
-        "Enable Database Authentication",
-        default_value="false",
-        field_type="checkbox",
-        group="db"
-    ))
-    security.add_field(ConfigField(
-        "SECURITY_DB_DATASOURCE_SCHEMA",
-        "Security Database Schema",
-        default_value="webapi_security",
-        depends_on={"SECURITY_AUTH_JDBC_ENABLED": "true"},
-        group="db"
-    ))
-    
-    # LDAP Settings
-    security.add_field(ConfigField(
-        "SECURITY_AUTH_LDAP_ENABLED",
-        "Enable LDAP Authentication",
-        default_value="false",
-        field_type="checkbox",
-        group="ldap"
-    ))
-    security.add_field(ConfigField(
-        "SECURITY_LDAP_URL",
-        "LDAP Server URL",
-        default_value="ldap://broadsea-openldap:1389",
-        depends_on={"SECURITY_AUTH_LDAP_ENABLED": "true"},
-        group="ldap"
-    ))
-    sections.append(security)
-
-    # Data Source Configuration
-    datasource = ConfigSection(
-        "DataSource",
-        "Data Source Configuration",
-        "Configure database connections for OMOP CDM"
-    )
-    datasource.add_group("connection", "Database Connection")
-    datasource.add_group("vocab", "Vocabulary Settings")
-    
-    # Connection Settings
-    datasource.add_field(ConfigField(
-        "CDM_CONNECTIONDETAILS_DBMS",
-        "Database Type",
-        default_value="postgresql",
-        options=["postgresql", "sql server", "oracle", "redshift"],
-        field_type="combo",
-        group="connection"
-    ))
-    datasource.add_field(ConfigField(
-        "CDM_CONNECTIONDETAILS_SERVER",
-        "Database Server",
-        default_value="broadsea-atlasdb/postgres",
-        group="connection"
-    ))
-    datasource.add_field(ConfigField(
-        "CDM_CONNECTIONDETAILS_USER",
-        "Database Username",
-        default_value="postgres",
-        group="connection"
-    ))
-    datasource.add_field(ConfigField(
-        "CDM_CONNECTIONDETAILS_PASSWORD_FILE",
-        "Database Password File",
-        default_value="./secrets/postprocessing/CDM_CONNECTIONDETAILS_PASSWORD",
-        field_type="file",
-        group="connection"
-    ))
-    
-    # Vocabulary Settings
-    datasource.add_field(ConfigField(
-        "VOCAB_DATABASE_SCHEMA",
-        "Vocabulary Schema",
-        default_value="demo_cdm",
-        group="vocab"
-    ))
-    sections.append(datasource)
-
-    # Build Configuration
-    build = ConfigSection(
-        "Build",
-        "Build Configuration",
-        "Configure building Atlas and WebAPI from Git"
-    )
-    build.add_group("atlas", "Atlas Build")
-    build.add_group("webapi", "WebAPI Build")
-    
-    # Atlas Build Settings
-    build.add_field(ConfigField(
-        "ATLAS_GITHUB_URL",
-        "Atlas Git URL",
-        default_value="https://github.com/OHDSI/Atlas.git#1297c137669f21babace1906f23c3a9d70a9da19",
-        help_text="Git URL with commit hash for building Atlas from source",
-        group="atlas"
-    ))
-    
-    # WebAPI Build Settings
-    build.add_field(ConfigField(
-        "WEBAPI_GITHUB_URL",
-        "WebAPI Git URL",
-        default_value="https://github.com/OHDSI/WebAPI.git#rc-2.13.0",
-        help_text="Git URL with commit hash for building WebAPI from source",
-        group="webapi"
-    ))
-    build.add_field(ConfigField(
-        "WEBAPI_MAVEN_PROFILE",
-        "Maven Profile",
-        default_value="webapi-docker",
-        help_text="Set to webapi-docker,webapi-solr if you want to enable SOLR Vocab search",
-        group="webapi"
-    ))
-    sections.append(build)
-
-    # SOLR Vocab Configuration
-    solr = ConfigSection(
-        "SOLR",
-        "SOLR Vocabulary Configuration",
-        "Configure SOLR OMOP Vocabulary search (optional)"
-    )
-    solr.add_group("endpoint", "SOLR Endpoint")
-    solr.add_group("vocab", "Vocabulary Settings")
-    
-    # Endpoint Settings
-    solr.add_field(ConfigField(
-        "SOLR_VOCAB_ENDPOINT",
-        "SOLR Endpoint URL",
-        default_value="",
-        required=False,
-        help_text="Keep blank if not using Solr Vocab, use http://broadsea-solr-vocab:8983/solr if using Broadsea SOLR",
-        group="endpoint"
-    ))
-    
-    # Vocabulary Settings
-    solr.add_field(ConfigField(
-        "SOLR_VOCAB_VERSION",
-        "Vocabulary Version",
-        default_value="v5.0_23-JAN-23",
-        help_text="Replace spaces with underscores",
-        depends_on={"SOLR_VOCAB_ENDPOINT": lambda x: bool(x)},
-        group="vocab"
-    ))
-    solr.add_field(ConfigField(
-        "SOLR_VOCAB_DATABASE_SCHEMA",
-        "Vocabulary Schema",
-        default_value="vocab",
-        depends_on={"SOLR_VOCAB_ENDPOINT": lambda x: bool(x)},
-        group="vocab"
-    ))
-    sections.append(solr)
-
-    # HADES Configuration
-    hades = ConfigSection(
-        "HADES",
-        "HADES Configuration",
-        "Configure HADES credentials for RStudio"
-    )
-    hades.add_group("auth", "Authentication")
-    
-    # Authentication Settings
-    hades.add_field(ConfigField(
-        "HADES_USER",
-        "HADES Username",
-        default_value="ohdsi",
-        group="auth"
-    ))
-    hades.add_field(ConfigField(
-        "HADES_PASSWORD_FILE",
-        "Password File",
-        default_value="./secrets/hades/HADES_PASSWORD",
-        field_type="file",
-        help_text="Path to file containing HADES password",
-        group="auth"
-    ))
-    sections.append(hades)
-
-    # Postgres and UMLS Configuration
-    vocab = ConfigSection(
-        "VocabDB",
-        "Vocabulary Database Configuration",
-        "Configure Postgres and UMLS credentials for loading OMOP Vocab files"
-    )
-    vocab.add_group("postgres", "Postgres Settings")
-    vocab.add_group("umls", "UMLS Settings")
-    
-    # Postgres Settings
-    vocab.add_field(ConfigField(
-        "VOCAB_PG_HOST",
-        "Database Host",
-        default_value="broadsea-atlasdb",
-        help_text="Host name without database name",
-        group="postgres"
-    ))
-    vocab.add_field(ConfigField(
-        "VOCAB_PG_DATABASE",
-        "Database Name",
-        default_value="postgres",
-        group="postgres"
-    ))
-    vocab.add_field(ConfigField(
-        "VOCAB_PG_SCHEMA",
-        "Schema Name",
-        default_value="omop_vocab",
-        group="postgres"
-    ))
-    vocab.add_field(ConfigField(
-        "VOCAB_PG_USER",
-        "Username",
-        default_value="postgres",
-        group="postgres"
-    ))
-    vocab.add_field(ConfigField(
-        "VOCAB_PG_PASSWORD_FILE",
-        "Password File",
-        default_value="./secrets/omop_vocab/VOCAB_PG_PASSWORD",
-        field_type="file",
-        group="postgres"
-    ))
-    vocab.add_field(ConfigField(
-        "VOCAB_PG_FILES_PATH",
-        "Vocabulary Files Path",
-        default_value="./omop_vocab/files",
-        help_text="Folder path with vocab files from Athena",
-        field_type="file",
-        group="postgres"
-    ))
-    
-    # UMLS Settings
-    vocab.add_field(ConfigField(
-        "UMLS_API_KEY_FILE",
-        "UMLS API Key File",
-        default_value="./secrets/omop_vocab/UMLS_API_KEY",
-        help_text="API KEY from UMLS account profile if CPT4 conversion needed",
-        field_type="file",
-        required=False,
-        group="umls"
-    ))
-    sections.append(vocab)
-
-    # Phoebe Configuration
-    phoebe = ConfigSection(
-        "Phoebe",
-        "Phoebe Configuration",
-        "Configure Postgres credentials for loading Phoebe file for Atlas Concept Recommendations"
-    )
-    phoebe.add_group("database", "Database Settings")
-    
-    # Database Settings
-    phoebe.add_field(ConfigField(
-        "PHOEBE_PG_HOST",
-        "Database Host",
-        default_value="broadsea-atlasdb",
-        help_text="Host name without database name",
-        group="database"
-    ))
-    phoebe.add_field(ConfigField(
-        "PHOEBE_PG_DATABASE",
-        "Database Name",
-        default_value="postgres",
-        group="database"
-    ))
-    phoebe.add_field(ConfigField(
-        "PHOEBE_PG_SCHEMA",
-        "Schema Name",
-        default_value="omop_vocab",
-        help_text="Should be an existing OMOP Vocabulary schema",
-        group="database"
-    ))
-    phoebe.add_field(ConfigField(
-        "PHOEBE_PG_USER",
-        "Username",
-        default_value="postgres",
-        group="database"
-    ))
-    phoebe.add_field(ConfigField(
-        "PHOEBE_PG_PASSWORD_FILE",
-        "Password File",
-        default_value="./secrets/phoebe/PHOEBE_PG_PASSWORD",
-        field_type="file",
-        group="database"
-    ))
-    sections.append(phoebe)
-
-    # Ares Configuration
-    ares = ConfigSection(
-        "Ares",
-        "Ares Configuration",
-        "Configure Ares Data Folder"
-    )
-    ares.add_group("data", "Data Settings")
-    
-    # Data Settings
-    ares.add_field(ConfigField(
-        "ARES_DATA_FOLDER",
-        "Data Folder Path",
-        default_value="cdm-postprocessing-data",
-        help_text="Path to the Ares data folder on your host",
-        group="data"
-    ))
-    sections.append(ares)
-
-    # Content Page Configuration
-    content = ConfigSection(
-        "Content",
-        "Content Page Configuration",
-        "Configure Broadsea Content Page settings"
-    )
-    content.add_group("basic", "Basic Settings")
-    content.add_group("display", "Display Settings")
-    
-    # Basic Settings
-    content.add_field(ConfigField(
-        "CONTENT_TITLE",
-        "Page Title",
-        default_value="Broadsea 3.5 Applications",
-        help_text="Can change this title to something for your organization",
-        group="basic"
-    ))
-    
-    # Display Settings
-    for app in ["ARES", "ATLAS", "HADES", "OPENSHINYSERVER", "PGADMIN4", "POSITCONNECT", "PERSEUS"]:
-        content.add_field(ConfigField(
-            f"CONTENT_{app}_DISPLAY",
-            f"Show {app}",
-            default_value="show" if app not in ["POSITCONNECT", "PERSEUS"] else "none",
-            options=["show", "none"],
-            field_type="combo",
-            help_text=f"{'Requires commercial license' if app == 'POSITCONNECT' else ''}",
-            group="display"
-        ))
-    sections.append(content)
-
-    # OpenLDAP Configuration
-    ldap = ConfigSection(
-        "OpenLDAP",
-        "OpenLDAP Configuration",
-        "Configure OpenLDAP for testing Atlas with security"
-    )
-    ldap.add_group("auth", "Authentication")
-    
-    # Authentication Settings
-    ldap.add_field(ConfigField(
-        "OPENLDAP_USERS",
-        "LDAP Users",
-        default_value="user1",
-        help_text="Comma separated list of users",
-        group="auth"
-    ))
-    ldap.add_field(ConfigField(
-        "OPENLDAP_ADMIN_PASSWORD_FILE",
-        "Admin Password File",
-        default_value="./secrets/openldap/OPENLDAP_ADMIN_PASSWORD",
-        field_type="file",
-        group="auth"
-    ))
-    ldap.add_field(ConfigField(
-        "OPENLDAP_ACCOUNT_PASSWORDS_FILE",
-        "Account Passwords File",
-        default_value="./secrets/openldap/OPENLDAP_ACCOUNT_PASSWORDS",
-        field_type="file",
-        group="auth"
-    ))
-    sections.append(ldap)
-
-    # Shiny Server Configuration
-    shiny = ConfigSection(
-        "ShinyServer",
-        "Open Shiny Server Configuration",
-        "Configure open-source Shiny Server"
-    )
-    shiny.add_group("basic", "Basic Settings")
-    
-    # Basic Settings
-    shiny.add_field(ConfigField(
-        "OPEN_SHINY_SERVER_APP_ROOT",
-        "App Root Directory",
-        default_value="./shiny_server",
-        help_text="Root folder containing Shiny apps",
-        field_type="file",
-        group="basic"
-    ))
-    sections.append(shiny)
-
-    # Posit Connect Configuration
-    posit = ConfigSection(
-        "PositConnect",
-        "Posit Connect Configuration",
-        "Configure Posit Connect (requires commercial license)"
-    )
-    posit.add_group("license", "License Settings")
-    posit.add_group("config", "Configuration Settings")
-    
-    # License Settings
-    posit.add_field(ConfigField(
-        "POSIT_CONNECT_LICENSE_SERVER",
-        "License Server URL",
-        default_value="",
-        required=False,
-        help_text="Server URL that hosts the license",
-        group="license"
-    ))
-    posit.add_field(ConfigField(
-        "POSIT_CONNECT_LICENSE_FILE",
-        "License File",
-        default_value="./posit_connect/posit_license.lic",
-        field_type="file",
-        help_text="Path to license file",
-        group="license"
-    ))
-    
-    # Configuration Settings
-    posit.add_field(ConfigField(
-        "POSIT_CONNECT_GCFG_FILE",
-        "Global Config File",
-        default_value="./posit_connect/rstudio-connect.gcfg",
-        field_type="file",
-        help_text="Global configuration file for Posit Connect",
-        group="config"
-    ))
-    posit.add_field(ConfigField(
-        "POSIT_CONNECT_R_VERSION",
-        "R Version",
-        default_value="4.2.3",
-        help_text="R version to use (versions listed at https://cdn.posit.co/r/versions.json)",
-        group="config"
-    ))
-    sections.append(posit)
-
-    # Perseus Configuration
-    perseus = ConfigSection(
-        "Perseus",
-        "Perseus Configuration",
-        "Configure Perseus for ETL design and execution"
-    )
-    perseus.add_group("email", "Email Settings")
-    perseus.add_group("security", "Security Settings")
-    perseus.add_group("vocab", "Vocabulary Settings")
-    
-    # Email Settings
-    perseus.add_field(ConfigField(
-        "PERSEUS_SMTP_SERVER",
-        "SMTP Server",
-        default_value="",
-        required=False,
-        group="email"
-    ))
-    perseus.add_field(ConfigField(
-        "PERSEUS_SMTP_PORT",
-        "SMTP Port",
-        default_value="",
-        required=False,
-        validation_func=lambda x: not x or (x.isdigit() and 0 <= int(x) <= 65535),
-        group="email"
-    ))
-    
-    # Security Settings
-    perseus.add_field(ConfigField(
-        "PERSEUS_TOKEN_SECRET_KEY",
-        "Token Secret Key",
-        default_value="Perseus-Arcad!a",
-        group="security"
-    ))
-    perseus.add_field(ConfigField(
-        "PERSEUS_EMAIL_SECRET_KEY",
-        "Email Secret Key",
-        default_value="8cmuh4t5xTtR1EHaojWL0aqCR3vZ48PZF5AYkTe0iqo=",
-        group="security"
-    ))
-    
-    # Vocabulary Settings
-    perseus.add_field(ConfigField(
-        "PERSEUS_VOCAB_FILES_PATH",
-        "Vocabulary Files Path",
-        default_value="./omop_vocab/files",
-        field_type="file",
-        group="vocab"
-    ))
-    sections.append(perseus)
-
-    # Post-Processing Configuration
-    postproc = ConfigSection(
-        "PostProcessing",
-        "Post-Processing Configuration",
-        "Configure CDM post-processing tools (Achilles, DQD, AresIndexer)"
-    )
-    postproc.add_group("achilles", "Achilles Settings")
-    postproc.add_group("dqd", "Data Quality Dashboard Settings")
-    postproc.add_group("ares", "Ares Indexer Settings")
-    
-    # Achilles Settings
-    postproc.add_field(ConfigField(
-        "ACHILLES_CREATE_TABLE",
-        "Create Tables",
-        default_value="true",
-        field_type="checkbox",
-        group="achilles"
-    ))
-    postproc.add_field(ConfigField(
-        "ACHILLES_SMALL_CELL_COUNT",
-        "Small Cell Count",
-        default_value="0",
-        validation_func=lambda x: x.isdigit(),
-        group="achilles"
-    ))
-    
-    # DQD Settings
-    postproc.add_field(ConfigField(
-        "DQD_NUM_THREADS",
-        "Number of Threads",
-        default_value="2",
-        validation_func=lambda x: x.isdigit() and int(x) > 0,
-        group="dqd"
-    ))
-    postproc.add_field(ConfigField(
-        "DQD_WRITE_TO_TABLE",
-        "Write to Table",
-        default_value="TRUE",
-        field_type="checkbox",
-        group="dqd"
-    ))
-    
-    # Ares Settings
-    postproc.add_field(ConfigField(
-        "ARES_RUN_NETWORK",
-        "Run Network Analysis",
-        default_value="FALSE",
-        field_type="checkbox",
-        help_text="Should the full Ares network analysis be run?",
-        group="ares"
-    ))
-    sections.append(postproc)
-
-    # pgAdmin Configuration
-    pgadmin = ConfigSection(
-        "pgAdmin",
-        "pgAdmin Configuration",
-        "Configure pgAdmin4 settings"
-    )
-    pgadmin.add_group("auth", "Authentication")
-    
-    # Authentication Settings
-    pgadmin.add_field(ConfigField(
-        "PGADMIN_ADMIN_USER",
-        "Admin Email",
-        default_value="user@domain.com",
-        validation_func=lambda x: "@" in x,
-        group="auth"
-    ))
-    pgadmin.add_field(ConfigField(
-        "PGADMIN_DEFAULT_PASSWORD_FILE",
-        "Password File",
-        default_value="./secrets/pgadmin4/PGADMIN_DEFAULT_PASSWORD",
-        field_type="file",
-        group="auth"
-    ))
-    sections.append(pgadmin)
-
-    return sections
+        write_env(config, self.target)
 
 def main():
     app = QApplication(sys.argv)
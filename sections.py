@@ -531,6 +531,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from broadsea_core.rules import pattern_rule
+
 @dataclass
 class ConfigField:
     key: str
@@ -770,7 +772,7 @@ class WebAPIConfigWidget(QWidget):
 
             # Pattern validation
             if field_config.validation_pattern and value:
-                if not re.match(field_config.validation_pattern, value):
+                if not pattern_rule(field_config.validation_pattern).matches(value):
                     issues.append(f"{field_name} has invalid format")
 
             # File path validation
@@ -825,6 +827,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from broadsea_core.rules import pattern_rule
+
 @dataclass
 class ConfigField:
     key: str
@@ -1150,7 +1154,7 @@ class SecurityConfigWidget(QWidget):
 
             # Pattern validation
             if field_config.validation_pattern and value:
-                if not re.match(field_config.validation_pattern, value):
+                if not pattern_rule(field_config.validation_pattern).matches(value):
                     issues.append(f"{field_name} has invalid format")
 
             # Provider-specific validations
@@ -1195,6 +1199,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from broadsea_core.rules import pattern_rule
+
 @dataclass
 class ConfigField:
     key: str
@@ -1512,7 +1518,7 @@ class DataSourceConfigWidget(QWidget):
 
             # Pattern validation
             if field_config.validation_pattern and value:
-                if not re.match(field_config.validation_pattern, value):
+                if not pattern_rule(field_config.validation_pattern).matches(value):
                     issues.append(f"{field_name} has invalid format")
 
             # File path validation
@@ -1560,6 +1566,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from broadsea_core.rules import pattern_rule
+
 @dataclass
 class ConfigField:
     key: str
@@ -1763,10 +1771,6 @@ class BuildConfigWidget(QWidget):
         validate_button.clicked.connect(self.validate_config)
         actions_layout.addWidget(validate_button)
 
-        generate_button = QPushButton("Generate Docker Compose")
-        generate_button.clicked.connect(self.generate_docker_compose)
-        actions_layout.addWidget(generate_button)
-
         parent_layout.addLayout(actions_layout)
 
     def add_field(self, layout, field_name):
@@ -1798,13 +1802,18 @@ class BuildConfigWidget(QWidget):
         layout.addLayout(field_layout)
         self.input_widgets[field_name] = input_widget
 
-    def validate_config(self):
-        """Validate build configuration"""
+    def values(self) -> Dict[str, str]:
+        return {
+            field_name: widget.currentText() if isinstance(widget, QComboBox) else widget.text()
+            for field_name, widget in self.input_widgets.items()
+        }
+
+    def config_issues(self) -> List[str]:
+        """Validation issues of the build configuration"""
         issues = []
 
-        for field_name, widget in self.input_widgets.items():
+        for field_name, value in self.values().items():
             field_config = self.section.fields[field_name]
-            value = widget.currentText() if isinstance(widget, QComboBox) else widget.text()
 
             # Required field check
             if not value:
@@ -1812,7 +1821,7 @@ class BuildConfigWidget(QWidget):
 
             # Pattern validation
             if field_config.validation_pattern and value:
-                if not re.match(field_config.validation_pattern, value):
+                if not pattern_rule(field_config.validation_pattern).matches(value):
                     issues.append(f"{field_name} has invalid format")
 
             # Build-specific validations
@@ -1827,7 +1836,11 @@ class BuildConfigWidget(QWidget):
                     solr_endpoint = self.input_widgets["SOLR_VOCAB_ENDPOINT"].text()
                     if not solr_endpoint:
                         issues.append("SOLR endpoint is required when using SOLR profile")
+        return issues
 
+    def validate_config(self):
+        """Validate build configuration"""
+        issues = self.config_issues()
         if issues:
             QMessageBox.warning(
                 self,
@@ -1841,24 +1854,6 @@ class BuildConfigWidget(QWidget):
                 "All build configuration values are valid!"
             )
 
-    def generate_docker_compose(self):
-        """Generate Docker Compose configuration"""
-        # This would generate the docker-compose.yml file based on the configuration
-        try:
-            if self.validate_config():
-                QMessageBox.information(
-                    self,
-                    "Docker Compose Generation",
-                    "Docker Compose configuration would be generated here.\n"
-                    "This is a placeholder for the actual implementation."
-                )
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Generation Error",
-                f"Failed to generate Docker Compose configuration: {str(e)}"
-            )
-
 def main():
     app = QApplication(sys.argv)
     window = QMainWindow()
@@ -1887,6 +1882,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from broadsea_core.rules import pattern_rule
+
 @dataclass
 class ConfigField:
     key: str
@@ -2196,7 +2193,7 @@ class MonitoringConfigWidget(QWidget):
 
             # Pattern validation
             if field_config.validation_pattern and value:
-                if not re.match(field_config.validation_pattern, value):
+                if not pattern_rule(field_config.validation_pattern).matches(value):
                     issues.append(f"{field_name} has invalid format")
 
             # File path validation
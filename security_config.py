@@ -23,45 +23,3 @@ class SecuritySection(BaseConfigSection):
         self.add_field(form_layout, "SECURITY_SSL_ENABLED", default="false")
         self.add_field(form_layout, "SECURITY_SSL_KEYSTORE", default="")
         self.add_field(form_layout, "SECURITY_SSL_KEYSTORE_PASSWORD", default="")
-
-    def validate(self) -> list[str]:
-        """Validate security configuration"""
-        issues = []
-        
-        # Validate port number
-        port = self.fields["SECURITY_DB_PORT"].text()
-        if not port.isdigit():
-            issues.append("SECURITY_DB_PORT must be a number")
-        elif not (0 <= int(port) <= 65535):
-            issues.append("SECURITY_DB_PORT must be between 0 and 65535")
-
-        # Validate boolean fields
-        for bool_field in ["SECURITY_ENABLED", "SECURITY_SSL_ENABLED"]:
-            value = self.fields[bool_field].text().lower()
-            if value not in ["true", "false"]:
-                issues.append(f"{bool_field} must be either 'true' or 'false'")
-
-        # Validate auth provider
-        auth_provider = self.fields["SECURITY_AUTH_PROVIDER"].text().lower()
-        if auth_provider not in ["db", "oauth", "ldap"]:
-            issues.append("SECURITY_AUTH_PROVIDER must be one of: db, oauth, ldap")
-
-        # Validate OAuth settings if OAuth is selected
-        if auth_provider == "oauth":
-            oauth_fields = [
-                "SECURITY_OAUTH_CLIENT_ID",
-                "SECURITY_OAUTH_CLIENT_SECRET",
-                "SECURITY_OAUTH_CALLBACK_URL"
-            ]
-            for field in oauth_fields:
-                if not self.fields[field].text().strip():
-                    issues.append(f"{field} is required when using OAuth")
-
-        # Validate SSL settings if SSL is enabled
-        if self.fields["SECURITY_SSL_ENABLED"].text().lower() == "true":
-            ssl_fields = ["SECURITY_SSL_KEYSTORE", "SECURITY_SSL_KEYSTORE_PASSWORD"]
-            for field in ssl_fields:
-                if not self.fields[field].text().strip():
-                    issues.append(f"{field} is required when SSL is enabled")
-
-        return issues
@@ -0,0 +1,66 @@
+from typing import Any, Callable, Dict, Tuple
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+class ValidationSignals(QObject):
+    """Signals emitted by a validation task running on the thread pool"""
+    finished = pyqtSignal(str, int, object)
+
+class ValidationTask(QRunnable):
+    """Run one validation job off the GUI thread"""
+
+    def __init__(self, key: str, generation: int, job: Callable[[], Any]):
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.job = job
+        self.signals = ValidationSignals()
+
+    def run(self):
+        try:
+            result = self.job()
+        except Exception as e:
+            result = f"{self.key} validation error: {str(e)}"
+        self.signals.finished.emit(self.key, self.generation, result)
+
+class ValidationScheduler(QObject):
+    """Debounce validation requests and run expensive ones on a QThreadPool"""
+
+    # Emitted with (key, result) once the latest job scheduled for key completes
+    resultReady = pyqtSignal(str, object)
+
+    def __init__(self, delay_ms: int = 300, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool.globalInstance()
+        self.pending: Dict[str, Tuple[Callable[[], Any], bool]] = {}
+        self.generations: Dict[str, int] = {}
+        self.tasks: Dict[Tuple[str, int], ValidationTask] = {}
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def schedule(self, key: str, job: Callable[[], Any], expensive: bool = False):
+        """Queue a job for key, replacing any job still waiting for the same key"""
+        self.pending[key] = (job, expensive)
+        # Results of jobs already running for this key are now stale
+        self.generations[key] = self.generations.get(key, 0) + 1
+        self.timer.start()
+
+    def flush(self):
+        """Run every pending job now"""
+        pending, self.pending = self.pending, {}
+        for key, (job, expensive) in pending.items():
+            generation = self.generations[key]
+            if expensive:
+                task = ValidationTask(key, generation, job)
+                task.signals.finished.connect(self.on_task_finished)
+                # Keep a reference so the signals object outlives the run
+                self.tasks[(key, generation)] = task
+                self.pool.start(task)
+            else:
+                self.resultReady.emit(key, job())
+
+    def on_task_finished(self, key: str, generation: int, result: Any):
+        self.tasks.pop((key, generation), None)
+        if self.generations.get(key) == generation:
+            self.resultReady.emit(key, result)